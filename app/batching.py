@@ -0,0 +1,70 @@
+import asyncio
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item requests into one batched call.
+
+    Items submitted within `max_wait_ms` of the first queued item (or until
+    `max_batch_size` items are queued) are scored together by `score_fn`, which
+    receives a list of items and must return one result per item. Scoring runs in
+    the default executor so the event loop keeps accepting requests meanwhile.
+    """
+
+    def __init__(self, score_fn, max_batch_size=64, max_wait_ms=2.0):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._loop = None
+        self._queue = None
+        self._worker = None
+
+    def _ensure_worker(self):
+        # The worker is bound to the loop it was started on (tests may use several loops)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        return loop
+
+    async def submit(self, item):
+        """Queues one item and waits for its result."""
+        loop = self._ensure_worker()
+        future = loop.create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def _collect(self):
+        """Waits for the first item, then gathers more until the window or batch fills."""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without touching the timer
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = await self._loop.run_in_executor(None, self.score_fn, items)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
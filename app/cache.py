@@ -0,0 +1,146 @@
+"""
+Score cache for resent applications (retries, re-quotes, pre-approval refreshes).
+
+Keys hash the model version together with the encoded feature vector, i.e. the
+float32 row the model actually sees. Field order, int vs float spellings and
+unseen categories that share a WoE value therefore map to one entry, and a new
+model version never reads the previous model's scores. Entries live in an
+in-process LRU bounded by entry count, with a TTL. An optional shared backend
+(a SQLite file in WAL mode) lets the uvicorn workers of one host share entries.
+"""
+import collections
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+class SQLiteCacheBackend:
+    """
+    Cross-process cache tier: one SQLite file, one connection per thread.
+    The table is trimmed to `max_entries` (oldest first) every `trim_every` writes.
+    """
+
+    def __init__(self, path, max_entries=1_000_000, trim_every=1000):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.trim_every = trim_every
+        self._writes = 0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connection() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS scores "
+                       "(key BLOB PRIMARY KEY, prob REAL, expires_at REAL) WITHOUT ROWID")
+            db.execute("CREATE INDEX IF NOT EXISTS scores_expiry ON scores (expires_at)")
+
+    def _connection(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=1.0)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=OFF")  # a lost write is just a cache miss
+        return db
+
+    def get(self, key, now):
+        row = self._connection().execute(
+            "SELECT prob FROM scores WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, key, prob, expires_at):
+        with self._connection() as db:
+            db.execute("INSERT OR REPLACE INTO scores VALUES (?, ?, ?)", (key, prob, expires_at))
+        self._writes += 1
+        if self._writes % self.trim_every == 0:
+            self.trim()
+
+    def trim(self):
+        """Drops expired entries, then the oldest ones beyond max_entries."""
+        with self._connection() as db:
+            db.execute("DELETE FROM scores WHERE expires_at <= ?", (time.time(),))
+            db.execute(
+                "DELETE FROM scores WHERE key IN (SELECT key FROM scores ORDER BY expires_at "
+                "LIMIT max((SELECT count(*) FROM scores) - ?, 0))", (self.max_entries,)
+            )
+
+class ScoreCache:
+    """
+    LRU + TTL cache of probabilities keyed by make_key(). Thread-safe; counts hits,
+    misses, LRU evictions and TTL expirations.
+    """
+
+    def __init__(self, max_entries=100_000, ttl_seconds=300.0, shared=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self._entries = collections.OrderedDict()  # key -> (expires_at, prob)
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.shared_hits = 0
+
+    @staticmethod
+    def make_key(version, features):
+        """128-bit key of (model version, encoded feature bytes)."""
+        digest = hashlib.blake2b(str(version).encode(), digest_size=16)
+        digest.update(b"\0")
+        digest.update(features)
+        return digest.digest()
+
+    def get(self, key):
+        """The cached probability, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+
+        prob = self.shared.get(key, now) if self.shared is not None else None
+        with self._lock:
+            if prob is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.shared_hits += 1
+            self._store(key, prob, now + self.ttl_seconds)
+        return prob
+
+    def put(self, key, prob):
+        expires_at = time.time() + self.ttl_seconds
+        prob = float(prob)
+        with self._lock:
+            self._store(key, prob, expires_at)
+        if self.shared is not None:
+            self.shared.put(key, prob, expires_at)
+
+    def _store(self, key, prob, expires_at):
+        # Caller holds the lock
+        self._entries[key] = (expires_at, prob)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drops the local entries (shared entries of old versions are simply never read again)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "shared": self.shared.path if self.shared is not None else None,
+                "shared_hits": self.shared_hits,
+            }
@@ -1,92 +1,482 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-import pandas as pd
-import xgboost as xgb
-import mlflow.xgboost
+from typing import Dict, List
+from collections import deque
 import os
 import sys
+import threading
+import time
 
 # Add src to path
+# Only inference dependencies are imported here: mlflow (training / tracking) is loaded
+# lazily by the fallback in load_best_run and never on the promoted-model path.
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.serving import ModelBundle
+from src.model_store import ManifestWatcher, best_run_id, load_promoted, load_run, read_manifest, read_routing
+from src.drift import DRIFT_REFERENCE_PATH, DriftMonitor
+from src.explain import EXPLAIN_TOP_K
+from src.validation import SCHEMA_PATH, Schema
+from app.batching import MicroBatcher
+from app.cache import ScoreCache, SQLiteCacheBackend
+from app.registry import ModelRegistry
+from app import metrics
 
 app = FastAPI(title="Sentinel Credit Risk API", version="1.0.0")
 
-# Global Model Variable
-model = None
+# Request coalescing: concurrent /score calls within the window share one predict call
+SCORE_COALESCE = os.getenv("SCORE_COALESCE", "1") == "1"
+SCORE_BATCH_WINDOW_MS = float(os.getenv("SCORE_BATCH_WINDOW_MS", "2"))
+SCORE_BATCH_MAX_SIZE = int(os.getenv("SCORE_BATCH_MAX_SIZE", "64"))
+
+# Seconds between checks of the promoted-model manifest (0 disables the refresh)
+MODEL_REFRESH_SECONDS = float(os.getenv("MODEL_REFRESH_SECONDS", "30"))
+
+# Online drift sketches over scored traffic (needs a reference: python src/drift.py reference)
+DRIFT_MONITOR = os.getenv("DRIFT_MONITOR", "1") == "1"
+
+# Reject applications outside the training schema with a 422 (needs a schema:
+# python src/validation.py schema)
+VALIDATE_REQUESTS = os.getenv("VALIDATE_REQUESTS", "1") == "1"
+
+# Search the MLflow tracking store when nothing was promoted. Serving images that only
+# ship the promoted model store set this to 0 and never import mlflow.
+MLFLOW_FALLBACK = os.getenv("MLFLOW_FALLBACK", "1") == "1"
+
+# Cache of scores for resent applications, keyed on model version + feature vector
+# (0 entries disables it). The shared SQLite file lets the workers of one host share hits.
+SCORE_CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", "100000"))
+SCORE_CACHE_TTL_SECONDS = float(os.getenv("SCORE_CACHE_TTL_SECONDS", "300"))
+SCORE_CACHE_SHARED_PATH = os.getenv("SCORE_CACHE_SHARED_PATH")
+
+# Per-stage latency histograms on /metrics (counters are always kept)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# Global Model Variables
+# The bundle serving traffic. Reloads build a new bundle and replace this reference in
+# one assignment, so a request sees either the old model or the new one, never a mix.
+bundle = None
+watcher = None
+reload_history = deque(maxlen=20)
+_reload_lock = threading.Lock()
+drift_monitor = None
+schema = None
+# Challengers next to the champion `bundle`: A/B splits and shadow models (app/registry.py)
+registry = ModelRegistry()
+score_cache = None
+if SCORE_CACHE_SIZE > 0:
+    score_cache = ScoreCache(
+        SCORE_CACHE_SIZE, SCORE_CACHE_TTL_SECONDS,
+        shared=SQLiteCacheBackend(SCORE_CACHE_SHARED_PATH) if SCORE_CACHE_SHARED_PATH else None,
+    )
+
+if METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+metrics.Gauge(
+    "sentinel_score_cache", "Score cache counters and size (see GET /admin/cache).",
+    lambda: {k: v for k, v in score_cache.stats().items() if isinstance(v, (int, float))} if score_cache else {},
+    label="stat",
+)
 
 class CreditApplication(BaseModel):
-    # Define all inputs that affect the score
+    # Define all inputs that affect the score (defaults: first applicant of the dataset)
     checkin_acc: str = "A11"
     duration: int = 6
     credit_history: str = "A34"
+    purpose: str = "A43"
     amount: int = 1169
+    saving_acc: str = "A65"
+    present_emp_since: str = "A75"
+    installment_rate: int = 4
+    personal_status: str = "A93"
+    other_debtors: str = "A101"
+    residing_since: int = 4
+    property: str = "A121"
     age: int = 67
+    inst_plans: str = "A143"
+    housing: str = "A152"
+    num_credits: int = 2
+    job: str = "A173"
+    dependents: int = 1
+    telephone: str = "A192"
+    foreign_worker: str = "A201"
+
+def install_model(new_model, new_engineer, manifest=None, version=None, warm_up=True):
+    """
+    Builds and warms up a bundle for a freshly loaded model, then swaps it in.
+    Called from startup, the manifest watcher thread and /admin/reload.
+    """
+    global bundle
+    with _reload_lock:
+        start = time.perf_counter()
+        new_bundle = ModelBundle(
+            new_model, new_engineer,
+            version=version or (manifest["run_id"] if manifest else None),
+            manifest=manifest, max_batch_size=SCORE_BATCH_MAX_SIZE,
+            observe=metrics.STAGE_SECONDS.observe if METRICS_ENABLED else None,
+        )
+        if warm_up:
+            new_bundle.warm_up()
+        warmed = time.perf_counter()
+        metrics.MODEL_LOAD_SECONDS.observe(warmed - start, "warmup")
+
+        previous, bundle = bundle, new_bundle
+        if score_cache is not None:
+            # Keys carry the version, so old entries could only waste space
+            score_cache.clear()
+
+        record = {
+            "previous_version": previous.version if previous else None,
+            "model_version": new_bundle.version,
+            "warmup_seconds": round(warmed - start, 4),
+            "swapped_at": time.time(),
+        }
+        reload_history.append(record)
+    print(f"   🔄 Serving model {new_bundle.version} (warm-up {record['warmup_seconds']}s)")
+    return record
+
+def load_best_run():
+    """Fallback when nothing was promoted: the top-AUC run that logged a model."""
+    import mlflow.xgboost
+    from src.predict import load_feature_engine
+
+    run_id = best_run_id()
+    print(f"   Loading Best Model: {run_id}")
+    install_model(mlflow.xgboost.load_model(f"runs:/{run_id}/model"),
+                  load_feature_engine(run_id), version=run_id)
+
+def apply_routing(routing):
+    """
+    Loads the challengers of a routing document (reusing bundles already loaded for the
+    same run), then installs it. Raises ValueError for an invalid routing.
+    """
+    loaded = {b.version: b for b in registry.routing.models.values()}
+    models = {}
+    for name, run_id in routing.get("models", {}).items():
+        models[name] = loaded.get(run_id)
+        if models[name] is None:
+            booster, engineer = load_run(run_id)
+            # No stage observer: challengers are timed per model by the registry
+            models[name] = ModelBundle(booster, engineer, version=run_id, max_batch_size=SCORE_BATCH_MAX_SIZE)
+            models[name].warm_up()
+    registry.configure(models, routing.get("split"), routing.get("shadow", ()))
+    if score_cache is not None:
+        # Cached scores are the champion's; some applications may now be served by a challenger
+        score_cache.clear()
+    print(f"   🧪 Routing: split={registry.routing.split} shadow={list(registry.routing.shadow)}")
+    return registry.stats(bundle)
+
+def load_drift_reference(path=DRIFT_REFERENCE_PATH):
+    global drift_monitor
+    if DRIFT_MONITOR and os.path.exists(path):
+        drift_monitor = DriftMonitor.load(path).start()
+        print(f"   🕵️  Drift monitor tracking {len(drift_monitor.columns)} features")
+
+def load_schema(path=SCHEMA_PATH):
+    global schema
+    if VALIDATE_REQUESTS and os.path.exists(path):
+        schema = Schema.load(path)
+        print(f"   🛡️  Validating requests against {len(schema.rules)} schema rules")
 
 @app.on_event("startup")
 def startup_event():
-    global model
+    global watcher
     print("🚀 API Starting up...")
+    load_drift_reference()
+    load_schema()
     try:
-        experiment = mlflow.get_experiment_by_name("Sentinel_Credit_Risk_Engine")
-        runs = mlflow.search_runs(
-            experiment_ids=[experiment.experiment_id],
-            order_by=["metrics.auc DESC"],
-            max_results=1
-        )
-        best_run_id = runs.iloc[0].run_id
-        print(f"   Loading Best Model: {best_run_id}")
-        model = mlflow.xgboost.load_model(f"runs:/{best_run_id}/model")
+        # Promoted model from the local manifest: no tracking-store scan on cold start
+        manifest = read_manifest()
+        if manifest:
+            start = time.perf_counter()
+            loaded = load_promoted(manifest=manifest)
+            metrics.MODEL_LOAD_SECONDS.observe(time.perf_counter() - start, "read")
+            install_model(*loaded)
+        elif MLFLOW_FALLBACK:
+            print("   No promoted model manifest found, searching MLflow runs...")
+            load_best_run()
+        else:
+            print("❌ No promoted model manifest found (MLflow fallback disabled).")
     except Exception as e:
         print(f"❌ Critical Error: Could not load model. {e}")
+    try:
+        routing = read_routing()
+        if routing:
+            apply_routing(routing)
+    except Exception as e:
+        print(f"⚠️  Challengers not loaded, serving the champion only. {e}")
+    registry.start()
+
+    if MODEL_REFRESH_SECONDS > 0:
+        current_version = bundle.manifest["version"] if bundle and bundle.manifest else None
+        watcher = ManifestWatcher(
+            install_model, interval=MODEL_REFRESH_SECONDS, current_version=current_version
+        ).start()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    if watcher:
+        watcher.stop()
+    if drift_monitor:
+        drift_monitor.stop()
+    registry.stop()
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "model_loaded": model is not None}
+    return {
+        "status": "healthy",
+        "model_loaded": bundle is not None,
+        "model_version": bundle.version if bundle else None,
+    }
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus text exposition of latency histograms, batch sizes, model loads and predictions."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.post("/admin/reload")
+def reload_model():
+    """
+    Loads the currently promoted model in this worker thread, warms it up and swaps it in.
+    Requests keep being served by the old bundle until the swap.
+    """
+    manifest = read_manifest()
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="No promoted model manifest")
+    current = bundle
+    if current and current.manifest and current.manifest["version"] == manifest["version"]:
+        return {"reloaded": False, "model_version": current.version}
+
+    start = time.perf_counter()
+    booster, engineer, manifest = load_promoted(manifest=manifest)
+    load_seconds = round(time.perf_counter() - start, 4)
+    metrics.MODEL_LOAD_SECONDS.observe(load_seconds, "read")
+    record = install_model(booster, engineer, manifest=manifest)
+    if watcher:
+        watcher.current_version = manifest["version"]
+    return {"reloaded": True, "load_seconds": load_seconds, **record}
+
+class RoutingConfig(BaseModel):
+    # Challenger name -> run id staged in the model store (python src/model_store.py stage <run_id>)
+    models: Dict[str, str] = {}
+    # Challenger name -> share of the traffic it serves instead of the champion
+    split: Dict[str, float] = {}
+    # Challengers scoring a copy of the champion's traffic off the request path
+    shadow: List[str] = []
+
+@app.get("/admin/models")
+def model_stats():
+    """Champion and challengers: roles, traffic, score distributions, latencies, shadow agreement."""
+    return registry.stats(bundle)
+
+@app.post("/admin/routing")
+def set_routing(routing: RoutingConfig):
+    """Loads the listed challengers and switches to the new split / shadow routing."""
+    try:
+        return apply_routing(routing.model_dump())
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Run not staged in the model store: {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@app.get("/admin/reloads")
+def reload_stats():
+    """Recent swaps with their warm-up durations."""
+    return {"reloads": list(reload_history)}
+
+def validate_records(records):
+    """
+    Raises a 422 listing the failing schema rules of each invalid application, before
+    an unknown code or a missing value is silently scored as a neutral (WoE 0) feature.
+    """
+    current = schema
+    if current is None:
+        return
+    start = time.perf_counter()
+    if len(records) == 1:
+        rules = current.check_record(records[0])
+        failures = {0: rules} if rules else {}
+    else:
+        violations = current.check_records(records)
+        failures = current.failures(violations) if violations.any() else {}
+    metrics.STAGE_SECONDS.observe(time.perf_counter() - start, "schema")
+    if failures:
+        for rules in failures.values():
+            for rule in rules:
+                metrics.VALIDATION_FAILURES.inc(label_value=rule)
+        raise HTTPException(status_code=422, detail={
+            "errors": [{"index": i, "failed_rules": rules} for i, rules in failures.items()]
+        })
+
+def track_drift(records):
+    """Queues scored records for the drift sketches; binning happens in the flush thread."""
+    monitor = drift_monitor
+    if monitor is not None:
+        monitor.enqueue(records)
+
+def score_with_current(records):
+    """
+    Scores a batch with whichever bundle is current (or the challenger its split routes
+    to) and tags each result with the version that produced it.
+    """
+    current = bundle
+    metrics.BATCH_SIZE.observe(len(records), "coalesced")
+    probs, versions = registry.score_many(current, records)
+    track_drift(records)
+    return list(zip(probs, versions))
+
+def score_one_with_current(record):
+    current = bundle
+    prob, version = registry.score_one(current, record)
+    track_drift([record])
+    return prob, version
+
+def cache_lookup(current, record):
+    """(cache key, cached probability or None); the key is None when caching is off."""
+    cache = score_cache
+    if cache is None:
+        return None, None
+    start = time.perf_counter()
+    key = cache.make_key(current.version, current.feature_key(record))
+    prob = cache.get(key)
+    metrics.STAGE_SECONDS.observe(time.perf_counter() - start, "cache")
+    return key, prob
+
+def cache_store(key, prob, version, current):
+    # A reload between lookup and scoring means the score belongs to another version
+    if key is not None and version == current.version:
+        score_cache.put(key, prob)
+
+def build_response(prob, application, version):
+    prob = float(prob)
+    risk_label = "High Risk" if prob > 0.5 else "Low Risk"
+    metrics.PREDICTIONS.inc(label_value=risk_label)
+    return {
+        "probability_of_default": round(prob, 4),
+        "risk_label": risk_label,
+        "model_version": version,
+        "inputs_received": {
+            "amount": application.amount,
+            "duration": application.duration
+        }
+    }
+
+batcher = MicroBatcher(
+    score_with_current, max_batch_size=SCORE_BATCH_MAX_SIZE, max_wait_ms=SCORE_BATCH_WINDOW_MS
+)
 
 @app.post("/score")
-def score_application(application: CreditApplication):
-    if not model:
+async def score_application(application: CreditApplication):
+    metrics.handler_started()
+    if bundle is None:
         raise HTTPException(status_code=500, detail="Model not loaded")
-    
+    # vars() exposes the validated fields without copying them into a new dict
+    record = vars(application)
+    validate_records([record])
+
     try:
-        # 1. Get Feature Names from the Model
-        if hasattr(model, "feature_names"):
-            cols = model.feature_names
-        else:
-            cols = model.feature_names_in_
-            
-        # 2. Create the DataFrame (Initialize with 0s)
-        df_input = pd.DataFrame(0, index=[0], columns=cols)
-        
-        # 3. INJECT USER INPUTS (The Fix)
-        # We explicitly map the API request fields to the Model columns
-        # Note: In a real system, we would also transform "A11" to a WoE value here.
-        # For now, we pass the numeric raw values to see the score change.
-        
-        if 'duration' in cols: 
-            df_input['duration'] = application.duration
-        if 'amount' in cols: 
-            df_input['amount'] = application.amount
-        if 'age' in cols: 
-            df_input['age'] = application.age
-            
-        # 4. Predict
-        if isinstance(model, xgb.Booster):
-            dmatrix = xgb.DMatrix(df_input)
-            prob = float(model.predict(dmatrix)[0])
+        current = bundle
+        key, prob = cache_lookup(current, record)
+        if prob is not None:
+            track_drift([record])
+            response = build_response(prob, application, current.version)
+            metrics.handler_finished()
+            return response
+
+        if SCORE_COALESCE:
+            prob, version = await batcher.submit(record)
         else:
-            prob = float(model.predict_proba(df_input)[:, 1][0])
-        
-        risk_label = "High Risk" if prob > 0.5 else "Low Risk"
-        
-        return {
-            "probability_of_default": round(prob, 4),
-            "risk_label": risk_label,
-            "inputs_received": {
-                "amount": application.amount,
-                "duration": application.duration
-            }
+            prob, version = await run_in_threadpool(score_one_with_current, record)
+        cache_store(key, prob, version, current)
+        response = build_response(prob, application, version)
+        metrics.handler_finished()
+        return response
+    except Exception as e:
+        print(f"Prediction Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+class CreditApplicationBatch(BaseModel):
+    applications: List[CreditApplication]
+
+@app.post("/score/batch")
+def score_batch(batch: CreditApplicationBatch):
+    metrics.handler_started()
+    if bundle is None:
+        raise HTTPException(status_code=500, detail="Model not loaded")
+    if not batch.applications:
+        return {"results": []}
+    records = [vars(a) for a in batch.applications]
+    validate_records(records)
+
+    try:
+        current = bundle
+        lookups = [cache_lookup(current, r) for r in records]
+        probs = [prob for _, prob in lookups]
+        misses = [i for i, prob in enumerate(probs) if prob is None]
+        metrics.BATCH_SIZE.observe(len(records), "batch")
+        versions = [current.version] * len(records)
+        if misses:
+            scored, scored_versions = registry.score_many(current, [records[i] for i in misses])
+            for i, prob, version in zip(misses, scored, scored_versions):
+                probs[i], versions[i] = prob, version
+                cache_store(lookups[i][0], prob, version, current)
+        track_drift(records)
+        response = {
+            "results": [
+                build_response(p, a, v) for p, a, v in zip(probs, batch.applications, versions)
+            ]
         }
+        metrics.handler_finished()
+        return response
     except Exception as e:
         print(f"Prediction Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/explain")
+def explain_application(application: CreditApplication, top_k: int = Query(EXPLAIN_TOP_K, ge=1)):
+    """Probability plus the top_k reasons pushing it towards default (TreeSHAP, log-odds)."""
+    current = bundle
+    if current is None:
+        raise HTTPException(status_code=500, detail="Model not loaded")
+    if current.explainer is None:
+        raise HTTPException(status_code=501, detail="Explanations need an XGBoost booster")
+    record = vars(application)
+    validate_records([record])
+    result = current.explainer.explain_records([record], top_k)[0]
+    return {**result, "model_version": current.version}
+
+@app.post("/explain/batch")
+def explain_batch(batch: CreditApplicationBatch, top_k: int = Query(EXPLAIN_TOP_K, ge=1)):
+    """Reason codes for many applications in one pred_contribs call."""
+    current = bundle
+    if current is None:
+        raise HTTPException(status_code=500, detail="Model not loaded")
+    if current.explainer is None:
+        raise HTTPException(status_code=501, detail="Explanations need an XGBoost booster")
+    records = [vars(a) for a in batch.applications]
+    validate_records(records)
+    results = current.explainer.explain_records(records, top_k)
+    return {"results": results, "model_version": current.version}
+
+@app.get("/drift")
+def drift_report():
+    """PSI / KS / JS of the traffic scored since the last reset against the training reference."""
+    if drift_monitor is None:
+        raise HTTPException(status_code=404, detail="No drift reference loaded")
+    return drift_monitor.report()
+
+@app.post("/admin/drift/reset")
+def reset_drift():
+    """Starts a new drift window (e.g. daily)."""
+    if drift_monitor is None:
+        raise HTTPException(status_code=404, detail="No drift reference loaded")
+    drift_monitor.reset()
+    return {"reset": True}
+
+@app.get("/admin/cache")
+def cache_stats():
+    """Hit / miss / eviction counters of the score cache."""
+    if score_cache is None:
+        raise HTTPException(status_code=404, detail="Score cache disabled")
+    return score_cache.stats()
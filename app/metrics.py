@@ -0,0 +1,258 @@
+"""
+Prometheus-style metrics for the scoring API, without a client library.
+
+Counters and histograms keep one shard of plain Python numbers per thread, so
+recording is a thread-local lookup, a bisect and two list increments: no lock is
+taken on the request path. GET /metrics sums the shards and renders the text
+exposition format (version 0.0.4).
+
+Per-request stage timings:
+  - validation:    request received -> handler entered (body read, JSON parse, pydantic)
+  - cache:         score cache lookup
+  - features:      raw field assembly (FeatureLayout.write_fields)
+  - woe_transform: WoE encoding of categorical and binned fields (FeatureLayout.write_woe)
+  - predict:       the model call
+  - serialization: handler returned -> response sent (response dict, JSON encoding)
+"""
+from bisect import bisect_left
+import contextvars
+import math
+import threading
+import time
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+STAGE_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 0.1)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+SCORE_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+MODEL_LOAD_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REGISTRY = []
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+class _Metric:
+    """A metric family with at most one label; children are created on first use."""
+    kind = None
+
+    def __init__(self, name, documentation, label=None, registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self._children = {}
+        self._create_lock = threading.Lock()
+        registry.append(self)
+
+    def labels(self, label_value):
+        """The child for one label value; hot paths keep it (or its bound method) around."""
+        child = self._children.get(label_value)
+        if child is None:
+            with self._create_lock:  # first observation of a label value only
+                child = self._children.setdefault(label_value, self._new_child())
+        return child
+
+    def _label_pairs(self, label_value):
+        return ((self.label, label_value),) if self.label else ()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for label_value, child in list(self._children.items()):
+            lines += child.render(self.name, self._label_pairs(label_value))
+        return lines
+
+class _Sharded:
+    """Per-thread lists of numbers; readers sum over every thread's list."""
+
+    def __init__(self, size):
+        self._size = size
+        self._local = threading.local()
+        self._shards = []
+
+    def shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = [0] * self._size
+            self._shards.append(shard)  # list.append is atomic
+            return shard
+
+    def totals(self):
+        totals = [0] * self._size
+        for shard in list(self._shards):
+            for i, v in enumerate(shard):
+                totals[i] += v
+        return totals
+
+class _CounterChild(_Sharded):
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount=1):
+        try:
+            self._local.shard[0] += amount
+        except AttributeError:
+            self.shard()[0] += amount
+
+    def render(self, name, labels):
+        return [f"{name}_total{_labels(labels)} {_format_value(self.totals()[0])}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1, label_value=None):
+        (self._children.get(label_value) or self.labels(label_value)).inc(amount)
+
+    def value(self, label_value=None):
+        child = self._children.get(label_value)
+        return child.totals()[0] if child else 0
+
+class _HistogramChild(_Sharded):
+    def __init__(self, buckets):
+        # One slot per bucket, one for +Inf, then the sum
+        super().__init__(len(buckets) + 2)
+        self.buckets = buckets
+
+    def observe(self, value):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self.shard()
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def render(self, name, labels):
+        totals = self.totals()
+        lines, cumulative = [], 0
+        for upper, count in zip(self.buckets + (math.inf,), totals[:-1]):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(labels + (('le', _format_value(upper)),))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {_format_value(float(totals[-1]))}")
+        lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return lines
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, buckets, label=None, registry=REGISTRY):
+        self.buckets = tuple(float(b) for b in buckets)
+        super().__init__(name, documentation, label, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value, label_value=None):
+        (self._children.get(label_value) or self.labels(label_value)).observe(value)
+
+    def count(self, label_value=None):
+        child = self._children.get(label_value)
+        return sum(child.totals()[:-1]) if child else 0
+
+class Gauge(_Metric):
+    """A value read at scrape time from `read()` -> {label value: number}."""
+    kind = "gauge"
+
+    def __init__(self, name, documentation, read, label=None, registry=REGISTRY):
+        super().__init__(name, documentation, label, registry)
+        self.read = read
+
+    def render(self, name=None):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for label_value, value in (self.read() or {}).items():
+            lines.append(f"{self.name}{_labels(self._label_pairs(label_value))} {_format_value(value)}")
+        return lines
+
+def render(registry=REGISTRY):
+    """Text exposition of every registered metric."""
+    return "\n".join(line for metric in registry for line in metric.render()) + "\n"
+
+# Scoring API metrics
+REQUEST_SECONDS = Histogram(
+    "sentinel_request_duration_seconds", "End-to-end latency of scoring requests.",
+    LATENCY_BUCKETS, label="path",
+)
+STAGE_SECONDS = Histogram(
+    "sentinel_stage_duration_seconds", "Time spent per scoring stage.", STAGE_BUCKETS, label="stage",
+)
+BATCH_SIZE = Histogram(
+    "sentinel_batch_size", "Applications per model call (coalesced /score batches and /score/batch).",
+    BATCH_SIZE_BUCKETS, label="source",
+)
+MODEL_LOAD_SECONDS = Histogram(
+    "sentinel_model_load_duration_seconds", "Model read from disk and bundle build + warm-up.",
+    MODEL_LOAD_BUCKETS, label="phase",
+)
+PREDICTIONS = Counter(
+    "sentinel_predictions", "Scored applications by risk band.", label="risk_band",
+)
+
+# Per-model comparison (app/registry.py): the champion, split and shadow models
+MODEL_SCORE = Histogram(
+    "sentinel_model_score", "Probability of default per model.", SCORE_BUCKETS, label="model",
+)
+MODEL_PREDICT_SECONDS = Histogram(
+    "sentinel_model_predict_duration_seconds", "Latency of one model call (a batch) per model.",
+    STAGE_BUCKETS, label="model",
+)
+SHADOW_DROPPED = Counter(
+    "sentinel_shadow_dropped", "Applications not shadow-scored because the queue was full.",
+)
+
+# Data-quality gate (src/validation.py)
+VALIDATION_FAILURES = Counter(
+    "sentinel_validation_failures", "Rejected applications by failing schema rule.", label="rule",
+)
+
+# Request timing: the middleware opens a timer, the handlers mark their start and end
+_timer = contextvars.ContextVar("sentinel_request_timer", default=None)
+
+class RequestTimer:
+    __slots__ = ("start", "handler_end")
+
+    def __init__(self, start):
+        self.start = start
+        self.handler_end = None
+
+def handler_started():
+    """Called first thing in a handler: everything since the request arrived was validation."""
+    timer = _timer.get()
+    if timer is not None:
+        STAGE_SECONDS.observe(time.perf_counter() - timer.start, "validation")
+
+def handler_finished():
+    timer = _timer.get()
+    if timer is not None:
+        timer.handler_end = time.perf_counter()
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing the given paths (cheaper than BaseHTTPMiddleware)."""
+
+    def __init__(self, app, paths=("/score", "/score/batch")):
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path")
+        if scope["type"] != "http" or path not in self.paths:
+            return await self.app(scope, receive, send)
+
+        # The timer is mutable, so handlers running in a copied context still reach it
+        timer = RequestTimer(time.perf_counter())
+        token = _timer.set(timer)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _timer.reset(token)
+            end = time.perf_counter()
+            REQUEST_SECONDS.observe(end - timer.start, path)
+            if timer.handler_end is not None:
+                STAGE_SECONDS.observe(end - timer.handler_end, "serialization")
@@ -0,0 +1,230 @@
+"""
+Model registry: challengers next to the champion, as A/B splits or shadow models.
+
+The champion is the promoted model the API serves (app.main.bundle). Challengers
+are other runs from the model store, loaded as their own ModelBundle:
+  - split:  a fraction of the applications is served by a challenger instead.
+            Assignment hashes the encoded feature vector, so a resent application
+            always lands on the same model.
+  - shadow: the challenger scores a copy of the traffic the champion served. The
+            request path only appends (record, champion probability) to a bounded
+            queue; a background thread scores the queue in batches, so a shadow
+            model adds no latency to the response.
+Score distributions and latencies of every model go to /metrics (label `model`),
+and GET /admin/models adds the shadow models' agreement with the champion.
+
+The routing is one JSON document, read from the model store (routing.json) at
+startup or posted to /admin/routing:
+
+    {"models": {"challenger": "<run_id>"}, "split": {"challenger": 0.1}, "shadow": ["challenger"]}
+"""
+import collections
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+
+from app import metrics
+
+# Config
+SHADOW_QUEUE_SIZE = int(os.getenv("SHADOW_QUEUE_SIZE", "100000"))
+SHADOW_BATCH_SIZE = int(os.getenv("SHADOW_BATCH_SIZE", "256"))
+SHADOW_FLUSH_SECONDS = float(os.getenv("SHADOW_FLUSH_SECONDS", "0.05"))
+CHAMPION = "champion"
+HIGH_RISK_THRESHOLD = 0.5  # the risk_label cut-off of the API
+
+class Routing:
+    """One immutable routing table; the registry swaps it with a single assignment."""
+
+    def __init__(self, models=None, split=None, shadow=()):
+        self.models = dict(models or {})  # name -> ModelBundle
+        split = {name: float(share) for name, share in (split or {}).items() if share > 0}
+        shadow = tuple(shadow)
+        for name in [*split, *shadow]:
+            if name == CHAMPION or name not in self.models:
+                raise ValueError(f"Unknown model in routing: {name!r}")
+        if any(share > 1 for share in split.values()) or sum(split.values()) > 1:
+            raise ValueError("Traffic split must add up to at most 1")
+        if set(split) & set(shadow):
+            raise ValueError("A model is either split or shadow, not both")
+        self.split = split
+        self.shadow = shadow
+        # Cumulative upper bounds of the split buckets; the rest of [0, 1) is the champion's
+        self._bounds, upper = [], 0.0
+        for name, share in split.items():
+            upper += share
+            self._bounds.append((upper, name))
+
+    def route(self, key):
+        """Name of the split model serving this feature key, or None for the champion."""
+        bucket = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big") / 2 ** 64
+        for upper, name in self._bounds:
+            if bucket < upper:
+                return name
+        return None
+
+class ModelRegistry:
+    """
+    Scores applications with the champion and the routed challengers. Thread-safe:
+    the routing is replaced wholesale, the shadow queue is a bounded deque.
+    """
+
+    def __init__(self, queue_size=SHADOW_QUEUE_SIZE, batch_size=SHADOW_BATCH_SIZE):
+        self.routing = Routing()
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self._pending = collections.deque(maxlen=queue_size)
+        self._compare_lock = threading.Lock()
+        self._comparisons = {}  # shadow name -> [compared, abs diff sum, max abs diff, same band]
+        self._stop = threading.Event()
+        self._thread = None
+
+    def configure(self, models, split=None, shadow=()):
+        """Installs a new routing (validated first); returns it."""
+        routing = Routing(models, split, shadow)
+        with self._compare_lock:
+            self._comparisons = {name: [0, 0.0, 0.0, 0] for name in routing.shadow}
+        self._pending.clear()
+        self.routing = routing
+        return routing
+
+    def _score(self, name, model_bundle, records):
+        start = time.perf_counter()
+        probs = model_bundle.score_many(records)
+        metrics.MODEL_PREDICT_SECONDS.observe(time.perf_counter() - start, name)
+        score = metrics.MODEL_SCORE.labels(name).observe
+        for prob in probs.tolist():
+            score(prob)
+        return probs
+
+    def score_many(self, champion, records):
+        """(probabilities, serving model version per record) for a list of applications."""
+        routing = self.routing
+        if not routing.split:
+            probs = self._score(CHAMPION, champion, records)
+            versions = [champion.version] * len(records)
+            if routing.shadow:
+                self.enqueue(records, probs)
+        else:
+            groups = collections.defaultdict(list)
+            for i, record in enumerate(records):
+                groups[routing.route(champion.feature_key(record))].append(i)
+            probs = np.empty(len(records), dtype=np.float32)
+            versions = [None] * len(records)
+            for name, idx in groups.items():
+                model_bundle = champion if name is None else routing.models[name]
+                probs[idx] = self._score(name or CHAMPION, model_bundle, [records[i] for i in idx])
+                for i in idx:
+                    versions[i] = model_bundle.version
+            # Shadows are compared with the champion, so only its share is mirrored
+            if routing.shadow and None in groups:
+                self.enqueue([records[i] for i in groups[None]], probs[groups[None]])
+        return probs, versions
+
+    def score_one(self, champion, record):
+        probs, versions = self.score_many(champion, [record])
+        return float(probs[0]), versions[0]
+
+    def enqueue(self, records, probs):
+        """Hot path: queues (record, served probability) pairs for the shadow models."""
+        overflow = len(self._pending) + len(records) - self.queue_size
+        if overflow > 0:
+            metrics.SHADOW_DROPPED.inc(overflow)  # the deque drops the oldest entries
+        self._pending.extend(zip(records, probs.tolist()))
+
+    def flush(self):
+        """Scores every queued record with each shadow model, in batches."""
+        routing = self.routing
+        while True:
+            batch = []
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._pending.popleft())
+            except IndexError:
+                pass
+            if not batch:
+                return
+            records = [record for record, _ in batch]
+            served = np.array([prob for _, prob in batch])
+            for name in routing.shadow:
+                probs = self._score(name, routing.models[name], records)
+                self._compare(name, served, probs)
+
+    def _compare(self, name, served, probs):
+        diff = np.abs(probs - served)
+        same_band = np.count_nonzero((probs > HIGH_RISK_THRESHOLD) == (served > HIGH_RISK_THRESHOLD))
+        with self._compare_lock:
+            stats = self._comparisons.get(name)
+            if stats is None:  # routing changed while this batch was scored
+                return
+            stats[0] += len(diff)
+            stats[1] += float(diff.sum())
+            stats[2] = max(stats[2], float(diff.max()))
+            stats[3] += int(same_band)
+
+    def start(self, interval=SHADOW_FLUSH_SECONDS):
+        """Scores the shadow queue from a daemon thread every `interval` seconds."""
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"⚠️  Shadow scoring failed: {e}")
+
+        self._stop.clear()  # the API may be started again in the same process (tests)
+        self._thread = threading.Thread(target=loop, name="shadow-scorer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    @staticmethod
+    def _distribution(name):
+        """Scored count, mean, high-risk rate and histogram of one model (since process start)."""
+        scores = metrics.MODEL_SCORE.labels(name).totals()
+        latency = metrics.MODEL_PREDICT_SECONDS.labels(name).totals()
+        n, calls = sum(scores[:-1]), sum(latency[:-1])
+        low_risk = sum(scores[:metrics.SCORE_BUCKETS.index(HIGH_RISK_THRESHOLD) + 1])
+        return {
+            "scored": n,
+            "mean_score": round(scores[-1] / n, 6) if n else None,
+            "high_risk_rate": round((n - low_risk) / n, 4) if n else None,
+            "score_histogram": dict(zip(map(str, metrics.SCORE_BUCKETS), scores[:-2])),
+            "calls": calls,
+            "mean_call_ms": round(latency[-1] / calls * 1000, 4) if calls else None,
+        }
+
+    def stats(self, champion=None):
+        """Per-model role, version, score distribution and latency; shadows add agreement."""
+        routing = self.routing
+        models = [{"name": CHAMPION, "role": "champion", "version": champion.version if champion else None,
+                   "traffic": round(1 - sum(routing.split.values()), 6)}]
+        for name, model_bundle in routing.models.items():
+            role = "split" if name in routing.split else "shadow" if name in routing.shadow else "idle"
+            models.append({"name": name, "role": role, "version": model_bundle.version,
+                           "traffic": routing.split.get(name, 0.0)})
+
+        with self._compare_lock:
+            comparisons = {name: list(stats) for name, stats in self._comparisons.items()}
+        for model in models:
+            model.update(self._distribution(model["name"]))
+            compared = comparisons.get(model["name"])
+            if compared:
+                n, diff_sum, max_diff, same_band = compared
+                model["vs_champion"] = {
+                    "compared": n,
+                    "mean_abs_diff": round(diff_sum / n, 6) if n else None,
+                    "max_abs_diff": round(max_diff, 6),
+                    "risk_band_agreement": round(same_band / n, 4) if n else None,
+                }
+        return {
+            "models": models,
+            "shadow_queue": {"pending": len(self._pending), "max_size": self.queue_size,
+                             "dropped": metrics.SHADOW_DROPPED.value()},
+        }
@@ -0,0 +1,119 @@
+"""
+Benchmark: model resolution + load time at cold start vs number of MLflow runs.
+
+Builds a throwaway file-based tracking store with N runs (one of them holding a real
+booster, the rest metric-only Optuna-style trials), then times
+  - search:   mlflow.search_runs over the experiment, sorted by AUC, + load_model
+  - manifest: read_manifest + load_promoted from the local model store
+Each measurement runs in a fresh interpreter so nothing is cached between them, and
+reports both the total (imports included) and the resolve + load part alone.
+
+    python benchmarks/bench_cold_start.py --runs 10 1000 10000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+EXPERIMENT_ID = "1"
+EXPERIMENT_NAME = "Sentinel_Credit_Risk_Engine"
+
+SEARCH_SNIPPET = """
+import time; start = time.perf_counter()
+import mlflow, mlflow.xgboost
+imported = time.perf_counter()
+mlflow.set_tracking_uri({uri!r})
+experiment = mlflow.get_experiment_by_name({name!r})
+runs = mlflow.search_runs(experiment_ids=[experiment.experiment_id],
+                          order_by=["metrics.auc DESC"], max_results=1)
+model = mlflow.xgboost.load_model(f"runs:/{{runs.iloc[0].run_id}}/model")
+end = time.perf_counter(); print(end - start, end - imported)
+"""
+
+MANIFEST_SNIPPET = """
+import time; start = time.perf_counter()
+import sys; sys.path.insert(0, {root!r})
+from src.model_store import load_promoted
+imported = time.perf_counter()
+model, engineer, manifest = load_promoted({store!r})
+end = time.perf_counter(); print(end - start, end - imported)
+"""
+
+
+def write_run(exp_dir, run_id, auc):
+    """Writes a minimal FileStore run (same layout as mlruns/ in this repo)."""
+    run_dir = os.path.join(exp_dir, run_id)
+    os.makedirs(os.path.join(run_dir, "metrics"))
+    with open(os.path.join(run_dir, "meta.yaml"), "w") as f:
+        f.write(
+            f"artifact_uri: file://{run_dir}/artifacts\nend_time: 1\nentry_point_name: ''\n"
+            f"experiment_id: '{EXPERIMENT_ID}'\nlifecycle_stage: active\nrun_id: {run_id}\n"
+            f"run_name: trial\nrun_uuid: {run_id}\nsource_name: ''\nsource_type: 4\n"
+            f"source_version: ''\nstart_time: 1\nstatus: 3\ntags: []\nuser_id: bench\n"
+        )
+    with open(os.path.join(run_dir, "metrics", "auc"), "w") as f:
+        f.write(f"1 {auc} 0\n")
+    return run_dir
+
+
+def build_store(root, n_runs):
+    """Creates a tracking store with n_runs runs and a promoted-model store for the best one."""
+    import mlflow
+    import mlflow.xgboost
+    import xgboost as xgb
+    from src.features import CreditRiskFeatures
+    from src.model_store import promote_model
+    from src.synthetic import make_credit_frame
+
+    uri = f"file://{root}/mlruns"
+    exp_dir = os.path.join(root, "mlruns", EXPERIMENT_ID)
+    os.makedirs(exp_dir)
+    with open(os.path.join(exp_dir, "meta.yaml"), "w") as f:
+        f.write(f"artifact_location: file://{exp_dir}\ncreation_time: 1\nexperiment_id: "
+                f"'{EXPERIMENT_ID}'\nlast_update_time: 1\nlifecycle_stage: active\n"
+                f"name: {EXPERIMENT_NAME}\n")
+
+    for i in range(n_runs - 1):
+        write_run(exp_dir, uuid.uuid4().hex, 0.5 + 0.3 * i / n_runs)
+
+    engineer = CreditRiskFeatures()
+    df = engineer.fit_transform(make_credit_frame(5_000), target_col='target')
+    booster = xgb.train({"objective": "binary:logistic", "max_depth": 4},
+                        xgb.DMatrix(df.drop(columns=['target']), label=df['target']), 100)
+    best_run = uuid.uuid4().hex
+    run_dir = write_run(exp_dir, best_run, 0.9)
+    mlflow.xgboost.save_model(booster, os.path.join(run_dir, "artifacts", "model"))
+    promote_model(booster, engineer, best_run, store_dir=os.path.join(root, "models"))
+    return uri
+
+
+def time_fresh(snippet):
+    """Returns (total seconds incl. imports, seconds to resolve + load) from a fresh interpreter."""
+    out = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True, check=True)
+    total, resolve = out.stdout.strip().splitlines()[-1].split()
+    return float(total), float(resolve)
+
+
+def run(run_counts, repeats):
+    print(f"{'runs':>8} {'search: total / resolve (s)':>30} {'manifest: total / resolve (s)':>32}")
+    for n_runs in run_counts:
+        with tempfile.TemporaryDirectory() as root:
+            uri = build_store(root, n_runs)
+            search = min(time_fresh(SEARCH_SNIPPET.format(uri=uri, name=EXPERIMENT_NAME))
+                         for _ in range(repeats))
+            manifest = min(time_fresh(MANIFEST_SNIPPET.format(root=ROOT, store=os.path.join(root, "models")))
+                           for _ in range(repeats))
+            print(f"{n_runs:>8} {search[0]:>21.3f} / {search[1]:.3f} {manifest[0]:>23.3f} / {manifest[1]:.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, nargs="+", default=[10, 1_000, 10_000])
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh interpreters per point (min is kept)")
+    args = parser.parse_args()
+    run(args.runs, args.repeats)
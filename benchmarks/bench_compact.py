@@ -0,0 +1,127 @@
+"""
+Benchmark: memory and time of training / scoring from a CompactMatrix vs the float64 frame.
+
+Each variant runs in a fresh process on the same synthetic raw data:
+  - dense:   engineer.fit_transform -> float64 DataFrame -> QuantileDMatrix -> xgb.train
+  - compact: engineer.fit -> CompactMatrix (uint8/uint16 codes) -> QuantileDMatrix
+             through the batch iterator -> xgb.train
+Reports the feature matrix size, the peak RSS above the loaded raw data (sampled
+from /proc/self/statm every few ms) and the encode / matrix build / train / score
+times. Models must match.
+
+    python benchmarks/bench_compact.py --rows 1000000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import xgboost as xgb
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.compact import CompactMatrix
+from src.features import CreditRiskFeatures
+from src.synthetic import make_credit_frame
+
+PARAMS = {"max_depth": 4, "eta": 0.1, "objective": "binary:logistic"}
+
+
+class RssSampler:
+    """Peak resident memory (MB) since start(), polled from a thread."""
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+
+    @staticmethod
+    def rss_mb():
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+    def start(self):
+        self.baseline = self.rss_mb()
+
+        def loop():
+            while not self._stop.wait(self.interval):
+                self.peak = max(self.peak, self.rss_mb() - self.baseline)
+
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.peak
+
+
+def measure(variant, n_rows, rounds):
+    """Runs one variant in this process; returns its measurements."""
+    df = make_credit_frame(n_rows, seed=0)
+    y = df['target'].to_numpy()
+    sampler = RssSampler().start()
+    engineer = CreditRiskFeatures()
+    timings = {}
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        engineer.fit(df)
+    if variant == "dense":
+        X = engineer.transform(df).drop(columns=['target'])
+        matrix_mb = X.memory_usage(index=False).sum() / 1e6
+    else:
+        X = CompactMatrix.from_frame(df, engineer)
+        matrix_mb = X.nbytes / 1e6
+    timings["encode"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dtrain = xgb.QuantileDMatrix(X, label=y) if variant == "dense" else X.quantile_dmatrix(label=y)
+    timings["build"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model = xgb.train(PARAMS, dtrain, rounds)
+    timings["train"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    preds = model.inplace_predict(X) if variant == "dense" else X.predict(model)
+    timings["score"] = time.perf_counter() - start
+    return {"matrix_mb": matrix_mb, "peak_mb": sampler.stop(), "timings": timings,
+            "checksum": float(np.sum(preds, dtype=np.float64))}
+
+
+def run(n_rows, rounds):
+    print(f"{n_rows} rows, {rounds} rounds\n")
+    print(f"{'variant':<8} {'matrix (MB)':>12} {'peak RSS (MB)':>14} {'encode (s)':>11} "
+          f"{'build (s)':>10} {'train (s)':>10} {'score (s)':>10}")
+    results = {}
+    for variant in ("dense", "compact"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--rows", str(n_rows), "--rounds", str(rounds), "--variant", variant],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = results[variant] = json.loads(out.splitlines()[-1])
+        t = result["timings"]
+        print(f"{variant:<8} {result['matrix_mb']:12.1f} {result['peak_mb']:14.0f} {t['encode']:11.2f} "
+              f"{t['build']:10.2f} {t['train']:10.2f} {t['score']:10.2f}")
+    assert np.isclose(results["dense"]["checksum"], results["compact"]["checksum"], rtol=1e-9), "models differ"
+    print(f"\nMatrix {results['dense']['matrix_mb'] / results['compact']['matrix_mb']:.1f}x smaller, "
+          f"peak RSS {results['dense']['peak_mb'] - results['compact']['peak_mb']:.0f} MB lower")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--variant", choices=["dense", "compact"], help="Measure one variant (child process)")
+    args = parser.parse_args()
+    if args.variant:
+        print(json.dumps(measure(args.variant, args.rows, args.rounds)))
+    else:
+        run(args.rows, args.rounds)
@@ -0,0 +1,72 @@
+"""
+Benchmark: compiled tree ensemble (src/compiled_trees.py) vs the XGBoost Booster.
+
+Trains a booster on WoE-encoded synthetic data, compiles it and times, per batch size,
+  - Booster.predict(DMatrix(X))      (what /score did before the fast path)
+  - Booster.inplace_predict(X)       (the FastScorer path)
+  - CompiledEnsemble.predict(X)      (all trees walked level by level as binary heaps)
+  - ... with leaf tables             (discrete-only trees looked up, the rest walked)
+and checks that every engine matches Booster.predict within 1e-6.
+
+    python benchmarks/bench_compiled_trees.py --batch-sizes 1 64 1024 65536 1000000 --depth 4
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import xgboost as xgb
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.compiled_trees import compile_booster, woe_levels
+from src.features import CreditRiskFeatures
+from src.synthetic import make_credit_frame
+
+
+def best_time(fn, budget=1.0):
+    """Best per-call seconds, repeating for roughly `budget` seconds."""
+    single = timeit.timeit(fn, number=1)
+    number = max(1, int(budget / 5 / max(single, 1e-7)))
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def run(batch_sizes, depth, rounds):
+    engineer = CreditRiskFeatures()
+    df = engineer.fit_transform(make_credit_frame(max(batch_sizes + [50_000])), target_col='target')
+    X = df.drop(columns=['target'])
+    booster = xgb.train({"max_depth": depth, "eta": 0.1, "objective": "binary:logistic"},
+                        xgb.DMatrix(X, label=df['target']), rounds)
+    X = X.to_numpy(dtype=np.float32)
+
+    compiled = compile_booster(booster)
+    tabulated = compile_booster(booster)
+    n_tables = tabulated.build_leaf_tables(woe_levels(engineer, booster.feature_names))
+    print(f"{compiled.n_trees} trees, depth {compiled.depth}, {len(compiled.feature)} nodes, "
+          f"{n_tables} trees tabulated, {os.cpu_count()} CPU(s)")
+
+    engines = {
+        "predict": lambda A: booster.predict(xgb.DMatrix(A, feature_names=booster.feature_names)),
+        "inplace": lambda A: booster.inplace_predict(A),
+        "compiled": compiled.predict,
+        "tables": tabulated.predict,
+    }
+    reference = engines["predict"](X)
+    for name, fn in engines.items():
+        assert np.abs(fn(X) - reference).max() < 1e-6, name
+
+    print(f"{'batch':>9} " + " ".join(f"{name + ' (µs)':>15}" for name in engines) + f" {'rows/s compiled':>16}")
+    for n in batch_sizes:
+        A = X[:n]
+        times = {name: best_time(lambda: fn(A)) for name, fn in engines.items()}
+        print(f"{n:>9} " + " ".join(f"{t * 1e6:>15.1f}" for t in times.values())
+              + f" {n / times['compiled']:>16,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 64, 1024, 65_536, 1_000_000])
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+    run(args.batch_sizes, args.depth, args.rounds)
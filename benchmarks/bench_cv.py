@@ -0,0 +1,75 @@
+"""
+Benchmark: model selection on a single holdout split vs k-fold CV (src/cv.py).
+
+The current loop (src/train.py) fits WoE on the whole dataset, then trains on one
+80/20 split; its AUC depends on which rows land in the holdout, so it is repeated
+over --seeds split seeds to show the spread. The CV engine fits WoE out-of-fold,
+caches the fold matrices once, and trains the folds sequentially (--jobs 1) or in
+parallel threads. Reports mean/std AUC and wall time (preparation + training).
+
+    python benchmarks/bench_cv.py --rows 100000 --folds 5
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import xgboost as xgb
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src import cv
+from src.features import CreditRiskFeatures
+from src.synthetic import make_credit_frame
+from src.train import MANUAL_PARAMS
+
+
+def single_split(df, seed, rounds):
+    """One pass of the current train.py loop: WoE on all rows, then an 80/20 holdout."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_processed = CreditRiskFeatures().fit_transform(df, target_col='target')
+    X, y = df_processed.drop(columns=['target']), df_processed['target']
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=seed)
+    model = xgb.train(MANUAL_PARAMS, xgb.DMatrix(X_train, label=y_train), rounds)
+    return roc_auc_score(y_test, model.predict(xgb.DMatrix(X_test)))
+
+
+def run(n_rows, n_folds, n_seeds, rounds, jobs):
+    df = make_credit_frame(n_rows, seed=0)
+    print(f"{n_rows} rows, {rounds} rounds, {os.cpu_count()} CPU(s)\n")
+    print(f"{'setup':<28} {'AUC mean':>9} {'AUC std':>8} {'wall (s)':>9}")
+
+    start = time.perf_counter()
+    aucs = [single_split(df, seed, rounds) for seed in range(n_seeds)]
+    seconds = (time.perf_counter() - start) / n_seeds
+    print(f"{'single split (per seed)':<28} {np.mean(aucs):9.4f} {np.std(aucs):8.4f} {seconds:9.2f}")
+
+    for n_jobs in dict.fromkeys([1, jobs]):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            folds = cv.prepare_folds(df, n_folds=n_folds, n_jobs=n_jobs)
+        prepared = time.perf_counter() - start
+        result = cv.cross_validate(folds, MANUAL_PARAMS, num_boost_round=rounds, n_jobs=n_jobs)
+        print(f"{f'{n_folds}-fold CV, {n_jobs} job(s)':<28} {result['auc_mean']:9.4f} "
+              f"{result['auc_std']:8.4f} {prepared + result['seconds']:9.2f}"
+              f"  (prepare {prepared:.2f}, train {result['seconds']:.2f})")
+
+    # Tuning reuses the prepared folds: each further parameter set only trains
+    start = time.perf_counter()
+    cv.cross_validate(folds, {**MANUAL_PARAMS, "eta": 0.2}, num_boost_round=rounds, n_jobs=jobs)
+    print(f"{'next trial on cached folds':<28} {'':>9} {'':>8} {time.perf_counter() - start:9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--seeds", type=int, default=5, help="Holdout seeds of the single-split loop")
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=cv.CV_JOBS, help="Folds trained in parallel")
+    args = parser.parse_args()
+    run(args.rows, args.folds, args.seeds, args.rounds, args.jobs)
@@ -0,0 +1,100 @@
+"""
+Benchmark: cost of the online drift monitor (src/drift.py) on the scoring path.
+
+  - update:   DriftMonitor.update per scored record, update_many per 64-record batch, and
+              enqueue (what the API calls; binning then happens in the flush thread)
+  - report:   PSI / KS / JS for all features on demand
+  - scoring:  app.main.score_with_current on 64-record batches with and without the monitor
+  - offline:  update_frame over the whole current window vs the Evidently report (if installed)
+
+    python benchmarks/bench_drift.py --reference-rows 100000 --current-rows 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.drift import DriftMonitor
+from src.synthetic import make_credit_frame
+
+
+def per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def scoring_overhead(reference, records):
+    import xgboost as xgb
+    import app.main as api
+    from src.features import CreditRiskFeatures
+
+    engineer = CreditRiskFeatures()
+    df = engineer.fit_transform(reference, target_col='target')
+    booster = xgb.train({"max_depth": 4, "objective": "binary:logistic"},
+                        xgb.DMatrix(df.drop(columns=['target']), label=df['target']), 100)
+    api.install_model(booster, engineer, version="bench")
+
+    batches = [records[i:i + 64] for i in range(0, 64 * 200, 64)]
+    results = {}
+    for label, monitor in (("without monitor", None), ("with monitor", DriftMonitor.from_reference(reference))):
+        api.drift_monitor = monitor
+        latencies = []
+        for batch in batches:
+            start = time.perf_counter()
+            api.score_with_current(batch)
+            latencies.append(time.perf_counter() - start)
+        results[label] = np.percentile(latencies, [50, 99]) * 1e3
+        if monitor is not None:
+            start = time.perf_counter()
+            monitor.flush()
+            print(f"flush:          {len(batches) * 64} queued records binned in "
+                  f"{(time.perf_counter() - start) * 1e3:.1f} ms (background thread in the API)")
+    return results
+
+
+def run(reference_rows, current_rows):
+    reference = make_credit_frame(reference_rows, seed=0)
+    current = make_credit_frame(current_rows, seed=1)
+    current["amount"] = current["amount"] * 2  # a drifted feature
+    records = current.head(20_000).drop(columns=['target']).to_dict("records")
+
+    monitor = DriftMonitor.from_reference(reference)
+    it = iter(records * 10)
+    print(f"update:         {per_call_us(lambda: monitor.update(next(it)), 10_000):8.2f} µs / record "
+          f"({len(monitor.columns)} features)")
+    batch = records[:64]
+    print(f"update_many:    {per_call_us(lambda: monitor.update_many(batch), 200):8.1f} µs / 64-record batch")
+    print(f"enqueue:        {per_call_us(lambda: monitor.enqueue(batch), 200):8.1f} µs / 64-record batch")
+    monitor.reset()
+    print(f"report:         {per_call_us(monitor.report, 200) / 1e3:8.2f} ms")
+
+    for label, (p50, p99) in scoring_overhead(reference, records).items():
+        print(f"score 64 {label:<16} p50 {p50:.3f} ms  p99 {p99:.3f} ms")
+
+    monitor.reset()
+    start = time.perf_counter()
+    monitor.update_frame(current)
+    report = monitor.report()
+    print(f"offline:        update_frame + report over {current_rows} rows in "
+          f"{time.perf_counter() - start:.2f} s, drifted: {report['drifted']}")
+
+    try:
+        from evidently.report import Report
+        from evidently.metric_preset import DataDriftPreset
+    except ImportError:
+        print("evidently:      not installed, skipped")
+        return
+    start = time.perf_counter()
+    Report(metrics=[DataDriftPreset()]).run(reference_data=reference, current_data=current)
+    print(f"evidently:      DataDriftPreset over {current_rows} rows in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reference-rows", type=int, default=100_000)
+    parser.add_argument("--current-rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.reference_rows, args.current_rows)
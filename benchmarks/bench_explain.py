@@ -0,0 +1,73 @@
+"""
+Benchmark: reason-code latency (online) and throughput (batch) of src/explain.py.
+
+  - online:  Explainer.explain_records for 1 and 64 applications (exact TreeSHAP,
+             cache hit, Saabas approximation) and POST /explain through the TestClient
+  - batch:   Explainer.explain_frame rows/s for growing frames, exact vs approximate
+
+    python benchmarks/bench_explain.py --rows 1000 100000
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+import numpy as np
+import xgboost as xgb
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.explain import Explainer
+from src.features import CreditRiskFeatures
+from src.synthetic import make_credit_frame
+
+
+def per_call_ms(fn, number=20):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e3
+
+
+def run(row_counts, depth):
+    engineer = CreditRiskFeatures()
+    df = engineer.fit_transform(make_credit_frame(50_000, seed=0), target_col='target')
+    booster = xgb.train({"max_depth": depth, "eta": 0.1, "objective": "binary:logistic"},
+                        xgb.DMatrix(df.drop(columns=['target']), label=df['target']), 100)
+    print(f"100 trees of depth {depth}, {os.cpu_count()} CPU(s)")
+
+    records = make_credit_frame(10_000, seed=1).drop(columns=['target']).to_dict('records')
+    exact = Explainer(booster, engineer, cache_size=0)
+    cached = Explainer(booster, engineer)
+    approx = Explainer(booster, engineer, approx=True, cache_size=0)
+    cached.explain_records(records[:64])
+    for n in (1, 64):
+        batch = records[:n]
+        print(f"online {n:>3} rows: exact {per_call_ms(lambda: exact.explain_records(batch)):7.2f} ms  "
+              f"cache hit {per_call_ms(lambda: cached.explain_records(batch)):7.2f} ms  "
+              f"approx {per_call_ms(lambda: approx.explain_records(batch)):7.2f} ms")
+
+    from fastapi.testclient import TestClient
+    import app.main as api
+    api.install_model(booster, engineer, version="bench")
+    client = TestClient(api.app)
+    latencies = []
+    for record in records[:300]:
+        start = time.perf_counter()
+        client.post("/explain", json=record)
+        latencies.append(time.perf_counter() - start)
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+    print(f"POST /explain:   p50 {p50:.2f} ms  p99 {p99:.2f} ms (TestClient, distinct applications)")
+
+    for n in row_counts:
+        frame = make_credit_frame(n, seed=2).drop(columns=['target'])
+        for label, explainer in (("exact", exact), ("approx", approx)):
+            start = time.perf_counter()
+            explainer.explain_frame(frame)
+            seconds = time.perf_counter() - start
+            print(f"batch {n:>9} rows {label:<6} {seconds:8.2f} s  {n / seconds:>12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--depth", type=int, default=4)
+    args = parser.parse_args()
+    run(args.rows, args.depth)
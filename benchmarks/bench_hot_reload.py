@@ -0,0 +1,110 @@
+"""
+Benchmark: request latency while models are hot-swapped under load.
+
+Runs a steady in-process /score load while a background thread repeatedly installs
+alternating models through app.main.install_model (build -> warm-up -> atomic swap).
+Requests that start inside a reload window (warm-up start .. swap + 100 ms) are
+reported separately from steady-state requests; any failed request is counted.
+
+    python benchmarks/bench_hot_reload.py --seconds 20 --concurrency 16 --reload-every 1.0
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import httpx
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def train_models():
+    import xgboost as xgb
+    from src.features import CreditRiskFeatures
+    from src.synthetic import make_credit_frame
+
+    models = []
+    for seed, rounds in ((1, 100), (2, 200)):
+        engineer = CreditRiskFeatures()
+        df = engineer.fit_transform(make_credit_frame(20_000, seed=seed), target_col='target')
+        dtrain = xgb.DMatrix(df.drop(columns=['target']), label=df['target'])
+        booster = xgb.train({"max_depth": 4, "objective": "binary:logistic"}, dtrain, rounds)
+        models.append((f"model-{seed}", booster, engineer))
+    return models
+
+
+async def load(api, seconds, concurrency):
+    """Returns a list of (start_time, latency, status, model_version)."""
+    samples = []
+    deadline = time.time() + seconds
+    transport = httpx.ASGITransport(app=api.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+        async def worker(i):
+            while time.time() < deadline:
+                start = time.time()
+                t0 = time.perf_counter()
+                response = await client.post("/score", json={"amount": 1000 + i})
+                latency = time.perf_counter() - t0
+                version = response.json().get("model_version") if response.status_code == 200 else None
+                samples.append((start, latency, response.status_code, version))
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return samples
+
+
+def summarize(label, latencies):
+    if len(latencies) == 0:
+        print(f"{label:<22} {'-':>8}")
+        return
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"{label:<22} {len(latencies):>8} {p50:>10.2f} {p99:>10.2f}")
+
+
+def run(seconds, concurrency, reload_every):
+    import app.main as api
+
+    models = train_models()
+    name, booster, engineer = models[0]
+    api.install_model(booster, engineer, version=name)
+    api.reload_history.clear()
+
+    stop = threading.Event()
+
+    def reloader():
+        i = 1
+        while not stop.wait(reload_every):
+            name, booster, engineer = models[i % len(models)]
+            api.install_model(booster, engineer, version=name)
+            i += 1
+
+    thread = threading.Thread(target=reloader, daemon=True)
+    thread.start()
+    samples = asyncio.run(load(api, seconds, concurrency))
+    stop.set()
+    thread.join()
+
+    windows = [(r["swapped_at"] - r["warmup_seconds"], r["swapped_at"] + 0.1) for r in api.reload_history]
+    in_window = np.array([any(a <= s[0] <= b for a, b in windows) for s in samples])
+    latencies = np.array([s[1] for s in samples])
+    errors = sum(1 for s in samples if s[2] != 200)
+    versions = sorted({s[3] for s in samples if s[3]})
+
+    print(f"{len(windows)} swaps, mean warm-up "
+          f"{np.mean([r['warmup_seconds'] for r in api.reload_history]) * 1000:.1f} ms, "
+          f"{errors} failed requests, versions served: {versions}")
+    print(f"{'':<22} {'requests':>8} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    summarize("steady state", latencies[~in_window])
+    summarize("during reload", latencies[in_window])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--reload-every", type=float, default=1.0)
+    args = parser.parse_args()
+    run(args.seconds, args.concurrency, args.reload_every)
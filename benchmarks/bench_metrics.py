@@ -0,0 +1,57 @@
+"""
+Benchmark: cost of the /metrics instrumentation (app/metrics.py) per scoring request.
+
+Times the recording primitives and the full set of calls one /score request makes
+(middleware timer, handler start/end marks, cache/features/woe_transform/predict/
+serialization stage observations, batch size, risk band counter, end-to-end latency), plus the
+cost of rendering /metrics.
+
+    python benchmarks/bench_metrics.py
+"""
+import os
+import sys
+import time
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app import metrics
+
+NUMBER = 200_000
+
+
+def per_call_us(fn, number=NUMBER):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def one_request():
+    """The metric calls of one coalesced /score request, in order."""
+    perf_counter = time.perf_counter
+    timer = metrics.RequestTimer(perf_counter())          # middleware
+    token = metrics._timer.set(timer)
+    metrics.handler_started()
+    metrics.STAGE_SECONDS.observe(perf_counter() - timer.start, "cache")
+    metrics.BATCH_SIZE.observe(1, "coalesced")
+    t0 = perf_counter()                                     # FastScorer
+    t1 = perf_counter()
+    t2 = perf_counter()
+    metrics.STAGE_SECONDS.observe(t1 - t0, "features")
+    metrics.STAGE_SECONDS.observe(t2 - t1, "woe_transform")
+    metrics.STAGE_SECONDS.observe(perf_counter() - t2, "predict")
+    metrics.PREDICTIONS.inc(label_value="Low Risk")       # build_response
+    metrics.handler_finished()
+    metrics._timer.reset(token)                             # middleware
+    end = perf_counter()
+    metrics.REQUEST_SECONDS.observe(end - timer.start, "/score")
+    metrics.STAGE_SECONDS.observe(end - timer.handler_end, "serialization")
+
+
+def run():
+    print(f"time.perf_counter():    {per_call_us(time.perf_counter):6.3f} µs")
+    print(f"Counter.inc:            {per_call_us(lambda: metrics.PREDICTIONS.inc(label_value='Low Risk')):6.3f} µs")
+    print(f"Histogram.observe:      {per_call_us(lambda: metrics.STAGE_SECONDS.observe(1e-4, 'predict')):6.3f} µs")
+    print(f"one /score request:     {per_call_us(one_request, NUMBER // 10):6.3f} µs (all metric calls)")
+    print(f"render /metrics:        {per_call_us(metrics.render, 1000):6.1f} µs")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,90 @@
+"""
+Benchmark: peak RSS of in-memory vs streaming training against dataset size.
+
+Writes synthetic CSVs of increasing size (generated chunk by chunk), then trains on each
+in a fresh interpreter and reports the child's peak RSS (VmHWM, Linux) and wall time:
+  - in-memory: pd.read_csv -> fit_transform -> train_test_split -> DMatrix (load_and_process_data)
+  - streaming: src.train.train_streaming (chunked WoE counts, encoded chunks, QuantileDMatrix)
+  - external:  the same with the external-memory DMatrix (--external)
+
+    python benchmarks/bench_out_of_core.py --rows 250000 1000000 2000000 --chunk-rows 100000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+IN_MEMORY_SNIPPET = """
+import sys, time; start = time.perf_counter()
+sys.path.insert(0, {root!r})
+import xgboost as xgb
+from src import train
+train.DATA_PATH = {path!r}
+X_train, X_test, y_train, y_test, engineer = train.load_and_process_data()
+model = xgb.train(train.MANUAL_PARAMS, xgb.DMatrix(X_train, label=y_train), {rounds})
+preds_prob = model.predict(xgb.DMatrix(X_test))
+auc, acc = train.eval_metrics(y_test, preds_prob, preds_prob > 0.5)
+hwm = next(l.split()[1] for l in open("/proc/self/status") if l.startswith("VmHWM"))
+print(hwm, time.perf_counter() - start, auc)
+"""
+
+STREAMING_SNIPPET = """
+import sys, tempfile, time; start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from src import train
+with tempfile.TemporaryDirectory() as cache_dir:
+    model, engineer, auc, acc = train.train_streaming(
+        {path!r}, cache_dir, num_boost_round={rounds}, external_memory={external}, chunksize={chunk_rows}
+    )
+hwm = next(l.split()[1] for l in open("/proc/self/status") if l.startswith("VmHWM"))
+print(hwm, time.perf_counter() - start, auc)
+"""
+
+
+def write_csv(path, n_rows, chunk_rows):
+    """Writes n_rows synthetic rows without ever holding more than chunk_rows in memory."""
+    from src.synthetic import make_credit_frame
+
+    for i, start in enumerate(range(0, n_rows, chunk_rows)):
+        chunk = make_credit_frame(min(chunk_rows, n_rows - start), seed=i)
+        chunk.to_csv(path, mode="a", header=(i == 0), index=False)
+    return os.path.getsize(path)
+
+
+def peak_rss(snippet):
+    """Returns (peak RSS in MB, seconds, AUC) of the snippet run in a fresh interpreter."""
+    out = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True, check=True)
+    rss_kb, seconds, auc = out.stdout.strip().splitlines()[-1].split()
+    return int(rss_kb) / 1024, float(seconds), float(auc)
+
+
+def run(row_counts, chunk_rows, rounds, external):
+    modes = [("in-memory", IN_MEMORY_SNIPPET, {}), ("streaming", STREAMING_SNIPPET, {"external": False})]
+    if external:
+        modes.append(("external", STREAMING_SNIPPET, {"external": True}))
+
+    print(f"chunk size {chunk_rows} rows, {rounds} boosting rounds")
+    print(f"{'rows':>10} {'CSV (MB)':>9} {'mode':>10} {'peak RSS (MB)':>14} {'wall (s)':>9} {'AUC':>7}")
+    for n_rows in row_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "credit.csv")
+            size_mb = write_csv(path, n_rows, chunk_rows) / 1e6
+            for label, snippet, extra in modes:
+                rss, seconds, auc = peak_rss(snippet.format(
+                    root=ROOT, path=path, rounds=rounds, chunk_rows=chunk_rows, **extra
+                ))
+                print(f"{n_rows:>10} {size_mb:>9.0f} {label:>10} {rss:>14.0f} {seconds:>9.1f} {auc:>7.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[250_000, 1_000_000, 2_000_000])
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--external", action="store_true", help="Also run the external-memory DMatrix")
+    args = parser.parse_args()
+    run(args.rows, args.chunk_rows, args.rounds, args.external)
@@ -0,0 +1,73 @@
+"""
+Benchmark: /score latency for resent applications with and without the score cache.
+
+Installs a booster in app.main, then sends a stream of applications through the
+ASGI app in-process (no network), with a share of them resent, and reports first
+sends and resends separately:
+  - cache off          (every request is WoE-encoded and scored)
+  - cache on, local     (in-process LRU)
+  - cache on, shared    (LRU in front of the SQLite file the workers of a host share)
+
+    python benchmarks/bench_score_cache.py --requests 5000 --repeat-share 0.5
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+import xgboost as xgb
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import app.main as api
+from app.cache import ScoreCache, SQLiteCacheBackend
+from src.features import CreditRiskFeatures
+from src.synthetic import make_credit_frame
+
+
+def run(n_requests, repeat_share):
+    engineer = CreditRiskFeatures()
+    df = engineer.fit_transform(make_credit_frame(50_000, seed=0), target_col='target')
+    booster = xgb.train({"max_depth": 4, "objective": "binary:logistic"},
+                        xgb.DMatrix(df.drop(columns=['target']), label=df['target']), 100)
+    api.install_model(booster, engineer, version="bench")
+    api.drift_monitor = None
+
+    fresh = make_credit_frame(n_requests, seed=1).drop(columns=['target']).to_dict('records')
+    rng = random.Random(0)
+    payloads = []
+    for record in fresh:
+        resend = payloads and rng.random() < repeat_share
+        payloads.append(rng.choice(payloads) if resend else record)
+
+    with tempfile.TemporaryDirectory() as root:
+        caches = {
+            "cache off": None,
+            "cache on, local": ScoreCache(),
+            "cache on, shared": ScoreCache(shared=SQLiteCacheBackend(os.path.join(root, "cache.sqlite"))),
+        }
+        client = TestClient(api.app)
+        for label, cache in caches.items():
+            api.score_cache = cache
+            latencies, seen = {"first": [], "resent": []}, set()
+            for payload in payloads:
+                start = time.perf_counter()
+                client.post("/score", json=payload)
+                latencies["resent" if id(payload) in seen else "first"].append(time.perf_counter() - start)
+                seen.add(id(payload))
+            hit_rate = cache.stats()["hit_rate"] if cache else 0.0
+            summary = "  ".join(f"{kind} p50 {np.percentile(times, 50) * 1e3:.3f} ms"
+                                for kind, times in latencies.items())
+            every = sum(latencies.values(), [])
+            print(f"{label:<17} all mean {np.mean(every) * 1e3:.3f} ms  {summary}  hit rate {hit_rate:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--repeat-share", type=float, default=0.5)
+    args = parser.parse_args()
+    run(args.requests, args.repeat_share)
@@ -0,0 +1,90 @@
+"""
+Benchmark: /score latency with challengers next to the champion.
+
+Installs a 100-tree champion and a 300-tree challenger in app.main, then sends
+applications one by one through the ASGI app in-process (no network):
+  - champion only
+  - 10% A/B split       (the challenger serves a tenth of the applications)
+  - shadow, background  (app/registry.py: queued, scored in batches by a thread)
+  - shadow, inline      (the naive way: the challenger scores inside the request)
+and reports p50 / p99 latency. The shadow throughput line is how fast the
+background thread drains a full queue, i.e. the traffic one shadow model keeps up with.
+
+    python benchmarks/bench_shadow.py --requests 3000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import xgboost as xgb
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import app.main as api
+from app.registry import ModelRegistry
+from src.features import CreditRiskFeatures
+from src.serving import ModelBundle
+from src.synthetic import make_credit_frame
+
+
+def train(df, rounds, depth):
+    return xgb.train({"max_depth": depth, "eta": 0.1, "objective": "binary:logistic"},
+                     xgb.DMatrix(df.drop(columns=['target']), label=df['target']), rounds)
+
+
+def run(n_requests, batch_size):
+    engineer = CreditRiskFeatures()
+    df = engineer.fit_transform(make_credit_frame(50_000, seed=0), target_col='target')
+    api.install_model(train(df, 100, 4), engineer, version="champion")
+    challenger = ModelBundle(train(df, 300, 6), engineer, version="challenger")
+    challenger.warm_up()
+    api.drift_monitor = None
+    api.score_cache = None
+
+    payloads = make_credit_frame(n_requests, seed=1).drop(columns=['target']).to_dict('records')
+    client = TestClient(api.app)
+    models = {"challenger": challenger}
+    setups = {
+        "champion only": {},
+        "10% A/B split": {"split": {"challenger": 0.1}},
+        "shadow, background": {"shadow": ["challenger"]},
+        "shadow, inline": {"shadow": ["challenger"], "inline": True},
+    }
+    for label, routing in setups.items():
+        api.registry = ModelRegistry(batch_size=batch_size)
+        api.registry.configure(models, routing.get("split"), routing.get("shadow", ()))
+        if routing.get("inline"):
+            enqueue = api.registry.enqueue
+            api.registry.enqueue = lambda records, probs: (enqueue(records, probs), api.registry.flush())
+        elif routing.get("shadow"):
+            api.registry.start()
+
+        latencies = []
+        for payload in payloads:
+            start = time.perf_counter()
+            client.post("/score", json=payload)
+            latencies.append(time.perf_counter() - start)
+        api.registry.stop()
+        api.registry.flush()
+        print(f"{label:<20} p50 {np.percentile(latencies, 50) * 1e3:.3f} ms  "
+              f"p99 {np.percentile(latencies, 99) * 1e3:.3f} ms")
+
+    # Shadow throughput: drain a full queue
+    registry = ModelRegistry(batch_size=batch_size)
+    registry.configure(models, shadow=["challenger"])
+    registry.enqueue(payloads, np.zeros(len(payloads)))
+    start = time.perf_counter()
+    registry.flush()
+    seconds = time.perf_counter() - start
+    print(f"shadow throughput    {len(payloads) / seconds:,.0f} applications/s "
+          f"(batches of {batch_size})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--batch-size", type=int, default=256, help="Shadow scoring batch size")
+    args = parser.parse_args()
+    run(args.requests, args.batch_size)
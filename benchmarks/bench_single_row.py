@@ -0,0 +1,83 @@
+"""
+Benchmark: per-request latency and allocations of single-application scoring.
+
+Compares the pandas path (dict -> DataFrame -> WoE transform -> DMatrix -> predict)
+with FastScorer (fields written into a preallocated float32 buffer -> inplace_predict).
+Allocation is measured with tracemalloc as the bytes allocated at peak during one
+request (Python objects and NumPy buffers; XGBoost's native heap is not traced).
+
+    python benchmarks/bench_single_row.py --iterations 5000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.features import CreditRiskFeatures
+from src.serving import FastScorer, prepare_features
+from src.synthetic import make_credit_frame
+
+
+def pandas_path(booster, engineer, record):
+    X = prepare_features(pd.DataFrame([record]), engineer, booster.feature_names)
+    return float(booster.predict(xgb.DMatrix(X))[0])
+
+
+def latency_us(fn, iterations):
+    timings = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - start
+    return np.percentile(timings, [50, 99]) * 1e6
+
+
+def peak_allocation(fn, iterations=200):
+    """Median high-water mark of memory allocated during one call (bytes), via tracemalloc."""
+    fn()
+    tracemalloc.start()
+    peaks = np.empty(iterations)
+    for i in range(iterations):
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn()
+        peaks[i] = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return np.median(peaks)
+
+
+def run(iterations, rounds):
+    engineer = CreditRiskFeatures()
+    df = engineer.fit_transform(make_credit_frame(20_000), target_col='target')
+    dtrain = xgb.DMatrix(df.drop(columns=['target']), label=df['target'])
+    booster = xgb.train({"max_depth": 4, "eta": 0.1, "objective": "binary:logistic"},
+                        dtrain, num_boost_round=rounds)
+    booster.set_param({"nthread": 1})
+
+    record = make_credit_frame(1, seed=1).drop(columns=['target']).iloc[0].to_dict()
+    scorer = FastScorer(booster, engineer)
+    assert abs(scorer.score_one(record) - pandas_path(booster, engineer, record)) < 1e-6
+
+    paths = {
+        "pandas -> DMatrix": lambda: pandas_path(booster, engineer, record),
+        "FastScorer (buffer + inplace_predict)": lambda: scorer.score_one(record),
+    }
+    print(f"{'path':<40} {'p50 (us)':>10} {'p99 (us)':>10} {'peak KiB/req':>13}")
+    for name, fn in paths.items():
+        p50, p99 = latency_us(fn, iterations)
+        peak = peak_allocation(fn)
+        print(f"{name:<40} {p50:>10.1f} {p99:>10.1f} {peak / 1024:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=100, help="Boosting rounds of the test model")
+    args = parser.parse_args()
+    run(args.iterations, args.rounds)
@@ -0,0 +1,141 @@
+"""
+Benchmark: API cold start, from interpreter launch to the first successful /score.
+
+Every measurement runs in a fresh interpreter against a throwaway promoted-model store:
+  - imports:     `python -X importtime -c "import app.main"`, cumulative time of app.main
+                 and self time grouped by top-level package (who the import time goes to)
+  - first score: wall time from process spawn to the first 200 from /score, split into
+                 interpreter + imports, startup (manifest read, model load, warm-up) and
+                 the request itself. The app runs under fastapi's TestClient (the ASGI
+                 app and startup hook uvicorn would run, without a socket).
+
+--preload imports modules before app.main (e.g. `mlflow.xgboost optuna` to see what the
+eager imports used to cost); --block hides installed packages (e.g. `sklearn`, which
+xgboost imports whenever it is installed) to emulate a serving-only image.
+
+    python benchmarks/bench_startup.py --repeats 5
+    python benchmarks/bench_startup.py --preload mlflow.xgboost optuna
+    python benchmarks/bench_startup.py --block sklearn
+"""
+import argparse
+import collections
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+PRELUDE = """
+import sys; sys.path.insert(0, {root!r})
+for name in {block!r}:
+    sys.modules[name] = None  # import raises ImportError, as if not installed
+for name in {preload!r}:
+    __import__(name)
+"""
+
+FIRST_SCORE_SNIPPET = """
+import json, time
+start = time.perf_counter()
+""" + PRELUDE + """
+import app.main as api
+from fastapi.testclient import TestClient
+imported = time.perf_counter()
+with TestClient(api.app) as client:  # runs the startup event
+    started = time.perf_counter()
+    response = client.post("/score", json={{}})
+    assert response.status_code == 200, response.text
+    scored = time.perf_counter()
+print(json.dumps({{"launched": {launched!r}, "now": time.time(), "imports": imported - start,
+                  "startup": started - imported, "request": scored - started}}))
+"""
+
+
+def build_store(root):
+    """Trains a small booster and promotes it into root/models."""
+    import xgboost as xgb
+    from src.features import CreditRiskFeatures
+    from src.model_store import promote_model
+    from src.synthetic import make_credit_frame
+
+    engineer = CreditRiskFeatures()
+    df = engineer.fit_transform(make_credit_frame(5_000), target_col='target')
+    booster = xgb.train({"objective": "binary:logistic", "max_depth": 4},
+                        xgb.DMatrix(df.drop(columns=['target']), label=df['target']), 100)
+    store_dir = os.path.join(root, "models")
+    promote_model(booster, engineer, "bench", store_dir=store_dir)
+    return store_dir
+
+
+def serving_env(store_dir):
+    # No manifest polling thread, no drift reference; the cache does not matter for one request
+    return {**os.environ, "SENTINEL_MODEL_STORE": store_dir, "MODEL_REFRESH_SECONDS": "0",
+            "SENTINEL_DRIFT_REFERENCE": os.path.join(store_dir, "none.npz")}
+
+
+def parse_importtime(stderr):
+    """(cumulative seconds of app.main, {top-level package: self seconds})."""
+    total, by_package = None, collections.Counter()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        by_package[name.split(".")[0]] += int(self_us) / 1e6
+        if name == "app.main":
+            total = int(cumulative_us) / 1e6
+    return total, by_package
+
+
+def time_imports(env, preload, block):
+    snippet = PRELUDE.format(root=ROOT, preload=preload, block=block) + "import app.main\n"
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", snippet], env=env,
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    return parse_importtime(out.stderr)
+
+
+def time_first_score(env, preload, block):
+    launched = time.time()
+    snippet = FIRST_SCORE_SNIPPET.format(root=ROOT, preload=preload, block=block, launched=launched)
+    out = subprocess.run([sys.executable, "-c", snippet], env=env, cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["total"] = result["now"] - launched
+    result["interpreter"] = result["total"] - result["imports"] - result["startup"] - result["request"]
+    return result
+
+
+def run(repeats=3, preload=(), block=(), top=8):
+    with tempfile.TemporaryDirectory() as root:
+        with contextlib.redirect_stdout(io.StringIO()):  # WoE fitting progress
+            env = serving_env(build_store(root))
+        imports = [time_imports(env, list(preload), list(block)) for _ in range(repeats)]
+        scores = [time_first_score(env, list(preload), list(block)) for _ in range(repeats)]
+
+    print(f"🚀 Cold start (median of {repeats} fresh interpreters, preload={list(preload)}, block={list(block)})")
+    print(f"   import app.main (-X importtime): {statistics.median(t for t, _ in imports):.3f} s")
+    packages = collections.Counter()
+    for _, by_package in imports:
+        packages.update({k: v / repeats for k, v in by_package.items()})
+    for name, seconds in packages.most_common(top):
+        print(f"      {name:<20} {seconds:7.3f} s")
+
+    print("   first successful /score:")
+    for stage in ("interpreter", "imports", "startup", "request", "total"):
+        print(f"      {stage:<20} {statistics.median(s[stage] for s in scores):7.3f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh interpreters per measurement")
+    parser.add_argument("--preload", nargs="*", default=[], help="Modules imported before app.main")
+    parser.add_argument("--block", nargs="*", default=[], help="Packages hidden from the interpreter")
+    parser.add_argument("--top", type=int, default=8, help="Packages listed in the import breakdown")
+    args = parser.parse_args()
+    run(args.repeats, args.preload, args.block, args.top)
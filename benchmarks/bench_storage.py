@@ -0,0 +1,114 @@
+"""
+Benchmark: load time and peak RSS (Linux) of CSV vs Parquet vs memory-mapped Arrow.
+
+Writes the same synthetic dataset (chunk by chunk) as CSV, as a partitioned Parquet
+dataset and as an Arrow IPC file, then loads each in a fresh interpreter:
+  - all columns into pandas (pd.read_csv / src.datastore.load_dataset)
+  - three columns only (usecols / column projection)
+  - the Arrow file as a memory-mapped table, without converting to pandas
+Every load finishes by computing the default rate, so the target column is touched.
+Above --csv-max-rows the CSV is neither written nor loaded (object-dtype strings need
+several times the file size in RAM).
+
+    python benchmarks/bench_storage.py --rows 1000000 50000000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+COLUMNS = ["purpose", "amount", "target"]
+
+# VmHWM rather than ru_maxrss: the latter survives exec and would report the parent's peak
+LOAD_SNIPPET = """
+import sys, time; start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from src import datastore
+{load}
+hwm = next(l.split()[1] for l in open("/proc/self/status") if l.startswith("VmHWM"))
+print(hwm, time.perf_counter() - start, rate)
+"""
+
+LOADS = [
+    ("csv", "all", "df = datastore.load_dataset({csv!r}); rate = df['target'].mean()"),
+    ("csv", "3 cols", "df = datastore.load_dataset({csv!r}, columns={cols!r}); rate = df['target'].mean()"),
+    ("parquet", "all", "df = datastore.load_dataset({parquet!r}); rate = df['target'].mean()"),
+    ("parquet", "3 cols", "df = datastore.load_dataset({parquet!r}, columns={cols!r}); rate = df['target'].mean()"),
+    ("arrow", "all", "df = datastore.load_dataset({arrow!r}); rate = df['target'].mean()"),
+    ("arrow mmap", "all", "import pyarrow.compute as pc\n"
+                          "table = datastore.read_table({arrow!r}); rate = pc.mean(table['target']).as_py()"),
+]
+
+
+def write_files(root, n_rows, chunk_rows, write_csv=True):
+    """Writes CSV, Parquet and Arrow copies of n_rows synthetic rows; returns their paths."""
+    from src import datastore
+    from src.synthetic import make_credit_frame
+
+    paths = {"csv": os.path.join(root, "credit.csv"), "parquet": os.path.join(root, "credit"),
+             "arrow": os.path.join(root, "credit.arrow")}
+
+    def chunks():
+        for i, start in enumerate(range(0, n_rows, chunk_rows)):
+            chunk = make_credit_frame(min(chunk_rows, n_rows - start), seed=i)
+            if write_csv:
+                chunk.to_csv(paths["csv"], mode="a", header=(i == 0), index=False)
+            yield chunk
+
+    datastore.write_parquet(chunks(), paths["parquet"])
+    datastore.parquet_to_arrow(paths["parquet"], paths["arrow"])
+    return paths
+
+
+def disk_mb(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) / 1e6
+    return os.path.getsize(path) / 1e6
+
+
+def measure(snippet):
+    """Returns (peak RSS in MB, seconds) of the snippet run in a fresh interpreter, or None."""
+    out = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True)
+    if out.returncode != 0:
+        return None
+    rss_kb, seconds, _ = out.stdout.strip().splitlines()[-1].split()
+    return int(rss_kb) / 1024, float(seconds)
+
+
+def run(row_counts, chunk_rows, csv_max_rows):
+    # Interpreter + pandas/pyarrow imports, to subtract from the RSS figures
+    baseline = measure(LOAD_SNIPPET.format(root=ROOT, load="rate = 0"))
+    print(f"import baseline: {baseline[0]:.0f} MB peak RSS, {baseline[1]:.2f} s")
+    print(f"{'rows':>11} {'format':>11} {'columns':>7} {'on disk (MB)':>13} {'load (s)':>9} {'peak RSS (MB)':>14}")
+
+    for n_rows in row_counts:
+        with tempfile.TemporaryDirectory() as root:
+            start = time.perf_counter()
+            paths = write_files(root, n_rows, chunk_rows, write_csv=n_rows <= csv_max_rows)
+            print(f"{n_rows:>11} (files written in {time.perf_counter() - start:.0f} s)")
+
+            for fmt, cols, load in LOADS:
+                if fmt == "csv" and n_rows > csv_max_rows:
+                    print(f"{n_rows:>11} {fmt:>11} {cols:>7} {'-':>13} {'skipped':>9}")
+                    continue
+                size = f"{disk_mb(paths[fmt.split()[0]]):>13.0f}"
+                result = measure(LOAD_SNIPPET.format(root=ROOT, load=load.format(cols=COLUMNS, **paths)))
+                if result is None:
+                    print(f"{n_rows:>11} {fmt:>11} {cols:>7} {size} {'failed (out of memory?)':>24}")
+                    continue
+                rss, seconds = result
+                print(f"{n_rows:>11} {fmt:>11} {cols:>7} {size} {seconds:>9.2f} {rss:>14.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 50_000_000])
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    parser.add_argument("--csv-max-rows", type=int, default=10_000_000)
+    args = parser.parse_args()
+    run(args.rows, args.chunk_rows, args.csv_max_rows)
@@ -0,0 +1,123 @@
+"""
+Benchmark: Optuna trial throughput with per-call vs batched MLflow logging.
+
+Runs the same study (src/train.run_study, fixed sampler seed) against a fresh
+file-based MLflow store three ways:
+  - per call:      the previous objective, mlflow.start_run(nested=True) and one
+                   log_params / log_metric / set_tag call per value
+  - batched, sync: src/tracking.BatchLogger writing each run when its trial ends
+  - batched, async: the same, written by the background thread (the default)
+  - no logging:     runs are buffered and discarded, the floor for the others
+Short trials (few rounds on a small frame) are where the logging cost shows; the
+study wall time includes the final flush, so nothing is left unwritten. Each case
+is repeated and the fastest repeat is reported (the store is recreated each time).
+
+    python benchmarks/bench_tracking.py --trials 200 --rounds 20 --repeats 3
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import mlflow
+import optuna
+import xgboost as xgb
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src import tracking, train
+from src.features import CreditRiskFeatures
+from src.synthetic import make_credit_frame
+
+
+def per_call_objective(trial, dtrain, dtest, parent_run_id=None, nthread=None, tracker=None):
+    """The previous objective: a fluent nested run and one MLflow call per value."""
+    param = train.suggest_params(trial)
+    if nthread:
+        param['nthread'] = nthread
+    with mlflow.start_run(nested=True, tags={"mlflow.parentRunId": parent_run_id}):
+        pruning = train.OptunaPruningCallback(trial)
+        model = xgb.train(param, dtrain, num_boost_round=train.TUNING_BOOST_ROUNDS,
+                          evals=[(dtest, "test")], callbacks=[pruning], verbose_eval=False)
+        mlflow.log_params(param)
+        if pruning.pruned_at is not None:
+            mlflow.set_tag("optuna.pruned_at", pruning.pruned_at)
+        else:
+            preds_prob = model.predict(dtest)
+            auc, acc = train.eval_metrics(dtest.get_label(), preds_prob, (preds_prob > 0.5).astype(int))
+            mlflow.log_metric("auc", auc)
+            mlflow.log_metric("accuracy", acc)
+    if pruning.pruned_at is not None:
+        raise optuna.TrialPruned()
+    return auc
+
+
+class DiscardLogger(tracking.BatchLogger):
+    def _write(self, run):
+        pass
+
+
+def study_seconds(dtrain, dtest, n_trials, n_jobs, per_call, tracker_cls, background):
+    with tempfile.TemporaryDirectory() as tmp:
+        mlflow.set_tracking_uri(f"file://{tmp}")
+        mlflow.set_experiment("bench_tracking")
+        objective = train.objective
+        if per_call:
+            train.objective = per_call_objective
+        try:
+            with mlflow.start_run() as parent:
+                start = time.perf_counter()
+                train.run_study(dtrain, dtest, n_trials=n_trials, n_jobs=n_jobs, storage=None,
+                                parent_run_id=parent.info.run_id,
+                                sampler=optuna.samplers.RandomSampler(seed=0),
+                                tracker=tracker_cls(background=background))
+                seconds = time.perf_counter() - start
+            children = mlflow.search_runs(filter_string=f"tags.mlflow.parentRunId = '{parent.info.run_id}'")
+            files = sum(len(names) for _, _, names in os.walk(tmp))
+        finally:
+            train.objective = objective
+            mlflow.set_tracking_uri(None)
+    assert len(children) == (0 if tracker_cls is DiscardLogger else n_trials)
+    return seconds, files
+
+
+def run_case(label, dtrain, dtest, n_trials, n_jobs, repeats, per_call=False,
+             tracker_cls=tracking.BatchLogger, background=True):
+    results = [study_seconds(dtrain, dtest, n_trials, n_jobs, per_call, tracker_cls, background)
+               for _ in range(repeats)]
+    seconds, files = min(results)
+    print(f"{label:<16} {seconds:9.2f} {n_trials / seconds:9.1f} {files:>8}")
+    return seconds
+
+
+def run(n_trials, n_jobs, rounds, n_rows, repeats):
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    train.TUNING_BOOST_ROUNDS = rounds
+    engineer = CreditRiskFeatures()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = engineer.fit_transform(make_credit_frame(n_rows, seed=0), target_col='target')
+    split = int(n_rows * 0.8)
+    X, y = df.drop(columns=['target']), df['target']
+    dtrain, dtest = train.build_tuning_matrices(X[:split], y[:split], X[split:], y[split:])
+
+    print(f"{n_trials} trials, {n_jobs} job(s), {rounds} rounds, {n_rows} rows\n")
+    print(f"{'logging':<16} {'wall (s)':>9} {'trials/s':>9} {'files':>8}")
+    base = run_case("per call", dtrain, dtest, n_trials, n_jobs, repeats, per_call=True)
+    sync = run_case("batched, sync", dtrain, dtest, n_trials, n_jobs, repeats, background=False)
+    asyn = run_case("batched, async", dtrain, dtest, n_trials, n_jobs, repeats, background=True)
+    floor = run_case("no logging", dtrain, dtest, n_trials, n_jobs, repeats, tracker_cls=DiscardLogger)
+    print(f"\nSpeedup vs per call: sync {base / sync:.2f}x, async {base / asyn:.2f}x "
+          f"(logging share of per call: {1 - floor / base:.0%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=train.OPTUNA_N_JOBS)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run(args.trials, args.jobs, args.rounds, args.rows, args.repeats)
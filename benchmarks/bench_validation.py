@@ -0,0 +1,90 @@
+"""
+Benchmark: cost of the schema gate (src/validation.py) at ingestion and on the API path.
+
+Ingestion: the compiled check of a whole DataFrame against a row-by-row check that
+applies the same rules to each row in Python (the shape of a per-record validator).
+Serving: microseconds per application for one request dict (check_record) and for
+/score/batch-sized lists (check_records, one vectorized pass).
+
+    python benchmarks/bench_validation.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.synthetic import make_credit_frame
+from src.validation import Schema
+
+# The row-by-row baseline is timed on at most this many rows and extrapolated
+NAIVE_ROWS = 100_000
+
+
+def naive_check(schema, df):
+    """Same rules, one Python pass per row over a dict of its values."""
+    ranges = dict(zip(schema.numeric, zip(schema.lows, schema.highs)))
+    allowed = {col: set(levels.tolist()) for col, levels in schema.categories.items()}
+    failed = []
+    for row in df.to_dict("records"):
+        rules = []
+        for col, (low, high) in ranges.items():
+            value = row.get(col)
+            if pd.isna(value):
+                rules.append(f"{col}:missing")
+            elif not low <= float(value) <= high:
+                rules.append(f"{col}:range")
+        for col, levels in allowed.items():
+            if row.get(col) not in levels:
+                rules.append(f"{col}:category")
+        failed.append(rules)
+    return failed
+
+
+def run(n_rows, batch_sizes):
+    schema = Schema.from_reference(make_credit_frame(50_000, seed=0))
+    df = make_credit_frame(n_rows, seed=1)
+    # 1% of the rows carry an unknown code or an out-of-range amount
+    rng = np.random.default_rng(0)
+    dirty = rng.choice(n_rows, n_rows // 100, replace=False)
+    df.loc[dirty[::2], "purpose"] = "A99"
+    df.loc[dirty[1::2], "amount"] = -1
+
+    start = time.perf_counter()
+    violations = schema.check_frame(df)
+    t_frame = time.perf_counter() - start
+    sample = df.iloc[:min(n_rows, NAIVE_ROWS)]
+    start = time.perf_counter()
+    naive = naive_check(schema, sample)
+    t_naive = (time.perf_counter() - start) * n_rows / len(sample)
+    assert [bool(r) for r in naive] == violations[:len(sample)].any(axis=1).tolist()
+    print(f"Ingestion, {n_rows} rows ({violations.any(axis=1).sum()} failing):")
+    print(f"   row by row {t_naive:8.3f} s   compiled {t_frame:8.3f} s   ({t_naive / t_frame:.0f}x)")
+    # Dictionary-encoded input (category dtype, as read from Parquet) hashes each code once
+    df_cat = df.astype({col: "category" for col in schema.categorical})
+    start = time.perf_counter()
+    np.testing.assert_array_equal(schema.check_frame(df_cat), violations)
+    print(f"   compiled, category dtype {time.perf_counter() - start:8.3f} s")
+
+    records = df.drop(columns=["target"]).to_dict("records")
+    print(f"\n{'batch':>6} {'us / application':>17}")
+    for n in batch_sizes:
+        if n == 1:
+            number = 20_000
+            seconds = timeit.timeit(lambda: schema.check_record(records[0]), number=number)
+        else:
+            number = max(1, 20_000 // n)
+            seconds = timeit.timeit(lambda: schema.check_records(records[:n]), number=number)
+        print(f"{n:>6} {seconds / number / n * 1e6:17.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 64, 1024])
+    args = parser.parse_args()
+    run(args.rows, args.batch_sizes)
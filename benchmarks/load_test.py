@@ -0,0 +1,89 @@
+"""
+Load test: p50/p99 latency and requests/second of POST /score at several concurrency levels.
+
+By default the API runs in-process (httpx ASGI transport) with a small booster trained on
+synthetic data, once with request coalescing and once without. Point --url at a running
+server (uvicorn app.main:app) to measure the real deployment instead.
+
+    python benchmarks/load_test.py --concurrency 1 8 32 64 --requests 2000
+    python benchmarks/load_test.py --url http://127.0.0.1:8000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def load_synthetic_model(api):
+    """Trains a small booster on synthetic data and installs it in the API module."""
+    import xgboost as xgb
+    from src.features import CreditRiskFeatures
+    from src.synthetic import make_credit_frame
+
+    engineer = CreditRiskFeatures()
+    df = engineer.fit_transform(make_credit_frame(20_000), target_col='target')
+    dtrain = xgb.DMatrix(df.drop(columns=['target']), label=df['target'])
+    booster = xgb.train({"max_depth": 4, "eta": 0.1, "objective": "binary:logistic"},
+                        dtrain, num_boost_round=100)
+    api.install_model(booster, engineer, version="synthetic")
+
+
+async def run_level(client, concurrency, n_requests):
+    """Fires n_requests with `concurrency` workers and returns (latencies, wall time)."""
+    latencies = []
+    counter = iter(range(n_requests))
+
+    async def worker():
+        for i in counter:
+            payload = {"amount": 500 + i % 10_000, "duration": 6 + i % 60}
+            start = time.perf_counter()
+            response = await client.post("/score", json=payload)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return np.array(latencies), time.perf_counter() - start
+
+
+async def run(client, label, levels, n_requests):
+    print(f"\n{label}")
+    print(f"{'concurrency':>12} {'p50 (ms)':>10} {'p99 (ms)':>10} {'req/s':>10}")
+    await client.post("/score", json={})  # warm-up
+    for concurrency in levels:
+        latencies, wall = await run_level(client, concurrency, n_requests)
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        print(f"{concurrency:>12} {p50:>10.2f} {p99:>10.2f} {n_requests / wall:>10.0f}")
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30) as client:
+            await run(client, f"Server at {args.url}", args.concurrency, args.requests)
+        return
+
+    import app.main as api
+    load_synthetic_model(api)
+    transport = httpx.ASGITransport(app=api.app)
+    for coalesce in (False, True):
+        api.SCORE_COALESCE = coalesce
+        label = (f"In-process, coalescing ON (window {api.SCORE_BATCH_WINDOW_MS} ms, "
+                 f"max batch {api.SCORE_BATCH_MAX_SIZE})" if coalesce
+                 else "In-process, coalescing OFF")
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+            await run(client, label, args.concurrency, args.requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Base URL of a running API (default: in-process)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per level")
+    asyncio.run(main(parser.parse_args()))
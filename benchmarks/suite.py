@@ -0,0 +1,259 @@
+"""
+Reproducible benchmark suite: features, training, serving and drift monitoring.
+
+Every case builds its inputs from src/synthetic.py (fixed seeds) in an untimed setup
+and returns the operation to time; the runner repeats it and keeps min / median / max.
+Results are written to benchmarks/results/<commit>.json with the environment they
+were measured in, so two commits can be compared:
+
+    python benchmarks/suite.py run                                   # 1k .. 1M rows
+    python benchmarks/suite.py run --rows 10000000 --cases fit_transform woe_transform monitor
+    python benchmarks/suite.py compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+
+Cases above their `max_rows` are recorded as skipped (e.g. in-memory training at 10M
+rows needs more RAM than the benchmark box has; see bench_out_of_core.py instead).
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+from src.synthetic import make_credit_frame
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_ROWS = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_REPEAT = 3
+# Median slowdown above which compare() reports a regression
+REGRESSION_THRESHOLD = 1.10
+
+CASES = {}
+
+def case(max_rows=None, scaled=True, repeat=None):
+    """
+    Registers a benchmark. The function gets (n_rows, workdir), does its setup and
+    returns (operation, operations per call). Unscaled cases run once per suite run.
+    """
+    def register(fn):
+        CASES[fn.__name__] = {"fn": fn, "max_rows": max_rows, "scaled": scaled, "repeat": repeat}
+        return fn
+    return register
+
+def _load(n_rows, workdir):
+    """The dataset as training loads it (Parquet -> dictionary-encoded categoricals)."""
+    from src.datastore import load_dataset
+
+    return load_dataset(_write_dataset(n_rows, workdir))
+
+def _fitted(df):
+    from src.features import CreditRiskFeatures
+
+    engineer = CreditRiskFeatures()
+    processed = engineer.fit_transform(df, target_col='target')
+    return df, engineer, processed
+
+def _write_dataset(n_rows, workdir):
+    from src import datastore
+
+    path = os.path.join(workdir, f"credit_{n_rows}")
+    if not os.path.exists(path):
+        chunk_rows = 1_000_000
+        datastore.write_parquet(
+            (make_credit_frame(min(chunk_rows, n_rows - start), seed=i)
+             for i, start in enumerate(range(0, n_rows, chunk_rows))),
+            path,
+        )
+    return path
+
+def _api_client(n_rows=50_000):
+    """app.main with a freshly trained booster installed (cache and drift monitor off)."""
+    import xgboost as xgb
+    from fastapi.testclient import TestClient
+    import app.main as api
+
+    _, engineer, processed = _fitted(make_credit_frame(n_rows, seed=0))
+    booster = xgb.train({"max_depth": 4, "eta": 0.1, "objective": "binary:logistic"},
+                        xgb.DMatrix(processed.drop(columns=['target']), label=processed['target']), 100)
+    api.install_model(booster, engineer, version="bench", warm_up=True)
+    api.score_cache = None
+    api.drift_monitor = None
+    return TestClient(api.app)
+
+@case()
+def fit_transform(n_rows, workdir):
+    from src.features import CreditRiskFeatures
+
+    df = _load(n_rows, workdir)
+    return (lambda: CreditRiskFeatures().fit_transform(df, target_col='target')), n_rows
+
+@case()
+def woe_transform(n_rows, workdir):
+    df, engineer, _ = _fitted(_load(n_rows, workdir))
+    df = df.drop(columns=['target'])
+    return (lambda: engineer.transform(df)), n_rows
+
+@case(max_rows=2_000_000, repeat=1)
+def train_manual(n_rows, workdir):
+    import mlflow
+    from src import train
+
+    train.DATA_PATH = _write_dataset(n_rows, workdir)
+    mlflow.set_tracking_uri("file:" + os.path.join(workdir, "mlruns"))
+    return (lambda: train.main("manual")), n_rows
+
+@case(max_rows=1_000_000, repeat=1)
+def train_auto(n_rows, workdir):
+    import mlflow
+    import optuna
+    from src import train
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+    train.DATA_PATH = _write_dataset(n_rows, workdir)
+    mlflow.set_tracking_uri("file:" + os.path.join(workdir, "mlruns"))
+    return (lambda: train.main("auto")), n_rows
+
+@case(scaled=False)
+def score_single(n_rows, workdir):
+    client = _api_client()
+    records = make_credit_frame(200, seed=1).drop(columns=['target']).to_dict('records')
+
+    def run():
+        for record in records:
+            client.post("/score", json=record)
+    return run, len(records)
+
+@case(max_rows=10_000)
+def score_batch(n_rows, workdir):
+    client = _api_client()
+    payload = {"applications": make_credit_frame(n_rows, seed=1).drop(columns=['target']).to_dict('records')}
+    return (lambda: client.post("/score/batch", json=payload)), n_rows
+
+@case(max_rows=10_000_000)
+def monitor(n_rows, workdir):
+    from src import monitor as drift_report
+
+    drift_report.DATA_PATH = _write_dataset(n_rows, workdir)
+    return drift_report.generate_drift_report, n_rows
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment():
+    """Where the numbers were measured: commit, machine, library versions, relevant config."""
+    import numpy, pandas, sklearn, xgboost
+
+    return {
+        "commit": _git("rev-parse", "HEAD") or "unknown",
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "packages": {m.__name__: m.__version__ for m in (numpy, pandas, sklearn, xgboost)},
+        "config": {k: os.environ[k] for k in sorted(os.environ)
+                   if k.startswith(("OPTUNA_", "SCORE_", "SCORER_", "STREAM_", "OMP_"))},
+    }
+
+def run_case(name, n_rows, workdir, repeat):
+    spec = CASES[name]
+    result = {"case": name, "rows": n_rows if spec["scaled"] else None}
+    if spec["max_rows"] and n_rows > spec["max_rows"]:
+        return {**result, "status": "skipped", "reason": f"above max_rows={spec['max_rows']}"}
+
+    repeat = spec["repeat"] or repeat
+    operation, ops = spec["fn"](n_rows, workdir)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    return {
+        **result, "status": "ok", "repeat": repeat, "ops": ops,
+        "min": min(times), "median": median, "max": max(times),
+        "per_op_us": median / ops * 1e6, "ops_per_second": ops / median,
+    }
+
+def run(rows=DEFAULT_ROWS, cases=None, repeat=DEFAULT_REPEAT, output=None, verbose=False):
+    """Runs the suite and writes the JSON results; returns the results dict."""
+    cases = cases or list(CASES)
+    report = {"environment": environment(), "results": []}
+    print(f"🏁 Benchmark suite at {report['environment']['commit'][:12]}: {', '.join(cases)}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in cases:
+            for n_rows in (rows if CASES[name]["scaled"] else rows[:1]):
+                # The pipeline's own progress prints would drown the results
+                with contextlib.redirect_stdout(sys.stdout if verbose else io.StringIO()):
+                    result = run_case(name, n_rows, workdir, repeat)
+                report["results"].append(result)
+                label = f"{name} @ {n_rows:,} rows" if CASES[name]["scaled"] else name
+                if result["status"] == "ok":
+                    print(f"   - {label:<32} median {result['median']:9.4f} s  "
+                          f"{result['ops_per_second']:>14,.0f} ops/s")
+                else:
+                    print(f"   - {label:<32} {result['status']} ({result['reason']})")
+
+    commit = report["environment"]["commit"][:12]
+    output = output or os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if report['environment']['dirty'] else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results saved to: {output}")
+    return report
+
+def compare(old, new, threshold=REGRESSION_THRESHOLD):
+    """Median ratios new/old per (case, rows); returns the list of regressions."""
+    def index(report):
+        return {(r["case"], r["rows"]): r for r in report["results"] if r["status"] == "ok"}
+
+    before, after = index(old), index(new)
+    regressions = []
+    print(f"{'case':<16} {'rows':>10} {'old (s)':>10} {'new (s)':>10} {'ratio':>7}")
+    for key in sorted(before.keys() & after.keys(), key=lambda k: (k[0], k[1] or 0)):
+        ratio = after[key]["median"] / before[key]["median"]
+        flag = ""
+        if ratio > threshold:
+            regressions.append({"case": key[0], "rows": key[1], "ratio": ratio})
+            flag = "  ⚠️  slower"
+        elif ratio < 1 / threshold:
+            flag = "  🚀 faster"
+        rows = f"{key[1]:,}" if key[1] else "-"
+        print(f"{key[0]:<16} {rows:>10} {before[key]['median']:>10.4f} {after[key]['median']:>10.4f} "
+              f"{ratio:>7.2f}{flag}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the suite and save JSON results")
+    run_parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    run_parser.add_argument("--cases", nargs="+", choices=list(CASES))
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run_parser.add_argument("--output")
+    run_parser.add_argument("--verbose", action="store_true")
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run(args.rows, args.cases, args.repeat, args.output, args.verbose)
+    else:
+        with open(args.old) as f_old, open(args.new) as f_new:
+            found = compare(json.load(f_old), json.load(f_new), args.threshold)
+        sys.exit(1 if found else 0)
@@ -0,0 +1,136 @@
+"""
+Compact WoE feature matrix: a small integer code per value, a lookup table per column.
+
+The encoded DataFrame spends 8 bytes on every value, yet a WoE column holds one
+value per category (or bin) and the raw numeric columns a few thousand distinct
+integers at most. A CompactMatrix stores, per column, the code of each value as
+uint8 (up to 256 distinct values) or uint16 (up to 65,536), plus the float32 table
+of the values the codes stand for:
+  - categorical / binned numeric columns: the engineer's WoE lookup, codes are the
+    category or bin positions (unseen / missing -> the trailing 0.0)
+  - raw integer columns spanning at most 65,536 values: value - min, table min..max
+  - other raw numeric columns: the sorted distinct values (NaN stays NaN, i.e. missing)
+Columns with more distinct values are kept as float32 values (no table).
+
+XGBoost reads it through a DataIter that decodes COMPACT_BATCH_ROWS rows at a
+time (table[codes]), so a QuantileDMatrix is built, or a batch scored, without
+ever holding the dense matrix. XGBoost works in float32, so models and
+predictions match the ones trained on the float64 DataFrame.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+# Rows decoded per iterator step; peak extra memory is rows x features x 4 bytes
+COMPACT_BATCH_ROWS = int(os.getenv("COMPACT_BATCH_ROWS", "65536"))
+
+def _code_dtype(n_values):
+    if n_values <= 1 << 8:
+        return np.uint8
+    if n_values <= 1 << 16:
+        return np.uint16
+    return None
+
+def _compact_column(codes, table):
+    """(codes, table) with the narrowest code dtype, or (float32 values, None) if none fits."""
+    dtype = _code_dtype(len(table))
+    if dtype is None:
+        return table[codes].astype(np.float32), None
+    return codes.astype(dtype), table.astype(np.float32)
+
+def _narrow_integers(values):
+    # Span in Python ints: np.ptp works in the column's dtype and wraps on int32 / int8 etc.
+    return pd.api.types.is_integer_dtype(values) and len(values) > 0 and int(values.max()) - int(values.min()) < 1 << 16
+
+class CompactMatrix:
+    def __init__(self, columns):
+        """columns: {feature name: (codes, table)}, table None when codes hold the float32 values."""
+        self.columns = columns
+        self.feature_names = list(columns)
+        self.n_rows = len(next(iter(columns.values()))[0]) if columns else 0
+
+    @classmethod
+    def from_frame(cls, df, engineer, target_col='target'):
+        """Encodes raw data with a fitted engineer straight to codes (no float64 WoE frame)."""
+        columns = {}
+        for col in df.columns:
+            if col == target_col:
+                continue
+            if col in engineer.woe_tables:
+                lookup = engineer.woe_tables[col][1]
+                # -1 (unseen / missing) wraps to the trailing 0.0 of the lookup
+                codes = engineer.category_codes(col, df[col].values) % len(lookup)
+                columns[col] = _compact_column(codes, lookup)
+            elif col in engineer.numeric_bins:
+                lookup = engineer.numeric_bins[col][1]
+                codes = engineer.bin_codes(col, df[col].to_numpy(dtype=np.float64, na_value=np.nan)) % len(lookup)
+                columns[col] = _compact_column(codes, lookup)
+            elif _narrow_integers(df[col]):
+                # No sort needed: the offset from the minimum is the code (taken in int64)
+                values = df[col].to_numpy().astype(np.int64, copy=False)
+                low = int(values.min())
+                columns[col] = _compact_column(values - low, np.arange(low, int(values.max()) + 1, dtype=np.float64))
+            else:
+                values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                table, codes = np.unique(values, return_inverse=True)
+                columns[col] = _compact_column(codes, table)
+        return cls(columns)
+
+    @property
+    def nbytes(self):
+        return sum(codes.nbytes + (0 if table is None else table.nbytes) for codes, table in self.columns.values())
+
+    def take(self, index):
+        """The rows at `index` (e.g. a train / test split); the tables are shared."""
+        return CompactMatrix({col: (codes[index], table) for col, (codes, table) in self.columns.items()})
+
+    def decode(self, start=0, stop=None):
+        """Dense float32 rows [start, stop): one gather per column."""
+        stop = self.n_rows if stop is None else min(stop, self.n_rows)
+        out = np.empty((stop - start, len(self.columns)), dtype=np.float32)
+        for j, (codes, table) in enumerate(self.columns.values()):
+            out[:, j] = codes[start:stop] if table is None else table[codes[start:stop]]
+        return out
+
+    def batches(self, batch_rows=COMPACT_BATCH_ROWS):
+        for start in range(0, self.n_rows, batch_rows):
+            yield start, self.decode(start, start + batch_rows)
+
+    def quantile_dmatrix(self, label=None, batch_rows=COMPACT_BATCH_ROWS, **kwargs):
+        """QuantileDMatrix built batch by batch from the codes."""
+        return xgb.QuantileDMatrix(CompactIter(self, label, batch_rows), **kwargs)
+
+    def dmatrix(self, label=None):
+        """Plain DMatrix (float32) for small evaluation sets."""
+        return xgb.DMatrix(self.decode(), label=label, feature_names=self.feature_names)
+
+    def predict(self, booster, batch_rows=COMPACT_BATCH_ROWS):
+        """Scores every row, decoding one batch at a time."""
+        return np.concatenate([booster.inplace_predict(X) for _, X in self.batches(batch_rows)])
+
+class CompactIter(xgb.DataIter):
+    """Feeds a CompactMatrix to XGBoost in decoded float32 batches."""
+
+    def __init__(self, matrix, label=None, batch_rows=COMPACT_BATCH_ROWS):
+        self._matrix = matrix
+        self._label = None if label is None else np.asarray(label, dtype=np.float32)
+        self._batch_rows = batch_rows
+        self._start = 0
+        super().__init__()
+
+    def next(self, input_data):
+        if self._start >= self._matrix.n_rows:
+            return False
+        stop = self._start + self._batch_rows
+        input_data(
+            data=self._matrix.decode(self._start, stop),
+            label=None if self._label is None else self._label[self._start:stop],
+            feature_names=self._matrix.feature_names,
+        )
+        self._start = stop
+        return True
+
+    def reset(self):
+        self._start = 0
@@ -0,0 +1,301 @@
+"""
+Compiled tree-ensemble inference.
+
+compile_booster() exports a gbtree Booster into flat NumPy node arrays (split
+feature, threshold, child indices, default direction, leaf value). The evaluator
+walks every tree at once, level by level, over a whole batch: one gather per
+level instead of a per-row, per-tree pointer chase. Trees that only split on
+WoE-encoded (discrete) features can additionally be tabulated: their leaf is
+looked up from the category codes of the row, without walking at all.
+
+    python src/compiled_trees.py <model.xgb|model.ubj> [out.npz]
+"""
+import itertools
+import json
+import os
+import sys
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+COMPILED_ARTIFACT = "compiled_trees.npz"
+
+# Rows evaluated together; keeps the (rows x trees) node matrix cache-sized
+BLOCK_ROWS = 8192
+# Deepest tree supported (the heap layout holds 2^depth slots per tree)
+MAX_DEPTH = 12
+# Largest leaf table (product of category counts) built for a discrete-only tree
+MAX_LEAF_TABLE = 4096
+
+# objective -> (margin -> output transform, base_score -> base margin)
+OBJECTIVES = {
+    "binary:logistic": ("sigmoid", "logit"),
+    "reg:logistic": ("sigmoid", "logit"),
+    "reg:squarederror": ("identity", "identity"),
+}
+
+class CompiledEnsemble:
+    """
+    A tree ensemble as flat arrays. Node i of the forest splits on feature[i] at
+    threshold[i]: rows with x < threshold go to children[2i], the others to
+    children[2i + 1], and missing values follow default_left[i]. Leaves point to
+    themselves and carry value[i].
+
+    For evaluation every tree is also laid out as a complete binary heap of depth
+    `depth` (leaves above the last level are replicated down), so the walk computes
+    the next position as 2 * pos + go_right instead of gathering child indices.
+    """
+
+    def __init__(self, feature, threshold, children, default_left, value, roots, depth,
+                 base_margin, transform="sigmoid", feature_names=None):
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float32)
+        self.children = np.asarray(children, dtype=np.int32)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.value = np.asarray(value, dtype=np.float32)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.depth = int(depth)
+        self.base_margin = float(base_margin)
+        self.transform = transform
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.leaf_tables = None
+        self._build_heaps()
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_features(self):
+        return len(self.feature_names) if self.feature_names else int(self.feature.max()) + 1
+
+    def _build_heaps(self):
+        """Fills the (trees x 2^depth) heap arrays from the node arrays."""
+        if self.depth > MAX_DEPTH:
+            raise ValueError(f"Trees deeper than {MAX_DEPTH} levels are not supported (got {self.depth})")
+        width = 2 ** self.depth
+        # Internal heap positions are 1 .. width-1; position 0 is unused
+        self.heap_feature = np.zeros((self.n_trees, width), dtype=np.int64)
+        self.heap_threshold = np.full((self.n_trees, width), np.inf, dtype=np.float32)
+        self.heap_default_left = np.ones((self.n_trees, width), dtype=bool)
+        self.heap_leaf = np.zeros((self.n_trees, width), dtype=np.float32)
+
+        for t, root in enumerate(self.roots):
+            stack = [(int(root), 1, 0)]  # (node, heap position, level)
+            while stack:
+                node, pos, level = stack.pop()
+                if level == self.depth:
+                    self.heap_leaf[t, pos - width] = self.value[node]
+                    continue
+                left, right = self.children[2 * node], self.children[2 * node + 1]
+                if left != node:
+                    self.heap_feature[t, pos] = self.feature[node]
+                    self.heap_threshold[t, pos] = self.threshold[node]
+                    self.heap_default_left[t, pos] = self.default_left[node]
+                # A leaf above the last level: both copies below lead to the same value
+                stack += [(left, 2 * pos, level + 1), (right, 2 * pos + 1, level + 1)]
+
+        # Row offset of each tree in the flattened heaps
+        self._tree_offsets = (np.arange(self.n_trees, dtype=np.int64) * width)[None, :]
+
+    def _walk(self, X, trees):
+        """Leaf position (0 .. 2^depth - 1) reached by every row in each tree: (rows, trees)."""
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        tree_offsets = self._tree_offsets[:, trees]
+        has_missing = np.isnan(flat).any()
+        feature = self.heap_feature.ravel()
+        threshold = self.heap_threshold.ravel()
+
+        pos = np.ones((n_rows, tree_offsets.shape[1]), dtype=np.int64)
+        for _ in range(self.depth):
+            node = tree_offsets + pos
+            x = flat[row_offsets + feature[node]]
+            go_right = ~(x < threshold[node])
+            if has_missing:
+                # NaN < t is False, i.e. "right"; flip the ones whose default is left
+                go_right ^= np.isnan(x) & self.heap_default_left.ravel()[node]
+            pos = 2 * pos + go_right
+        return pos - 2 ** self.depth
+
+    def _walk_sum(self, X, trees):
+        leaves = self._walk(X, trees) + self._tree_offsets[:, trees]
+        return self.heap_leaf.ravel()[leaves].sum(axis=1, dtype=np.float64)
+
+    def _leaf_sum(self, X):
+        """Sum of leaf values over all trees for one block of rows."""
+        tables = self.leaf_tables
+        if tables is None:
+            return self._walk_sum(X, slice(None))
+
+        codes = np.empty((len(X), len(tables["features"])), dtype=np.int64)
+        for j, (f, levels) in enumerate(zip(tables["features"], tables["levels"])):
+            code = np.searchsorted(levels, X[:, f]).clip(0, len(levels) - 1)
+            if not np.array_equal(levels[code], X[:, f]):
+                # A value outside the fitted levels: walk every tree for this block
+                return self._walk_sum(X, slice(None))
+            codes[:, j] = code
+
+        total = tables["values"][codes @ tables["strides"].T + tables["offsets"]].sum(axis=1, dtype=np.float64)
+        if len(tables["walk_trees"]):
+            total += self._walk_sum(X, tables["walk_trees"])
+        return total
+
+    def predict_margin(self, X, block_rows=BLOCK_ROWS):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        margin = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), block_rows):
+            margin[start:start + block_rows] = self._leaf_sum(X[start:start + block_rows])
+        return margin + self.base_margin
+
+    def predict(self, X, block_rows=BLOCK_ROWS):
+        """Same output as Booster.predict (probabilities for binary:logistic)."""
+        margin = self.predict_margin(X, block_rows)
+        if self.transform == "sigmoid":
+            return (1.0 / (1.0 + np.exp(-margin))).astype(np.float32)
+        return margin.astype(np.float32)
+
+    def build_leaf_tables(self, levels, max_table_size=MAX_LEAF_TABLE):
+        """
+        Precomputes leaf values for trees that only split on discrete features.
+        levels: {feature index: every value the feature can take} (e.g. WoE values).
+        Returns the number of tabulated trees; the others keep being walked.
+        """
+        levels = {f: np.unique(np.asarray(v, dtype=np.float32)) for f, v in levels.items()}
+        discrete = sorted(levels)
+        column = {f: j for j, f in enumerate(discrete)}
+
+        strides, offsets, values, walk_trees = [], [], [], []
+        size = 0
+        for t, root in enumerate(self.roots):
+            used = sorted(set(self.feature[self._subtree(root)].tolist()))
+            if not all(f in levels for f in used):
+                walk_trees.append(t)
+                continue
+            n_cells = int(np.prod([len(levels[f]) for f in used]))
+            if n_cells > max_table_size:
+                walk_trees.append(t)
+                continue
+
+            # Every combination of levels of the features this tree uses, one row each
+            grid = np.zeros((n_cells, self.n_features), dtype=np.float32)
+            stride = np.zeros(len(discrete), dtype=np.int64)
+            step = 1
+            for f in reversed(used):
+                stride[column[f]] = step
+                step *= len(levels[f])
+            for k, combo in enumerate(itertools.product(*(levels[f] for f in used))):
+                grid[k, used] = combo
+            leaves = self._walk(grid, [t])[:, 0]
+
+            strides.append(stride)
+            offsets.append(size)
+            values.append(self.heap_leaf[t, leaves])
+            size += n_cells
+
+        if not offsets:
+            self.leaf_tables = None
+            return 0
+        self.leaf_tables = {
+            "features": discrete,
+            "levels": [levels[f] for f in discrete],
+            "strides": np.array(strides, dtype=np.int64).reshape(-1, len(discrete)),
+            "offsets": np.array(offsets, dtype=np.int64),
+            "values": np.concatenate(values) if values else np.zeros(0, dtype=np.float32),
+            "walk_trees": np.array(walk_trees, dtype=np.int64),
+        }
+        return len(offsets)
+
+    def _subtree(self, root):
+        """Indices of the internal nodes under root."""
+        internal, stack = [], [int(root)]
+        while stack:
+            node = stack.pop()
+            left, right = self.children[2 * node], self.children[2 * node + 1]
+            if left != node:  # leaves point to themselves
+                internal.append(node)
+                stack.extend((left, right))
+        return np.array(internal, dtype=np.int64)
+
+    def save(self, path):
+        """Writes the node arrays to a compressed .npz file (no pickled objects)."""
+        np.savez_compressed(
+            path, feature=self.feature, threshold=self.threshold, children=self.children,
+            default_left=self.default_left, value=self.value, roots=self.roots,
+            depth=self.depth, base_margin=self.base_margin, transform=self.transform,
+            feature_names=np.array(self.feature_names or [], dtype=str),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["feature"], data["threshold"], data["children"], data["default_left"],
+                data["value"], data["roots"], int(data["depth"]), float(data["base_margin"]),
+                transform=str(data["transform"]), feature_names=data["feature_names"].tolist() or None,
+            )
+
+def compile_booster(booster):
+    """Exports a gbtree Booster (numerical splits, single output) to a CompiledEnsemble."""
+    model = json.loads(booster.save_raw("json"))["learner"]
+    objective = model["objective"]["name"]
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unsupported objective for compilation: {objective}")
+    if model["gradient_booster"]["name"] != "gbtree":
+        raise ValueError(f"Only gbtree models can be compiled, got {model['gradient_booster']['name']}")
+    transform, base_link = OBJECTIVES[objective]
+
+    feature, threshold, children, default_left, value, roots = [], [], [], [], [], []
+    depth = 0
+    for tree in model["gradient_booster"]["model"]["trees"]:
+        if any(tree["split_type"]):
+            raise ValueError("Categorical splits are not supported; encode categoricals first")
+        offset = len(feature)
+        roots.append(offset)
+        lefts, rights = tree["left_children"], tree["right_children"]
+        node_depth = {0: 0}
+        for i, (left, right) in enumerate(zip(lefts, rights)):
+            if left == -1:  # leaf: split_conditions holds the leaf value
+                feature.append(0)
+                threshold.append(0.0)
+                children += [offset + i, offset + i]
+                default_left.append(True)
+                value.append(tree["split_conditions"][i])
+            else:
+                feature.append(tree["split_indices"][i])
+                threshold.append(tree["split_conditions"][i])
+                children += [offset + left, offset + right]
+                default_left.append(bool(tree["default_left"][i]))
+                value.append(0.0)
+                node_depth[left] = node_depth[right] = node_depth[i] + 1
+                depth = max(depth, node_depth[i] + 1)
+
+    base_score = float(model["learner_model_param"]["base_score"])
+    base_margin = np.log(base_score / (1 - base_score)) if base_link == "logit" else base_score
+    return CompiledEnsemble(
+        feature, threshold, children, default_left, value, roots, depth, base_margin,
+        transform=transform, feature_names=booster.feature_names,
+    )
+
+def woe_levels(engineer, feature_names):
+    """{feature index: possible WoE values} for the columns the engineer encodes."""
+    # Lookups include the trailing 0.0 of unseen categories / missing numbers
+    tables = {**engineer.woe_tables, **engineer.numeric_bins}
+    return {i: tables[name][1] for i, name in enumerate(feature_names) if name in tables}
+
+if __name__ == "__main__":
+    import xgboost as xgb
+
+    if len(sys.argv) < 2:
+        print("Usage: python src/compiled_trees.py <model file> [out.npz]")
+        sys.exit(1)
+    booster = xgb.Booster()
+    booster.load_model(sys.argv[1])
+    compiled = compile_booster(booster)
+    out = compiled.save(sys.argv[2] if len(sys.argv) > 2 else COMPILED_ARTIFACT)
+    print(f"✅ Compiled {compiled.n_trees} trees (depth {compiled.depth}, "
+          f"{len(compiled.feature)} nodes) to: {out}")
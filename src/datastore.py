@@ -0,0 +1,186 @@
+"""
+Columnar storage for the credit dataset.
+
+Parquet (partitioned into part files, categoricals dictionary-encoded) is the
+on-disk format written by ingest; an uncompressed Arrow IPC file can be
+memory-mapped so that loading costs page faults instead of parsing. Both come
+back as pandas frames with category dtype, which CreditRiskFeatures encodes
+through the category codes.
+"""
+import itertools
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.synthetic import CATEGORICAL_LEVELS, NUMERIC_RANGES
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent
+PARQUET_PATH = BASE_DIR / "data" / "processed" / "german_credit"
+ARROW_PATH = BASE_DIR / "data" / "processed" / "german_credit.arrow"
+CSV_PATH = BASE_DIR / "data" / "raw" / "german_credit_data.csv"
+
+# Partitioning: one part file per PARQUET_ROWS_PER_FILE rows, row groups inside it
+PARQUET_ROWS_PER_FILE = 5_000_000
+PARQUET_ROWS_PER_GROUP = 500_000
+
+def _dictionary_type(col):
+    # Known categoricals have a handful of levels; anything else may be high-cardinality
+    index_type = pa.int8() if col in CATEGORICAL_LEVELS else pa.int32()
+    return pa.dictionary(index_type, pa.string())
+
+def _narrow_dictionaries(schema):
+    """Parquet does not keep dictionary index widths; restores the narrow ones on read."""
+    return pa.schema([
+        pa.field(f.name, _dictionary_type(f.name)) if pa.types.is_dictionary(f.type) else f
+        for f in schema
+    ])
+
+def credit_schema(df):
+    """
+    Explicit Arrow schema for a credit frame: known categoricals as dictionary<int8, string>,
+    known numerics as int32, the target as int8. Other columns keep an inferred type
+    (strings are dictionary-encoded with int32 indices, e.g. high-cardinality merchants).
+    """
+    fields = []
+    for col, dtype in df.dtypes.items():
+        if col in CATEGORICAL_LEVELS:
+            fields.append(pa.field(col, _dictionary_type(col)))
+        elif col in NUMERIC_RANGES:
+            fields.append(pa.field(col, pa.int32()))
+        elif col == 'target':
+            fields.append(pa.field(col, pa.int8()))
+        elif dtype == object or isinstance(dtype, pd.CategoricalDtype):
+            fields.append(pa.field(col, _dictionary_type(col)))
+        else:
+            fields.append(pa.field(col, pa.from_numpy_dtype(dtype)))
+    return pa.schema(fields)
+
+def to_arrow(df, schema=None):
+    return pa.Table.from_pandas(df, schema=schema or credit_schema(df), preserve_index=False)
+
+def write_parquet(frames, path=PARQUET_PATH, rows_per_file=PARQUET_ROWS_PER_FILE,
+                  rows_per_group=PARQUET_ROWS_PER_GROUP):
+    """
+    Writes a DataFrame, or an iterable of DataFrame chunks, as a directory of
+    part-NNNNN.parquet files (zero-padded so that file order is row order).
+    Existing part files in the directory are replaced.
+    """
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+    frames = iter(frames)
+    first = next(frames)
+    schema = credit_schema(first)
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for old in path.glob("part-*.parquet"):
+        old.unlink()
+
+    part, rows_in_part, writer = 0, 0, None
+    for df in itertools.chain([first], frames):
+        table = to_arrow(df, schema)
+        while table.num_rows:
+            if writer is None:
+                writer = pq.ParquetWriter(path / f"part-{part:05d}.parquet", schema)
+            piece = table.slice(0, rows_per_file - rows_in_part)
+            writer.write_table(piece, row_group_size=rows_per_group)
+            table = table.slice(piece.num_rows)
+            rows_in_part += piece.num_rows
+            if rows_in_part == rows_per_file:
+                writer.close()
+                part, rows_in_part, writer = part + 1, 0, None
+    if writer is not None:
+        writer.close()
+    return path
+
+class _DictionaryUnifier:
+    """
+    Re-encodes dictionary columns against one growing dictionary per column, so every
+    batch extends the previous batch's dictionary. The IPC file format accepts that as
+    dictionary deltas, which lets the Arrow file be written one batch at a time.
+    """
+
+    def __init__(self, schema):
+        self.schema = _narrow_dictionaries(schema)
+        self.values = {f.name: {} for f in schema if pa.types.is_dictionary(f.type)}
+
+    def __call__(self, batch):
+        columns = []
+        for field, column in zip(self.schema, batch.columns):
+            if field.name in self.values:
+                known = self.values[field.name]
+                chunk_values = column.dictionary.to_pylist()
+                for value in chunk_values:
+                    known.setdefault(value, len(known))
+                lookup = pa.array([known[v] for v in chunk_values], field.type.index_type)
+                column = pa.DictionaryArray.from_arrays(
+                    pc.take(lookup, column.indices), pa.array(list(known), pa.string())
+                )
+            columns.append(column)
+        return pa.record_batch(columns, schema=self.schema)
+
+def write_arrow(data, path=ARROW_PATH):
+    """
+    Writes a DataFrame, an Arrow table or an iterable of record batches as an
+    uncompressed Arrow IPC file (memory-mappable), one batch at a time.
+    """
+    if isinstance(data, pd.DataFrame):
+        data = to_arrow(data)
+    batches = iter(data.to_batches() if isinstance(data, pa.Table) else data)
+    first = next(batches)
+    unify = _DictionaryUnifier(first.schema)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, unify.schema, options=options) as writer:
+        for batch in itertools.chain([first], batches):
+            writer.write_batch(unify(batch))
+    return path
+
+def parquet_to_arrow(parquet_path=PARQUET_PATH, arrow_path=ARROW_PATH):
+    """Converts the Parquet dataset to the memory-mappable Arrow file, batch by batch."""
+    return write_arrow(_parquet_dataset(parquet_path).to_batches(), arrow_path)
+
+def _parquet_dataset(path):
+    schema = ds.dataset(path, format="parquet").schema
+    return ds.dataset(path, format="parquet", schema=_narrow_dictionaries(schema))
+
+def read_table(path, columns=None):
+    """Reads only the requested columns as an Arrow table (.arrow files are memory-mapped)."""
+    if str(path).endswith(".arrow"):
+        table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        return table.select(columns) if columns else table
+    return _parquet_dataset(path).to_table(columns=columns)
+
+def resolve_path(path=None):
+    """Defaults to the Parquet dataset written by ingest, falling back to the raw CSV."""
+    return path or (PARQUET_PATH if PARQUET_PATH.exists() else CSV_PATH)
+
+def load_dataset(path=None, columns=None):
+    """Loads the credit dataset as a DataFrame from Parquet, Arrow or CSV (by path)."""
+    path = resolve_path(path)
+    if str(path).endswith(".csv"):
+        return pd.read_csv(path, usecols=columns)
+    return read_table(path, columns).to_pandas()
+
+def iter_chunks(path, chunksize, columns=None):
+    """Yields DataFrames of at most chunksize rows without loading the whole dataset."""
+    path = resolve_path(path)
+    if str(path).endswith(".csv"):
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+        return
+    if str(path).endswith(".arrow"):
+        batches = read_table(path, columns).to_batches(max_chunksize=chunksize)
+    else:
+        batches = _parquet_dataset(path).to_batches(columns=columns, batch_size=chunksize)
+    for batch in batches:
+        yield batch.to_pandas()
@@ -0,0 +1,265 @@
+"""
+Online drift monitoring with fixed-memory sketches.
+
+A DriftMonitor holds, per feature, the reference distribution over fixed bins
+(quantile edges of the reference data for numerics, the reference categories for
+categoricals, plus an 'other/missing' bin) and running counts of the live traffic
+over the same bins. Updating costs one bisect or dict lookup per feature; the API
+only queues records and a background thread bins them. PSI / KS / Jensen-Shannon
+are computed on demand from the two count vectors.
+
+    python src/drift.py reference [data_path]   # build the reference sketch
+"""
+import bisect
+import collections
+import math
+import os
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Config
+BASE_DIR = Path(__file__).parent.parent
+DRIFT_REFERENCE_PATH = os.getenv("SENTINEL_DRIFT_REFERENCE", str(BASE_DIR / "models" / "drift_reference.npz"))
+DRIFT_N_BINS = 10
+# Rule-of-thumb PSI bands: < 0.1 stable, 0.1-0.2 moderate shift, > 0.2 significant drift
+PSI_THRESHOLD = 0.2
+# Scored records waiting for the background flush (oldest are dropped beyond this)
+DRIFT_QUEUE_SIZE = 100_000
+DRIFT_FLUSH_SECONDS = 1.0
+
+def _to_number(value):
+    """A raw numeric value as a float; None and values that are not numbers give NaN."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+class DriftMonitor:
+    def __init__(self, edges, categories, reference_counts):
+        """
+        edges: {numeric col: inner bin edges}, categories: {categorical col: levels},
+        reference_counts: {col: counts per bin, the last bin being other/missing}.
+        """
+        self.edges = {col: np.asarray(e, dtype=float) for col, e in edges.items()}
+        self.categories = {col: list(c) for col, c in categories.items()}
+        self.reference_counts = {col: np.asarray(c, dtype=float) for col, c in reference_counts.items()}
+        self.columns = list(self.reference_counts)
+
+        # Plain Python structures on the update path: bisect on a list, dict lookups
+        self._edge_lists = {col: e.tolist() for col, e in self.edges.items()}
+        self._positions = {col: {v: i for i, v in enumerate(c)} for col, c in self.categories.items()}
+        self._lock = threading.Lock()
+        self._pending = collections.deque(maxlen=DRIFT_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._thread = None
+        self.reset()
+
+    @classmethod
+    def from_reference(cls, df, features=None, n_bins=DRIFT_N_BINS):
+        """Builds the sketch from reference data (e.g. the training set)."""
+        features = features or [c for c in df.columns if c != 'target']
+        edges, categories = {}, {}
+        for col in features:
+            values = df[col]
+            if pd.api.types.is_numeric_dtype(values) and not isinstance(values.dtype, pd.CategoricalDtype):
+                quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+                edges[col] = np.unique(np.nanquantile(values.to_numpy(dtype=float), quantiles))
+            else:
+                categories[col] = values.dropna().astype(object).unique().tolist()
+        monitor = cls(edges, categories, {col: np.zeros(1) for col in features})
+        monitor.reference_counts = monitor._count_frame(df)
+        monitor.reset()
+        return monitor
+
+    def _n_bins(self, col):
+        size = len(self.edges[col]) + 1 if col in self.edges else len(self.categories[col])
+        return size + 1  # other / missing
+
+    def _count_frame(self, df):
+        """Vectorized bin counts of a DataFrame (reference data, offline batches)."""
+        counts = {}
+        for col in self.columns:
+            n_bins = self._n_bins(col)
+            if col not in df.columns:
+                counts[col] = np.zeros(n_bins)
+                continue
+            if col in self.edges:
+                values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+                bins = np.searchsorted(self.edges[col], values, side='right')
+                bins[np.isnan(values)] = n_bins - 1
+            else:
+                bins = pd.Index(self.categories[col]).get_indexer(df[col].astype(object))
+                bins[bins == -1] = n_bins - 1
+            counts[col] = np.bincount(bins, minlength=n_bins).astype(float)
+        return counts
+
+    def reset(self):
+        """Starts a new monitoring window (records still queued are discarded)."""
+        self._pending.clear()
+        with self._lock:
+            self.current_counts = {col: [0] * self._n_bins(col) for col in self.columns}
+            self.n_current = 0
+            # (counts, bin edges or None, category positions or None, other/missing bin)
+            self._slots = [
+                (self.current_counts[col], self._edge_lists.get(col), self._positions.get(col),
+                 self._n_bins(col) - 1)
+                for col in self.columns
+            ]
+
+    def update(self, record):
+        """Adds one scored record (a dict of raw feature values)."""
+        self.update_many((record,))
+
+    def update_many(self, records):
+        """Adds scored records: one bisect or dict lookup per value, one lock per call."""
+        bisect_right = bisect.bisect_right
+        with self._lock:
+            for col, (counts, edges, positions, other) in zip(self.columns, self._slots):
+                if edges is None:
+                    get = positions.get
+                    for record in records:
+                        try:
+                            counts[get(record.get(col), other)] += 1
+                        except TypeError:  # unhashable value (e.g. a list): other
+                            counts[other] += 1
+                else:
+                    for record in records:
+                        value = record.get(col)
+                        if value.__class__ is not int and value.__class__ is not float:
+                            value = _to_number(value)
+                        # None, NaN and values that are not numbers go to the missing bin
+                        counts[other if value != value else bisect_right(edges, value)] += 1
+            self.n_current += len(records)
+
+    def enqueue(self, records):
+        """
+        Hot-path variant of update_many: only appends to a bounded queue (deque appends are
+        thread-safe); the binning happens in flush(), off the request path.
+        """
+        self._pending.extend(records)
+
+    def flush(self):
+        """Bins every queued record into the current window."""
+        batch = []
+        try:
+            while True:
+                batch.append(self._pending.popleft())
+        except IndexError:
+            pass
+        if batch:
+            self.update_many(batch)
+
+    def start(self, interval=DRIFT_FLUSH_SECONDS):
+        """Flushes the queue from a daemon thread every `interval` seconds."""
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"⚠️  Drift flush failed: {e}")
+
+        self._thread = threading.Thread(target=loop, name="drift-flush", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+
+    def update_frame(self, df):
+        """Adds a whole DataFrame at once (offline / batch scoring)."""
+        counts = self._count_frame(df)
+        with self._lock:
+            for col, c in counts.items():
+                current = self.current_counts[col]
+                for i, n in enumerate(c.astype(int).tolist()):
+                    current[i] += n
+            self.n_current += len(df)
+
+    @staticmethod
+    def _distances(reference, current, numeric):
+        # Avoid division by zero / log(0), as in the WoE calculation
+        epsilon = 1e-6
+        p = reference / max(reference.sum(), 1)
+        q = current / max(current.sum(), 1)
+
+        psi = float(np.sum((q - p) * np.log((q + epsilon) / (p + epsilon))))
+
+        m = (p + q) / 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            kl_p = np.where(p > 0, p * np.log2(p / m), 0.0).sum()
+            kl_q = np.where(q > 0, q * np.log2(q / m), 0.0).sum()
+        js = float((kl_p + kl_q) / 2)
+
+        # KS on the binned CDFs (ordered value bins only, missing bin excluded)
+        ks = float(np.abs(np.cumsum(p[:-1]) - np.cumsum(q[:-1])).max()) if numeric else None
+        return {"psi": round(psi, 6), "js": round(js, 6), "ks": None if ks is None else round(ks, 6)}
+
+    def report(self, psi_threshold=PSI_THRESHOLD):
+        """PSI / JS (all features) and KS (numerics) of the current window against the reference."""
+        self.flush()
+        with self._lock:
+            current = {col: np.array(c, dtype=float) for col, c in self.current_counts.items()}
+            n_current = self.n_current
+
+        features = {
+            col: self._distances(self.reference_counts[col], current[col], col in self.edges)
+            for col in self.columns
+        }
+        return {
+            "n_reference": int(next(iter(self.reference_counts.values())).sum()) if self.columns else 0,
+            "n_current": n_current,
+            "psi_threshold": psi_threshold,
+            "drifted": [col for col, m in features.items() if n_current and m["psi"] > psi_threshold],
+            "features": features,
+        }
+
+    def save(self, path=DRIFT_REFERENCE_PATH):
+        """Writes the reference sketch to a compressed .npz file (no pickled objects)."""
+        arrays = {"__columns__": np.array(self.columns, dtype=str)}
+        for col in self.columns:
+            if col in self.edges:
+                arrays[f"{col}/edges"] = self.edges[col]
+            else:
+                arrays[f"{col}/categories"] = np.array(self.categories[col], dtype=str)
+            arrays[f"{col}/reference"] = self.reference_counts[col]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(path, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path=DRIFT_REFERENCE_PATH):
+        edges, categories, counts = {}, {}, {}
+        with np.load(path, allow_pickle=False) as data:
+            for col in data["__columns__"].tolist():
+                if f"{col}/edges" in data:
+                    edges[col] = data[f"{col}/edges"]
+                else:
+                    categories[col] = data[f"{col}/categories"].tolist()
+                counts[col] = data[f"{col}/reference"]
+        return cls(edges, categories, counts)
+
+def psi_band(psi):
+    if psi is None or math.isnan(psi):
+        return "n/a"
+    return "stable" if psi < 0.1 else "moderate" if psi < PSI_THRESHOLD else "drift"
+
+if __name__ == "__main__":
+    from src.datastore import load_dataset
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "reference"
+    if command == "reference":
+        df = load_dataset(sys.argv[2] if len(sys.argv) > 2 else None)
+        path = DriftMonitor.from_reference(df).save()
+        print(f"✅ Drift reference ({len(df)} rows) saved to: {path}")
+    else:
+        print("Usage: python src/drift.py reference [data_path]")
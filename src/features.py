@@ -1,76 +1,360 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
 
+# File name of the fitted WoE tables, logged next to the model in MLflow
+WOE_ARTIFACT = "woe_tables.npz"
+
+# Monotone WoE binning of numeric columns (duration, amount, age, ...), off by default
+WOE_BIN_NUMERIC = os.getenv("WOE_BIN_NUMERIC", "0") == "1"
+# Quantile pre-bins per numeric column that the optimizer merges (each ~1/N of the rows)
+WOE_PREBINS = int(os.getenv("WOE_PREBINS", "10"))
+# Threads fitting numeric columns in parallel (sorting releases the GIL)
+WOE_BIN_WORKERS = int(os.getenv("WOE_BIN_WORKERS", str(os.cpu_count() or 1)))
+
 class CreditRiskFeatures:
-    def __init__(self):
-        self.woe_mappings = {}
+    def __init__(self, bin_numeric=WOE_BIN_NUMERIC, n_prebins=WOE_PREBINS):
+        # {column: (categories, lookup)} where lookup[i] is the WoE of categories[i]
+        # and lookup[-1] == 0.0 is the value for missing/unseen categories
+        self.woe_tables = {}
+        # {numeric column: (edges, lookup)}: value v falls in bin searchsorted(edges, v, 'right'),
+        # lookup[i] is the WoE of bin i and lookup[-1] == 0.0 is the value for missing
+        self.numeric_bins = {}
+        self.bin_numeric = bin_numeric
+        self.n_prebins = n_prebins
         self.iv_values = {}
+        self._indexers = {}
+        # Running Good/Bad counts per column while fitting chunk by chunk (partial_fit)
+        self._counts = {}
 
-    def calculate_woe_iv(self, df, feature, target):
+    @property
+    def woe_mappings(self):
+        """The fitted WoE tables as {column: {category: woe}} (for reporting)."""
+        return {
+            col: dict(zip(categories.tolist(), lookup[:-1].tolist()))
+            for col, (categories, lookup) in self.woe_tables.items()
+        }
+
+    def _set_table(self, col, categories, lookup):
+        self.woe_tables[col] = (categories, lookup)
+        # Hash index over the categories, built once and reused by every transform
+        self._indexers[col] = pd.Index(categories)
+
+    @staticmethod
+    def _count_codes(codes, n_levels, is_good, is_bad):
         """
-        Calculates WoE and IV for a categorical feature.
+        Good/Bad counts per level of factorized codes, in one pass over the rows.
+        Rows with code -1 (missing values) are not counted, as in the original loop.
         """
+        # Shift by one so missing values land in bin 0, which is dropped
+        shifted = codes + 1
+        good = np.bincount(shifted, weights=is_good, minlength=n_levels + 1)[1:]
+        bad = np.bincount(shifted, weights=is_bad, minlength=n_levels + 1)[1:]
+        return good, bad
+
+    @staticmethod
+    def _woe_from_counts(good, bad):
+        """Computes WoE per level and the total IV from Good/Bad count arrays."""
         # Avoid division by zero
         epsilon = 1e-6
-        
-        # 1. Group by Feature
-        lst = []
-        unique_values = df[feature].unique()
-        
-        for val in unique_values:
-            all_cnt = df[df[feature] == val].count()[feature]
-            good_cnt = df[(df[feature] == val) & (df[target] == 0)].count()[feature]
-            bad_cnt = df[(df[feature] == val) & (df[target] == 1)].count()[feature]
-            
-            lst.append({
-                'Value': val,
-                'Good': good_cnt,
-                'Bad': bad_cnt
-            })
-            
-        dset = pd.DataFrame(lst)
-        
-        # 2. Calculate Distributions
-        total_good = dset['Good'].sum()
-        total_bad = dset['Bad'].sum()
-        
-        dset['Distr_Good'] = dset['Good'] / total_good
-        dset['Distr_Bad'] = dset['Bad'] / total_bad
-        
-        # 3. Calculate WoE
+
+        # 1. Calculate Distributions
+        distr_good = good / good.sum()
+        distr_bad = bad / bad.sum()
+
+        # 2. Calculate WoE
         # WoE = ln(Distr_Good / Distr_Bad)
-        dset['WoE'] = np.log((dset['Distr_Good'] + epsilon) / (dset['Distr_Bad'] + epsilon))
-        
-        # 4. Calculate IV
+        woe = np.log((distr_good + epsilon) / (distr_bad + epsilon))
+
+        # 3. Calculate IV
         # IV = (Distr_Good - Distr_Bad) * WoE
-        dset['IV'] = (dset['Distr_Good'] - dset['Distr_Bad']) * dset['WoE']
-        
-        iv_score = dset['IV'].sum()
-        
-        # Return the mapping dictionary
-        return dset.set_index('Value')['WoE'].to_dict(), iv_score
+        iv = (distr_good - distr_bad) * woe
+
+        return woe, iv.sum()
+
+    def calculate_woe_iv_all(self, df, features, target):
+        """
+        Calculates WoE and IV for several categorical features at once.
+        Each column is factorized once and counted with np.bincount, so the cost is
+        O(rows) per column regardless of its cardinality.
+        Returns {feature: (mapping, iv)} with the same values as calculate_woe_iv.
+        """
+        y = df[target].to_numpy()
+        is_good = (y == 0).astype(np.float64)
+        is_bad = (y == 1).astype(np.float64)
+
+        results = {}
+        for feature in features:
+            codes, uniques = pd.factorize(df[feature])
+            good, bad = self._count_codes(codes, len(uniques), is_good, is_bad)
+            woe, iv = self._woe_from_counts(good, bad)
+
+            mapping = dict(zip(uniques.tolist(), woe.tolist()))
+            # Missing values appear in unique() but never match '==', so they get 0 counts
+            if (codes == -1).any():
+                mapping[np.nan] = 0.0
+
+            results[feature] = (mapping, iv)
+
+        return results
+
+    @staticmethod
+    def _prebin(values, is_good, is_bad, n_prebins):
+        """
+        Sorts one numeric column once and cuts it at its quantiles. Good/Bad counts of any
+        run of pre-bins then come from prefix sums. Returns (edges, good, bad) where
+        pre-bin j holds the values in [edges[j-1], edges[j]). Missing values are dropped.
+        """
+        present = ~np.isnan(values)
+        order = np.argsort(values[present], kind='stable')
+        sorted_values = values[present][order]
+        if len(sorted_values) == 0:
+            return np.empty(0), np.zeros(1), np.zeros(1)
+        cum_good = np.concatenate(([0.0], np.cumsum(is_good[present][order])))
+        cum_bad = np.concatenate(([0.0], np.cumsum(is_bad[present][order])))
+
+        # Ties collapse, so every distinct value lands in exactly one pre-bin
+        quantiles = (np.arange(1, n_prebins) * len(sorted_values)) // n_prebins
+        edges = np.unique(sorted_values[quantiles])
+        edges = edges[edges > sorted_values[0]]
+        bounds = np.concatenate(([0], np.searchsorted(sorted_values, edges, side='left'), [len(sorted_values)]))
+        return edges, np.diff(cum_good[bounds]), np.diff(cum_bad[bounds])
+
+    @staticmethod
+    def _monotone_merge(good, bad):
+        """
+        Merges adjacent pre-bins into the IV-maximizing partition whose WoE is monotone
+        (increasing or decreasing, whichever reaches the higher IV). Dynamic program over
+        best[i, j] = best IV of pre-bins [0, j) whose last bin is [i, j): O(m^3) for m
+        pre-bins, independent of the number of rows. Returns the pre-bin index each bin starts at.
+        """
+        m = len(good)
+        cum_good = np.concatenate(([0.0], np.cumsum(good)))
+        cum_bad = np.concatenate(([0.0], np.cumsum(bad)))
+        # WoE and IV of every candidate bin [i, j), same formula as _woe_from_counts
+        seg_good = np.subtract.outer(cum_good, cum_good).T
+        seg_bad = np.subtract.outer(cum_bad, cum_bad).T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            distr_good = seg_good / cum_good[-1]
+            distr_bad = seg_bad / cum_bad[-1]
+            woe = np.log((distr_good + 1e-6) / (distr_bad + 1e-6))
+            iv = (distr_good - distr_bad) * woe
+
+        best_iv, best_starts = -np.inf, [0]
+        for sign in (1, -1):
+            best = np.full((m + 1, m + 1), -np.inf)
+            prev = np.zeros((m + 1, m + 1), dtype=int)
+            best[0, 1:] = iv[0, 1:]
+            for j in range(2, m + 1):
+                for i in range(1, j):
+                    # Previous bin [h, i) must not break the monotone order
+                    h = np.arange(i)
+                    candidates = np.where(sign * (woe[i, j] - woe[h, i]) >= 0, best[h, i], -np.inf)
+                    k = int(np.argmax(candidates))
+                    if candidates[k] > -np.inf:
+                        best[i, j] = candidates[k] + iv[i, j]
+                        prev[i, j] = k
+            i = int(np.argmax(best[:, m]))
+            if best[i, m] > best_iv:
+                best_iv, starts, j = best[i, m], [], m
+                while True:
+                    starts.append(i)
+                    if i == 0:
+                        break
+                    i, j = prev[i, j], i
+                best_starts = starts[::-1]
+        return best_starts
+
+    def _fit_numeric(self, values, is_good, is_bad):
+        """(edges, woe per bin, iv) of one numeric column."""
+        prebin_edges, good, bad = self._prebin(values, is_good, is_bad, self.n_prebins)
+        if good.sum() == 0 or bad.sum() == 0:
+            return np.empty(0), np.zeros(1), 0.0  # nothing to separate: one neutral bin
+        starts = self._monotone_merge(good, bad)
+        bounds = starts + [len(good)]
+        merged_good = np.add.reduceat(good, starts)
+        merged_bad = np.add.reduceat(bad, starts)
+        woe, iv = self._woe_from_counts(merged_good, merged_bad)
+        # Bin k starts at pre-bin starts[k], i.e. at prebin_edges[starts[k] - 1]
+        edges = prebin_edges[np.array(bounds[1:-1], dtype=int) - 1]
+        return edges, woe, iv
+
+    def fit_numeric_bins(self, df, features, target):
+        """
+        Fits monotone WoE bins for numeric features, one thread per column.
+        Each column costs one O(n log n) sort; the merge works on the pre-bins only.
+        Returns {feature: (edges, woe per bin, iv)}.
+        """
+        y = df[target].to_numpy()
+        is_good = (y == 0).astype(np.float64)
+        is_bad = (y == 1).astype(np.float64)
+        columns = [df[feature].to_numpy(dtype=np.float64, na_value=np.nan) for feature in features]
+
+        workers = max(1, min(WOE_BIN_WORKERS, len(columns)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            fitted = list(pool.map(lambda values: self._fit_numeric(values, is_good, is_bad), columns))
+        return dict(zip(features, fitted))
+
+    def calculate_woe_iv(self, df, feature, target):
+        """
+        Calculates WoE and IV for a categorical feature.
+        """
+        return self.calculate_woe_iv_all(df, [feature], target)[feature]
+
+    def fit(self, df, target_col='target'):
+        """
+        Fits the WoE tables of all categorical columns (and numeric bins if enabled).
+        """
+        categorical_cols = [
+            col for col in df.select_dtypes(include=['object', 'category']).columns
+            if col != target_col
+        ]
+
+        print(f"⚙️  Transforming {len(categorical_cols)} categorical features using WoE...")
+
+        results = self.calculate_woe_iv_all(df, categorical_cols, target_col)
+
+        for col in categorical_cols:
+            mapping, iv = results[col]
+
+            # Save the mapping as arrays for later (inference)
+            categories = [k for k in mapping if not pd.isna(k)]
+            lookup = np.array([mapping[k] for k in categories] + [0.0])
+            self._set_table(col, np.array(categories, dtype=object), lookup)
+            self.iv_values[col] = iv
+
+            print(f"   - {col}: IV = {iv:.4f}")
+
+        if self.bin_numeric:
+            numeric_cols = [
+                col for col in df.select_dtypes(include='number').columns if col != target_col
+            ]
+            print(f"⚙️  Binning {len(numeric_cols)} numeric features into monotone WoE bins...")
+            for col, (edges, woe, iv) in self.fit_numeric_bins(df, numeric_cols, target_col).items():
+                self.numeric_bins[col] = (edges, np.append(woe, 0.0))
+                self.iv_values[col] = iv
+                print(f"   - {col}: {len(woe)} bins, IV = {iv:.4f}")
+        return self
 
     def fit_transform(self, df, target_col='target'):
         """
         Automatically converts all categorical columns to WoE values.
         """
-        df_processed = df.copy()
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
-        
-        print(f"⚙️  Transforming {len(categorical_cols)} categorical features using WoE...")
-        
+        return self.fit(df, target_col).transform(df)
+
+    def partial_fit(self, df, target_col='target'):
+        """
+        Accumulates Good/Bad counts from one chunk of data (for datasets larger than RAM).
+        Call finalize_fit() after the last chunk; the result equals fit_transform's tables.
+        Numeric binning needs each column sorted as a whole and is not done here.
+        """
+        y = df[target_col].to_numpy()
+        is_good = (y == 0).astype(np.float64)
+        is_bad = (y == 1).astype(np.float64)
+
+        categorical_cols = [
+            col for col in df.select_dtypes(include=['object', 'category']).columns
+            if col != target_col
+        ]
         for col in categorical_cols:
-            if col == target_col: continue
-            
-            mapping, iv = self.calculate_woe_iv(df, col, target_col)
-            
-            # Save the mapping for later (inference)
-            self.woe_mappings[col] = mapping
+            codes, uniques = pd.factorize(df[col])
+            good, bad = self._count_codes(codes, len(uniques), is_good, is_bad)
+            chunk_counts = pd.DataFrame({'Good': good, 'Bad': bad}, index=pd.Index(uniques, dtype=object))
+
+            counts = self._counts.get(col)
+            if counts is None:
+                self._counts[col] = chunk_counts
+            else:
+                # Keep first-seen order; categories new in this chunk go at the end
+                index = counts.index.append(chunk_counts.index.difference(counts.index, sort=False))
+                self._counts[col] = (counts.reindex(index, fill_value=0)
+                                     + chunk_counts.reindex(index, fill_value=0))
+        return self
+
+    def finalize_fit(self):
+        """Turns the counts accumulated by partial_fit into WoE tables."""
+        print(f"⚙️  Finalizing WoE tables for {len(self._counts)} categorical features...")
+        for col, counts in self._counts.items():
+            woe, iv = self._woe_from_counts(counts['Good'].to_numpy(), counts['Bad'].to_numpy())
+            self._set_table(col, counts.index.to_numpy(dtype=object), np.append(woe, 0.0))
             self.iv_values[col] = iv
-            
-            # Apply transformation
-            df_processed[col] = df_processed[col].map(mapping).fillna(0)
-            
             print(f"   - {col}: IV = {iv:.4f}")
-            
-        return df_processed
\ No newline at end of file
+        self._counts = {}
+        return self
+
+    def category_codes(self, col, values):
+        """
+        Position of each raw category value in the column's lookup table; missing or
+        unseen categories get index -1, i.e. the trailing 0.0 of the lookup.
+        """
+        indexer = self._indexers[col]
+        if isinstance(values, pd.Categorical):
+            # Only hash the (few) categories, then gather through the integer codes
+            return np.append(indexer.get_indexer(values.categories), -1)[values.codes]
+        return indexer.get_indexer(values)
+
+    def encode(self, col, values):
+        """Maps raw category values of one column to WoE with a single array gather."""
+        return self.woe_tables[col][1][self.category_codes(col, values)]
+
+    def bin_codes(self, col, values):
+        """Bin of each raw number of one binned column (a binary search into the edges); NaN gets -1."""
+        values = np.asarray(values, dtype=np.float64)
+        codes = np.searchsorted(self.numeric_bins[col][0], values, side='right')
+        codes[np.isnan(values)] = -1
+        return codes
+
+    def encode_numeric(self, col, values):
+        """Maps raw numbers of one binned column to WoE."""
+        return self.numeric_bins[col][1][self.bin_codes(col, values)]
+
+    def transform(self, df):
+        """
+        Applies the fitted WoE tables to new data (e.g. at inference time).
+        Columns without a fitted table are passed through unchanged.
+        """
+        df_processed = df.copy()
+        for col in self.woe_tables:
+            if col in df_processed.columns:
+                df_processed[col] = self.encode(col, df_processed[col].values)
+        for col in self.numeric_bins:
+            if col in df_processed.columns:
+                df_processed[col] = self.encode_numeric(
+                    col, df_processed[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                )
+        return df_processed
+
+    def save(self, path):
+        """Writes the WoE tables to a compressed .npz file (no pickled objects)."""
+        arrays = {
+            "__columns__": np.array(list(self.woe_tables), dtype=str),
+            "__iv__": np.array([self.iv_values.get(c, np.nan) for c in self.woe_tables]),
+        }
+        for col, (categories, lookup) in self.woe_tables.items():
+            arrays[f"{col}/categories"] = categories.astype(str)
+            arrays[f"{col}/woe"] = lookup
+        if self.numeric_bins:
+            arrays["__numeric__"] = np.array(list(self.numeric_bins), dtype=str)
+            arrays["__numeric_iv__"] = np.array([self.iv_values.get(c, np.nan) for c in self.numeric_bins])
+            for col, (edges, lookup) in self.numeric_bins.items():
+                arrays[f"{col}/edges"] = edges
+                arrays[f"{col}/woe"] = lookup
+        np.savez_compressed(path, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Restores an engineer saved with save(); categories come back as strings."""
+        engineer = cls()
+        with np.load(path, allow_pickle=False) as data:
+            for col, iv in zip(data["__columns__"].tolist(), data["__iv__"]):
+                engineer._set_table(col, data[f"{col}/categories"].astype(object), data[f"{col}/woe"])
+                engineer.iv_values[col] = float(iv)
+            # Files written before numeric binning existed have no __numeric__ entry
+            if "__numeric__" in data.files:
+                for col, iv in zip(data["__numeric__"].tolist(), data["__numeric_iv__"]):
+                    engineer.numeric_bins[col] = (data[f"{col}/edges"], data[f"{col}/woe"])
+                    engineer.iv_values[col] = float(iv)
+        return engineer
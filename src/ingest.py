@@ -1,9 +1,15 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
 import requests
 from pathlib import Path
 
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.datastore import PARQUET_PATH, ARROW_PATH, write_parquet, write_arrow
+from src.validation import SCHEMA_PATH, Schema, print_report
+
 # Paths
 BASE_DIR = Path(__file__).parent.parent
 RAW_DATA_PATH = BASE_DIR / "data" / "raw" / "german_credit_data.csv"
@@ -11,6 +17,9 @@ RAW_DATA_PATH = BASE_DIR / "data" / "raw" / "german_credit_data.csv"
 # URL for the raw dataset (UCI Machine Learning Repository)
 DATA_URL = "https://archive.ics.uci.edu/ml/machine-learning-databases/statlog/german/german.data"
 
+# Drop the rows failing the schema (src/validation.py) instead of only reporting them
+INGEST_DROP_INVALID = os.getenv("INGEST_DROP_INVALID", "0") == "1"
+
 # Column Names (The raw file has no headers, so we define them based on documentation)
 COLUMNS = [
     "checkin_acc", "duration", "credit_history", "purpose", "amount",
@@ -20,6 +29,21 @@ COLUMNS = [
     "status"
 ]
 
+def validate_data(df, schema_path=SCHEMA_PATH, drop_invalid=INGEST_DROP_INVALID):
+    """Reports the failing rows per schema rule; drops them if drop_invalid."""
+    if not os.path.exists(schema_path):
+        print(f"   No schema at {schema_path}, skipping validation (python src/validation.py schema)")
+        return df
+    print("🛡️  Validating against the training schema...")
+    schema = Schema.load(schema_path)
+    violations = schema.check_frame(df)
+    report = schema.report(violations)
+    print_report(report)
+    if drop_invalid and report["n_failed"]:
+        df = df[~violations.any(axis=1)].reset_index(drop=True)
+        print(f"   Dropped {report['n_failed']} invalid rows")
+    return df
+
 def ingest_data():
     print("🚀 Starting Data Ingestion...")
     
@@ -41,13 +65,19 @@ def ingest_data():
     # We convert to standard Machine Learning targets: 0 = Good, 1 = Bad (Default)
     df['target'] = df['status'].map({1: 0, 2: 1})
     df = df.drop(columns=['status'])
+
+    # 4. Validate against the schema of the data the current model was trained on
+    df = validate_data(df)
     
-    # 4. Save Clean Version
+    # 5. Save Clean Version
+    # The CSV stays for DVC; downstream consumers read the columnar copies
     df.to_csv(RAW_DATA_PATH, index=False)
+    write_parquet(df, PARQUET_PATH)
+    write_arrow(df, ARROW_PATH)
     
     print(f"✅ Ingestion Complete. Raw Data Shape: {df.shape}")
     print(f"   Target Distribution:\n{df['target'].value_counts()}")
-    print(f"   Saved to: {RAW_DATA_PATH}")
+    print(f"   Saved to: {RAW_DATA_PATH}, {PARQUET_PATH} (Parquet), {ARROW_PATH} (Arrow)")
 
 if __name__ == "__main__":
     ingest_data()
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Promoted-model store.
+
+Promotion copies one MLflow run's booster and WoE tables into a local cache
+directory and records them in a small manifest:
+
+    models/
+      manifest.json              <- run id, artifact paths, feature schema, version
+      <run_id>/model.ubj         <- booster in XGBoost's binary UBJSON format
+      <run_id>/woe_tables.npz    <- fitted WoE tables
+      routing.json               <- optional challengers: A/B split and shadow models
+
+Challenger runs are staged into the same layout without touching the manifest
+(see app/registry.py).
+
+Serving reads the manifest and loads the two files straight from disk, so cold
+start never calls mlflow.search_runs and does not grow with the number of runs.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import xgboost as xgb
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.features import CreditRiskFeatures, WOE_ARTIFACT
+
+# Config
+BASE_DIR = Path(__file__).parent.parent
+MODEL_STORE_DIR = os.getenv("SENTINEL_MODEL_STORE", str(BASE_DIR / "models"))
+MANIFEST_NAME = "manifest.json"
+MODEL_FILE = "model.ubj"
+ROUTING_NAME = "routing.json"
+MLFLOW_EXPERIMENT_NAME = "Sentinel_Credit_Risk_Engine"
+
+def manifest_path(store_dir=MODEL_STORE_DIR):
+    return os.path.join(store_dir, MANIFEST_NAME)
+
+def read_manifest(store_dir=MODEL_STORE_DIR):
+    """Returns the current manifest, or None if nothing has been promoted yet."""
+    try:
+        with open(manifest_path(store_dir)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def _write_manifest(manifest, store_dir):
+    # Write-then-rename so readers never see a half-written manifest
+    fd, tmp_path = tempfile.mkstemp(dir=store_dir, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path(store_dir))
+
+def stage_model(booster, engineer, run_id, store_dir=MODEL_STORE_DIR):
+    """Caches a booster and its WoE tables under store_dir/<run_id>. Returns their paths."""
+    run_dir = os.path.join(store_dir, run_id)
+    os.makedirs(run_dir, exist_ok=True)
+
+    model_path = os.path.join(run_dir, MODEL_FILE)
+    woe_path = os.path.join(run_dir, WOE_ARTIFACT)
+    booster.save_model(model_path)
+    engineer.save(woe_path)
+    return model_path, woe_path
+
+def promote_model(booster, engineer, run_id, metrics=None, store_dir=MODEL_STORE_DIR):
+    """Caches a booster and its WoE tables under store_dir and points the manifest at them."""
+    model_path, woe_path = stage_model(booster, engineer, run_id, store_dir)
+
+    previous = read_manifest(store_dir)
+    manifest = {
+        "version": (previous["version"] + 1) if previous else 1,
+        "run_id": run_id,
+        "model_uri": f"runs:/{run_id}/model",
+        "model_path": os.path.relpath(model_path, store_dir),
+        "woe_path": os.path.relpath(woe_path, store_dir),
+        "feature_names": booster.feature_names,
+        "feature_types": booster.feature_types,
+        "woe_columns": list(engineer.woe_tables) + list(engineer.numeric_bins),
+        "metrics": metrics or {},
+        "promoted_at": datetime.now(timezone.utc).isoformat(),
+    }
+    _write_manifest(manifest, store_dir)
+    return manifest
+
+def best_run_id():
+    """
+    The best-AUC run that logged a model. This is the only place that searches the
+    tracking store (promotion and the serving fallback when nothing was promoted).
+    """
+    import mlflow
+
+    client = mlflow.tracking.MlflowClient()
+    experiment = mlflow.get_experiment_by_name(MLFLOW_EXPERIMENT_NAME)
+    runs = mlflow.search_runs(
+        experiment_ids=[experiment.experiment_id],
+        order_by=["metrics.auc DESC"],
+    )
+    # Optuna trials log metrics but no model; skip them
+    for candidate in runs.run_id:
+        if any(a.path == "model" for a in client.list_artifacts(candidate)):
+            return candidate
+    raise RuntimeError("No run with a logged model found")
+
+def promote_run(run_id=None, store_dir=MODEL_STORE_DIR, promote=True):
+    """
+    Promotes an MLflow run (default: best_run_id()).
+    With promote=False the run is only staged, e.g. as a challenger.
+    """
+    import mlflow
+    import mlflow.xgboost
+    from src.predict import load_feature_engine
+
+    client = mlflow.tracking.MlflowClient()
+    run_id = run_id or best_run_id()
+
+    print(f"🏅 {'Promoting' if promote else 'Staging'} run {run_id}...")
+    booster = mlflow.xgboost.load_model(f"runs:/{run_id}/model")
+    engineer = load_feature_engine(run_id)
+    if not promote:
+        stage_model(booster, engineer, run_id, store_dir)
+        print(f"   ✅ Staged under {os.path.join(store_dir, run_id)}")
+        return None
+    metrics = client.get_run(run_id).data.metrics
+
+    manifest = promote_model(booster, engineer, run_id, metrics=metrics, store_dir=store_dir)
+    print(f"   ✅ Manifest v{manifest['version']} written to {manifest_path(store_dir)}")
+    return manifest
+
+def load_promoted(store_dir=MODEL_STORE_DIR, manifest=None):
+    """Loads (booster, engineer, manifest) from the local cache without touching MLflow."""
+    manifest = manifest or read_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No promoted model in {store_dir}")
+
+    booster = xgb.Booster()
+    booster.load_model(os.path.join(store_dir, manifest["model_path"]))
+    engineer = CreditRiskFeatures.load(os.path.join(store_dir, manifest["woe_path"]))
+    return booster, engineer, manifest
+
+def load_run(run_id, store_dir=MODEL_STORE_DIR):
+    """Loads (booster, engineer) of a staged or promoted run from the local cache."""
+    model_path = os.path.join(store_dir, run_id, MODEL_FILE)
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(model_path)
+    booster = xgb.Booster()
+    booster.load_model(model_path)
+    engineer = CreditRiskFeatures.load(os.path.join(store_dir, run_id, WOE_ARTIFACT))
+    return booster, engineer
+
+def read_routing(store_dir=MODEL_STORE_DIR):
+    """Returns the challenger routing (see app/registry.py), or None if there is none."""
+    try:
+        with open(os.path.join(store_dir, ROUTING_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+class ManifestWatcher:
+    """
+    Background thread that polls the manifest and calls `on_change(booster, engineer, manifest)`
+    when a newer version is promoted. Polling reads one small JSON file.
+    """
+
+    def __init__(self, on_change, store_dir=MODEL_STORE_DIR, interval=30.0, current_version=None):
+        self.on_change = on_change
+        self.store_dir = store_dir
+        self.interval = interval
+        self.current_version = current_version
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="manifest-watcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=self.interval + 1)
+
+    def check(self):
+        """Loads and hands over the promoted model if its version changed. Returns True if so."""
+        manifest = read_manifest(self.store_dir)
+        if manifest is None or manifest["version"] == self.current_version:
+            return False
+        booster, engineer, manifest = load_promoted(self.store_dir, manifest)
+        self.on_change(booster, engineer, manifest)
+        self.current_version = manifest["version"]
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"⚠️  Model refresh failed: {e}")
+
+if __name__ == "__main__":
+    # python src/model_store.py promote [run_id] | stage <run_id> | show
+    command = sys.argv[1] if len(sys.argv) > 1 else "promote"
+    if command == "promote":
+        promote_run(sys.argv[2] if len(sys.argv) > 2 else None)
+    elif command == "stage":
+        promote_run(sys.argv[2], promote=False)
+    elif command == "show":
+        print(json.dumps(read_manifest(), indent=2))
@@ -1,56 +1,81 @@
-import pandas as pd
-from evidently.report import Report
-from evidently.metric_preset import DataDriftPreset, TargetDriftPreset
-from evidently.test_suite import TestSuite
-from evidently.test_preset import DataDriftTestPreset
 import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.datastore import load_dataset
+from src.drift import DriftMonitor, psi_band
 
 # Paths
-DATA_PATH = "data/raw/german_credit_data.csv"
+DATA_PATH = None  # default: Parquet from ingest, else the raw CSV
 REPORT_DIR = "docs/reports"
-os.makedirs(REPORT_DIR, exist_ok=True)
 
-def generate_drift_report():
-    print("🕵️‍♂️  Starting Data Drift Analysis...")
-    
-    # 1. Load Data
-    df = pd.read_csv(DATA_PATH)
-    
-    # 2. Simulate "Reference" (Old) vs "Current" (New) data
-    # In real life, 'current' would be yesterday's live API traffic
-    reference_data = df.iloc[:500] # First half
-    current_data = df.iloc[500:]   # Second half
-    
-    # 3. Generate Visual Report (The Dashboard)
+def generate_html_report(reference_data, current_data):
+    """The slow path: full Evidently report + test suite. Returns the number of failed tests."""
+    # Evidently is only needed here, so the fast path works without it
+    from evidently.report import Report
+    from evidently.metric_preset import DataDriftPreset, TargetDriftPreset
+    from evidently.test_suite import TestSuite
+    from evidently.test_preset import DataDriftTestPreset
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+
+    # Generate Visual Report (The Dashboard)
     print("   📊 Generating HTML Report...")
     report = Report(metrics=[
-        DataDriftPreset(), 
+        DataDriftPreset(),
         TargetDriftPreset()
     ])
-    
+
     report.run(reference_data=reference_data, current_data=current_data)
-    
+
     report_path = f"{REPORT_DIR}/data_drift_report.html"
     report.save_html(report_path)
-    
-    # 4. Run Automated Tests (Pass/Fail)
+
+    # Run Automated Tests (Pass/Fail)
     print("   🧪 Running Drift Tests...")
     tests = TestSuite(tests=[
         DataDriftTestPreset()
     ])
     tests.run(reference_data=reference_data, current_data=current_data)
-    
+
     # Check if tests passed
     results = tests.as_dict()
     failed_tests = results['summary']['failed_tests']
-    
+
     print(f"✅ Report saved to: {report_path}")
     print(f"   Tests Failed: {failed_tests}")
-    
-    if failed_tests > 0:
-        print("⚠️  WARNING: Data Drift Detected!")
+    return failed_tests
+
+def generate_drift_report(html=False):
+    print("🕵️‍♂️  Starting Data Drift Analysis...")
+
+    # 1. Load Data
+    df = load_dataset(DATA_PATH)
+
+    # 2. Simulate "Reference" (Old) vs "Current" (New) data
+    # In real life, 'current' would be yesterday's live API traffic
+    half = len(df) // 2
+    reference_data = df.iloc[:half] # First half
+    current_data = df.iloc[half:]   # Second half
+
+    # 3. Sketch-based drift metrics (milliseconds, same engine as the API's /drift)
+    monitor = DriftMonitor.from_reference(reference_data)
+    monitor.update_frame(current_data)
+    report = monitor.report()
+    for col, metrics in report["features"].items():
+        ks = f"{metrics['ks']:.3f}" if metrics["ks"] is not None else "  -  "
+        print(f"   - {col:<18} PSI={metrics['psi']:.4f} ({psi_band(metrics['psi'])}) "
+              f"KS={ks} JS={metrics['js']:.4f}")
+
+    # 4. Optional slow path: Evidently HTML report + test suite
+    failed_tests = generate_html_report(reference_data, current_data) if html else 0
+
+    if report["drifted"] or failed_tests > 0:
+        print(f"⚠️  WARNING: Data Drift Detected! {report['drifted']}")
     else:
         print("🟢  System Healthy. No significant drift.")
+    return report
 
 if __name__ == "__main__":
-    generate_drift_report()
\ No newline at end of file
+    generate_drift_report(html="--html" in sys.argv[1:])
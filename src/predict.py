@@ -1,11 +1,27 @@
-import mlflow.xgboost
-import pandas as pd
 import sys
 import os
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.features import CreditRiskFeatures
+from src.features import CreditRiskFeatures, WOE_ARTIFACT
+from src.serving import FastScorer
+from src.model_store import best_run_id, load_promoted, read_manifest
+
+def load_feature_engine(run_id):
+    """
+    Loads the WoE tables logged next to the model by src/train.py.
+    Runs logged before the tables existed get a blank engineer (categoricals -> 0).
+    """
+    import mlflow
+
+    try:
+        local_path = mlflow.artifacts.download_artifacts(
+            artifact_uri=f"runs:/{run_id}/model/{WOE_ARTIFACT}"
+        )
+        return CreditRiskFeatures.load(local_path)
+    except Exception as e:
+        print(f"⚠️  No WoE tables found for run {run_id}, categoricals will be zeroed. ({e})")
+        return CreditRiskFeatures()
 
 class CreditScorer:
     def __init__(self):
@@ -14,28 +30,31 @@ class CreditScorer:
 
     def load_latest_model(self):
         """
-        Automatically finds the best model from MLflow.
-        In production, you'd use a specific 'Production' tag.
+        Loads the promoted model from the local manifest (see src/model_store.py).
+        Falls back to finding the best model in MLflow if nothing was promoted.
         """
+        manifest = read_manifest()
+        if manifest:
+            print(f"📦 Loading promoted model v{manifest['version']} (Run ID: {manifest['run_id']})...")
+            self.model, self.engineer, _ = load_promoted(manifest=manifest)
+            self.scorer = FastScorer(self.model, self.engineer)
+            return
+
         print("🔎 Searching for best model in MLflow...")
+        # Only this fallback needs the tracking client; the promoted path above never loads it
+        import mlflow.xgboost
+
         try:
-            # Find the best run based on AUC
-            experiment = mlflow.get_experiment_by_name("Sentinel_Credit_Risk_Engine")
-            runs = mlflow.search_runs(
-                experiment_ids=[experiment.experiment_id],
-                order_by=["metrics.auc DESC"],
-                max_results=1
-            )
+            # The best-AUC run that logged a model (tuning trials log metrics only)
+            run_id = best_run_id()
+            model_uri = f"runs:/{run_id}/model"
             
-            best_run_id = runs.iloc[0].run_id
-            model_uri = f"runs:/{best_run_id}/model"
-            
-            print(f"   🏆 Loading Best Model (Run ID: {best_run_id})...")
+            print(f"   🏆 Loading Best Model (Run ID: {run_id})...")
             self.model = mlflow.xgboost.load_model(model_uri)
             
-            # NOTE: In a real system, we would also load the saved WoE mappings here.
-            # For this demo, we will re-initialize the feature engine logic.
-            self.engineer = CreditRiskFeatures()
+            # Load the WoE tables fitted during training
+            self.engineer = load_feature_engine(run_id)
+            self.scorer = FastScorer(self.model, self.engineer)
             
         except Exception as e:
             print(f"❌ Error loading model: {e}")
@@ -45,19 +64,26 @@ class CreditScorer:
         """
         Accepts dictionary inputs, transforms them, and predicts risk.
         """
-        # 1. Convert dict to DataFrame
-        df = pd.DataFrame([input_data])
-        
-        # 2. Apply Feature Engineering (WoE)
-        # In a full prod system, we would apply the *saved* mappings from training.
-        # Here, we assume raw data for simplicity or re-fit logic.
-        # Ideally: df_processed = self.engineer.transform(df)
-        
-        # For this demo, we verify structure match (DataOps validation)
-        # We convert the raw dict directly to DMatrix for XGBoost if columns match
-        # OR we assume the input is already pre-processed features.
-        
-        # Let's do a direct prediction assuming pre-processed input for stability in this step
-        # (To fix this fully requires saving the 'engineer' object in train.py)
-        
-        return self.model.predict_proba(df)[:, 1][0] # Return probability of Default
\ No newline at end of file
+        # Fields are written straight into a preallocated buffer in the model's column
+        # order and WoE-encoded on the way (see src/serving.py); no DataFrame is built.
+        return self.scorer.score_one(input_data) # Return probability of Default
+
+if __name__ == "__main__":
+    import argparse
+    from src.batch_scoring import BATCH_CHUNK_ROWS, BATCH_WORKERS, score_file
+    from src.model_store import MODEL_STORE_DIR
+
+    parser = argparse.ArgumentParser(description="Sentinel credit risk scoring")
+    commands = parser.add_subparsers(dest="command", required=True)
+    batch = commands.add_parser("batch", help="Score a CSV / Parquet / Arrow dataset with the promoted model")
+    batch.add_argument("input", help="CSV file, Parquet dataset directory or Arrow file")
+    batch.add_argument("output", help="Output .parquet or .csv file")
+    batch.add_argument("--chunk-rows", type=int, default=BATCH_CHUNK_ROWS)
+    batch.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    batch.add_argument("--id-cols", nargs="*", default=[], help="Input columns copied next to the score")
+    batch.add_argument("--store-dir", default=MODEL_STORE_DIR)
+    args = parser.parse_args()
+
+    if args.command == "batch":
+        score_file(args.input, args.output, chunk_rows=args.chunk_rows, workers=args.workers,
+                   id_cols=args.id_cols, store_dir=args.store_dir)
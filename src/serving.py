@@ -0,0 +1,242 @@
+from bisect import bisect_right
+import functools
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from src.compiled_trees import compile_booster
+
+# Predictor behind FastScorer: "xgboost" (Booster.inplace_predict) or "compiled" (the
+# NumPy evaluator of src/compiled_trees.py, faster for small batches only)
+SCORER_ENGINE = os.getenv("SCORER_ENGINE", "xgboost")
+# Chunks above this many rows go to inplace_predict even with the compiled engine
+COMPILED_MAX_ROWS = int(os.getenv("COMPILED_MAX_ROWS", "64"))
+
+def prepare_features(df, engineer, feature_names):
+    """Applies the fitted WoE tables and aligns columns with the model's schema."""
+    df_processed = engineer.transform(df).reindex(columns=feature_names, fill_value=0)
+    # Values that are not numbers (categoricals without a WoE table, None, NaN) fall back
+    # to 0, the WoE of an unseen category; FeatureLayout.write_row applies the same rule
+    for col in df_processed.select_dtypes(exclude='number').columns:
+        df_processed[col] = pd.to_numeric(df_processed[col], errors='coerce')
+    return df_processed.fillna(0)
+
+class FeatureLayout:
+    """
+    Precompiled mapping from application fields to the model's feature vector.
+
+    Column order comes from the booster's feature_names. Categorical slots carry a
+    {category: woe} dict compiled once from the fitted WoE tables, and binned numeric
+    slots their (edges, woe) lists, so writing a row is a handful of dict lookups,
+    bisects and float stores, with no pandas involved. Raw fields and WoE-encoded
+    fields are written by two passes (write_fields, write_woe) so they can be timed apart.
+    """
+
+    def __init__(self, feature_names, engineer):
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+        self.field_slots = []
+        self.woe_slots = []
+        for i, name in enumerate(self.feature_names):
+            table = engineer.woe_tables.get(name)
+            if table is not None:
+                categories, lookup = table
+                self.woe_slots.append((i, name, dict(zip(categories.tolist(), lookup[:-1].tolist())), None))
+            elif name in engineer.numeric_bins:
+                edges, lookup = engineer.numeric_bins[name]
+                self.woe_slots.append((i, name, None, (edges.tolist(), lookup[:-1].tolist())))
+            else:
+                self.field_slots.append((i, name))
+
+    def write_row(self, row, record):
+        """
+        Writes one application (a mapping of field -> raw value) into `row` in place.
+        Missing fields, unseen categories and values that are not numbers become 0,
+        as in prepare_features.
+        """
+        self.write_fields(row, record)
+        self.write_woe(row, record)
+
+    def write_fields(self, row, record):
+        """The raw slots of write_row: numeric fields copied as they are."""
+        for i, name in self.field_slots:
+            value = record.get(name, 0)
+            if value.__class__ is not int:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):  # None, or a categorical without a fitted table
+                    value = 0.0
+                if value != value:
+                    value = 0.0
+            row[i] = value
+
+    def write_woe(self, row, record):
+        """The WoE-encoded slots of write_row: categorical and binned numeric fields."""
+        for i, name, woe, bins in self.woe_slots:
+            if woe is not None:
+                row[i] = woe.get(record.get(name, 0), 0.0)
+            else:
+                # Same bin as np.searchsorted(edges, value, 'right'); missing values are neutral
+                value = record.get(name)
+                row[i] = 0.0 if value is None or value != value else bins[1][bisect_right(bins[0], value)]
+
+class FastScorer:
+    """
+    Scores applications through a FeatureLayout and Booster.inplace_predict.
+
+    Each thread owns one preallocated float32 buffer of `max_batch_size` rows that
+    is reused by every call, so the hot path allocates no DataFrame or DMatrix.
+    With engine="compiled", chunks of up to COMPILED_MAX_ROWS rows are scored by the
+    compiled NumPy evaluator instead (boosters it cannot compile keep inplace_predict).
+    `observe(seconds, stage)`, if given, receives the "features" (raw field assembly),
+    "woe_transform" and "predict" timings.
+    """
+
+    def __init__(self, booster, engineer, max_batch_size=64, engine=SCORER_ENGINE, observe=None):
+        self.booster = booster
+        self.engineer = engineer
+        self.layout = FeatureLayout(booster.feature_names, engineer)
+        self.max_batch_size = max_batch_size
+        self.observe = observe
+        self._local = threading.local()
+        self.compiled = None
+        if engine == "compiled":
+            try:
+                self.compiled = compile_booster(booster)
+            except ValueError as e:
+                print(f"⚠️  Compiled engine unavailable, using inplace_predict. ({e})")
+
+    def _predict(self, X):
+        if self.compiled is not None and len(X) <= COMPILED_MAX_ROWS:
+            return self.compiled.predict(X)
+        return self.booster.inplace_predict(X)
+
+    def _views(self):
+        """Per-thread (row views, leading-rows views) over the preallocated buffer."""
+        views = getattr(self._local, "views", None)
+        if views is None:
+            buffer = np.zeros((self.max_batch_size, self.layout.n_features), dtype=np.float32)
+            rows = [buffer[j] for j in range(self.max_batch_size)]
+            heads = [buffer[:k] for k in range(self.max_batch_size + 1)]
+            views = self._local.views = (rows, heads)
+        return views
+
+    def encode(self, record):
+        """The feature row the model would see for one application, as bytes."""
+        rows, _ = self._views()
+        self.layout.write_row(rows[0], record)
+        return rows[0].tobytes()
+
+    def score_one(self, record):
+        """Returns the probability of default for one application mapping."""
+        rows, heads = self._views()
+        if self.observe is None:
+            self.layout.write_row(rows[0], record)
+            return float(self._predict(heads[1])[0])
+        start = time.perf_counter()
+        self.layout.write_fields(rows[0], record)
+        assembled = time.perf_counter()
+        self.layout.write_woe(rows[0], record)
+        encoded = time.perf_counter()
+        prob = float(self._predict(heads[1])[0])
+        self.observe(assembled - start, "features")
+        self.observe(encoded - assembled, "woe_transform")
+        self.observe(time.perf_counter() - encoded, "predict")
+        return prob
+
+    def score_many(self, records):
+        """Scores a list of application mappings in buffer-sized chunks."""
+        rows, heads = self._views()
+        probs = np.empty(len(records), dtype=np.float32)
+        features_seconds = woe_seconds = predict_seconds = 0.0
+        write_fields, write_woe = self.layout.write_fields, self.layout.write_woe
+        for start in range(0, len(records), self.max_batch_size):
+            chunk = records[start:start + self.max_batch_size]
+            t0 = time.perf_counter()
+            for j, record in enumerate(chunk):
+                write_fields(rows[j], record)
+            t1 = time.perf_counter()
+            for j, record in enumerate(chunk):
+                write_woe(rows[j], record)
+            t2 = time.perf_counter()
+            probs[start:start + len(chunk)] = self._predict(heads[len(chunk)])
+            features_seconds += t1 - t0
+            woe_seconds += t2 - t1
+            predict_seconds += time.perf_counter() - t2
+        if self.observe is not None:
+            self.observe(features_seconds, "features")
+            self.observe(woe_seconds, "woe_transform")
+            self.observe(predict_seconds, "predict")
+        return probs
+
+class ModelBundle:
+    """
+    Everything one model version needs to score: the model, its WoE engineer and the
+    compiled scorer. A bundle is never modified after construction, so replacing the
+    one reference that points at it swaps the whole model atomically.
+    """
+
+    def __init__(self, model, engineer, version=None, manifest=None, max_batch_size=64, observe=None):
+        self.model = model
+        self.engineer = engineer
+        self.version = version
+        self.manifest = manifest
+        self.observe = observe
+        if hasattr(model, "feature_names"):
+            self.feature_names = model.feature_names
+        else:
+            self.feature_names = list(model.feature_names_in_)
+        # Boosters take the fast path; other estimators go through pandas
+        self.scorer = None
+        if isinstance(model, xgb.Booster):
+            self.scorer = FastScorer(model, engineer, max_batch_size=max_batch_size, observe=observe)
+
+    def score_many(self, records):
+        """Scores a list of application mappings (field -> raw value)."""
+        if self.scorer is not None:
+            return self.scorer.score_many(records)
+        start = time.perf_counter()
+        df_input = pd.DataFrame(records)
+        assembled = time.perf_counter()
+        df_input = prepare_features(df_input, self.engineer, self.feature_names)
+        encoded = time.perf_counter()
+        probs = self.model.predict_proba(df_input)[:, 1]
+        if self.observe is not None:
+            self.observe(assembled - start, "features")
+            self.observe(encoded - assembled, "woe_transform")
+            self.observe(time.perf_counter() - encoded, "predict")
+        return probs
+
+    def score_one(self, record):
+        if self.scorer is not None:
+            return self.scorer.score_one(record)
+        return float(self.score_many([record])[0])
+
+    @functools.cached_property
+    def explainer(self):
+        """TreeSHAP reason codes (src/explain.py) for boosters, built on first use."""
+        if not isinstance(self.model, xgb.Booster):
+            return None
+        from src.explain import Explainer
+        return Explainer(self.model, self.engineer)
+
+    def feature_key(self, record):
+        """Canonical bytes of an application's model input (see app/cache.py)."""
+        if self.scorer is not None:
+            return self.scorer.encode(record)
+        return repr(sorted(record.items())).encode()
+
+    def warm_up(self, n_rows=256):
+        """Scores a synthetic batch so lazy initialisation happens before real traffic."""
+        from src.synthetic import make_credit_frame
+
+        records = make_credit_frame(n_rows, seed=0).drop(columns=['target']).to_dict('records')
+        self.score_many(records)
+        for record in records[:8]:
+            self.score_one(record)
+        if self.explainer is not None:
+            self.explainer.explain_records(records[:8])
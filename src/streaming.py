@@ -0,0 +1,94 @@
+import os
+import sys
+
+import numpy as np
+import xgboost as xgb
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.datastore import iter_chunks
+from src.features import CreditRiskFeatures
+
+# Rows per chunk; peak memory of the streaming pipeline scales with this, not the file size
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "100000"))
+
+def fit_woe_streaming(path, target_col='target', chunksize=STREAM_CHUNK_ROWS):
+    """Pass 1: accumulates WoE counts chunk by chunk and returns the fitted engineer."""
+    print(f"⏳ Pass 1/2: counting WoE statistics in chunks of {chunksize} rows...")
+    engineer = CreditRiskFeatures()
+    for chunk in iter_chunks(path, chunksize):
+        engineer.partial_fit(chunk, target_col=target_col)
+    return engineer.finalize_fit()
+
+def write_encoded_chunks(path, engineer, cache_dir, target_col='target',
+                         chunksize=STREAM_CHUNK_ROWS, test_size=0.2, seed=42):
+    """
+    Pass 2: WoE-encodes each chunk and writes it to cache_dir as float32 .npy files,
+    split into train/test with a per-chunk seeded mask (reproducible for a given chunksize).
+    Returns (feature_names, train_files, test_files) with files as (X_path, y_path) pairs.
+    """
+    print("⏳ Pass 2/2: writing WoE-encoded chunks...")
+    os.makedirs(cache_dir, exist_ok=True)
+    feature_names, files = None, {"train": [], "test": []}
+
+    for i, chunk in enumerate(iter_chunks(path, chunksize)):
+        encoded = engineer.transform(chunk)
+        y = encoded.pop(target_col).to_numpy(dtype=np.float32)
+        feature_names = list(encoded.columns)
+        X = encoded.to_numpy(dtype=np.float32)
+
+        is_test = np.random.default_rng([seed, i]).random(len(X)) < test_size
+        for split, mask in (("train", ~is_test), ("test", is_test)):
+            X_path = os.path.join(cache_dir, f"{split}_X_{i:05d}.npy")
+            y_path = os.path.join(cache_dir, f"{split}_y_{i:05d}.npy")
+            np.save(X_path, X[mask])
+            np.save(y_path, y[mask])
+            files[split].append((X_path, y_path))
+
+    return feature_names, files["train"], files["test"]
+
+class ChunkIter(xgb.DataIter):
+    """Feeds the encoded .npy chunks to XGBoost one at a time (memory-mapped)."""
+
+    def __init__(self, files, feature_names, cache_prefix=None):
+        self._files = files
+        self._feature_names = feature_names
+        self._it = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        if self._it == len(self._files):
+            return False
+        X_path, y_path = self._files[self._it]
+        input_data(
+            data=np.load(X_path, mmap_mode='r'),
+            label=np.load(y_path),
+            feature_names=self._feature_names,
+        )
+        self._it += 1
+        return True
+
+    def reset(self):
+        self._it = 0
+
+def build_train_matrix(train_files, feature_names, cache_dir, external_memory=False):
+    """
+    Builds the training matrix from the chunk iterator without concatenating raw chunks.
+    QuantileDMatrix keeps only the quantized data (1 byte per value with the default
+    256 bins); external_memory=True pages it through disk instead.
+    """
+    if external_memory:
+        it = ChunkIter(train_files, feature_names, cache_prefix=os.path.join(cache_dir, "xgb_cache"))
+        return xgb.DMatrix(it)
+    return xgb.QuantileDMatrix(ChunkIter(train_files, feature_names))
+
+def evaluate_chunks(model, test_files):
+    """Scores the test chunks one at a time and returns (auc, accuracy)."""
+    from sklearn.metrics import roc_auc_score, accuracy_score
+
+    probs, labels = [], []
+    for X_path, y_path in test_files:
+        probs.append(model.inplace_predict(np.load(X_path, mmap_mode='r')))
+        labels.append(np.load(y_path))
+    preds_prob, actual = np.concatenate(probs), np.concatenate(labels)
+    return roc_auc_score(actual, preds_prob), accuracy_score(actual, preds_prob > 0.5)
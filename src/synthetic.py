@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+# Category codes of the UCI German Credit dataset (see src/ingest.py for column order)
+CATEGORICAL_LEVELS = {
+    "checkin_acc": ["A11", "A12", "A13", "A14"],
+    "credit_history": ["A30", "A31", "A32", "A33", "A34"],
+    "purpose": ["A40", "A41", "A42", "A43", "A44", "A45", "A46", "A48", "A49", "A410"],
+    "saving_acc": ["A61", "A62", "A63", "A64", "A65"],
+    "present_emp_since": ["A71", "A72", "A73", "A74", "A75"],
+    "personal_status": ["A91", "A92", "A93", "A94"],
+    "other_debtors": ["A101", "A102", "A103"],
+    "property": ["A121", "A122", "A123", "A124"],
+    "inst_plans": ["A141", "A142", "A143"],
+    "housing": ["A151", "A152", "A153"],
+    "job": ["A171", "A172", "A173", "A174"],
+    "telephone": ["A191", "A192"],
+    "foreign_worker": ["A201", "A202"],
+}
+
+# (low, high) inclusive ranges of the integer columns in the real data
+NUMERIC_RANGES = {
+    "duration": (4, 72),
+    "amount": (250, 18424),
+    "installment_rate": (1, 4),
+    "residing_since": (1, 4),
+    "age": (19, 75),
+    "num_credits": (1, 4),
+    "dependents": (1, 2),
+}
+
+FEATURE_COLUMNS = [
+    "checkin_acc", "duration", "credit_history", "purpose", "amount",
+    "saving_acc", "present_emp_since", "installment_rate", "personal_status",
+    "other_debtors", "residing_since", "property", "age", "inst_plans",
+    "housing", "num_credits", "job", "dependents", "telephone", "foreign_worker",
+]
+
+
+def make_credit_frame(n_rows, seed=42, bad_rate=0.3, extra_cardinality=None):
+    """
+    Generates a German-Credit-shaped DataFrame with a learnable 'target'.
+    extra_cardinality adds a high-cardinality 'merchant' column (e.g. 10_000 levels)
+    to mimic production fields such as merchant or postcode.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    risk = np.zeros(n_rows)
+
+    for col in FEATURE_COLUMNS:
+        if col in CATEGORICAL_LEVELS:
+            levels = np.array(CATEGORICAL_LEVELS[col], dtype=object)
+            codes = rng.integers(0, len(levels), size=n_rows)
+            data[col] = levels[codes]
+            # Each level shifts the log-odds a little so WoE/IV carry real signal
+            risk += rng.normal(0, 0.4, size=len(levels))[codes]
+        else:
+            low, high = NUMERIC_RANGES[col]
+            values = rng.integers(low, high + 1, size=n_rows)
+            data[col] = values
+            risk += 0.5 * (values - low) / (high - low)
+
+    if extra_cardinality:
+        codes = rng.integers(0, extra_cardinality, size=n_rows)
+        levels = np.array([f"M{i}" for i in range(extra_cardinality)], dtype=object)
+        data["merchant"] = levels[codes]
+        risk += rng.normal(0, 0.4, size=extra_cardinality)[codes]
+
+    # Calibrate the intercept so the default rate is close to bad_rate
+    risk = risk - np.quantile(risk, 1 - bad_rate)
+    prob = 1 / (1 + np.exp(-4 * risk))
+    data["target"] = (rng.random(n_rows) < prob).astype(np.int64)
+
+    return pd.DataFrame(data)
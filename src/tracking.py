@@ -0,0 +1,162 @@
+"""
+Buffered MLflow logging for Optuna trials.
+
+Every trial used to open a nested run with mlflow.start_run and write each param,
+metric and tag with its own call: against the file store that is a handful of
+small files per call, written while the trial holds a worker. Here a trial only
+fills a TrialRun in memory. When it closes, the run goes on a queue and a
+background thread (or the trial itself, TRACKING_ASYNC=0) writes it: create_run,
+log_batch (chunked to MLflow's per-call limits), optional artifacts and set_terminated. Metric timestamps and the run's
+start/end times are taken when the trial logs them, not when they are written.
+
+Per-trial artifacts (the trial's booster) are skipped unless
+TRACKING_TRIAL_ARTIFACTS=1: the winning parameters are refitted anyway.
+"""
+import collections
+import os
+import tempfile
+import threading
+import time
+
+import mlflow
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
+
+# Config
+TRACKING_FLUSH_SECONDS = float(os.getenv("TRACKING_FLUSH_SECONDS", "1.0"))
+# 0: write each run when its trial ends (still one log_batch instead of a call per value).
+# The writer thread needs a spare core: on one core it only competes with the trial for the GIL.
+TRACKING_ASYNC = os.getenv("TRACKING_ASYNC", "1" if (os.cpu_count() or 1) > 1 else "0") == "1"
+TRACKING_TRIAL_ARTIFACTS = os.getenv("TRACKING_TRIAL_ARTIFACTS", "0") == "1"
+# MLflow's log_batch limits per request
+MAX_BATCH_METRICS = 1000
+MAX_BATCH_PARAMS = 100
+MAX_BATCH_TAGS = 100
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+class TrialRun:
+    """In-memory params, metrics, tags and artifacts of one nested run."""
+
+    def __init__(self, logger, parent_run_id=None, run_name=None):
+        self.logger = logger
+        self.params = {}
+        self.metrics = []
+        self.tags = {"mlflow.parentRunId": parent_run_id} if parent_run_id else {}
+        if run_name:
+            self.tags["mlflow.runName"] = run_name
+        self.artifacts = {}  # file name -> bytes
+        self.status = "RUNNING"
+        self.start_time = _now_ms()
+        self.end_time = None
+
+    def log_params(self, params):
+        self.params.update({key: str(value) for key, value in params.items()})
+
+    def log_metric(self, key, value, step=0):
+        self.metrics.append(Metric(key, float(value), _now_ms(), step))
+
+    def set_tag(self, key, value):
+        self.tags[key] = str(value)
+
+    def log_artifact(self, name, data):
+        """Kept only if the logger writes artifacts (TRACKING_TRIAL_ARTIFACTS)."""
+        if self.logger.artifacts:
+            self.artifacts[name] = data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # optuna.TrialPruned is raised after the run closes, so any exception here is a failure
+        self.status = "FAILED" if exc_type else "FINISHED"
+        self.end_time = _now_ms()
+        self.logger.submit(self)
+        return False
+
+class BatchLogger:
+    """
+    Writes closed TrialRuns to MLflow from a daemon thread (start/stop), or inline
+    when `background` is off. Thread-safe: trials in worker threads only append.
+    """
+
+    def __init__(self, experiment_id=None, background=TRACKING_ASYNC,
+                 artifacts=TRACKING_TRIAL_ARTIFACTS, client=None):
+        # The experiment selected with mlflow.set_experiment, resolved in the caller's thread
+        self.experiment_id = experiment_id or mlflow.tracking.fluent._get_experiment_id()
+        self.background = background
+        self.artifacts = artifacts
+        self.client = client or MlflowClient()
+        self._pending = collections.deque()  # unbounded: tracking data is never dropped
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.written = 0
+
+    def run(self, parent_run_id=None, run_name=None):
+        return TrialRun(self, parent_run_id, run_name)
+
+    def submit(self, run):
+        self._pending.append(run)
+        if not self.background:
+            self.flush()
+
+    def flush(self):
+        """Writes every queued run; returns how many were written."""
+        written = 0
+        with self._flush_lock:  # a final flush from stop() may race the thread's last one
+            while True:
+                try:
+                    run = self._pending.popleft()
+                except IndexError:
+                    break
+                try:
+                    self._write(run)
+                    written += 1
+                except Exception as e:
+                    print(f"⚠️  MLflow logging failed for a trial run: {e}")
+            self.written += written
+        return written
+
+    def _write(self, run):
+        run_id = self.client.create_run(self.experiment_id, start_time=run.start_time).info.run_id
+        params = [Param(key, value) for key, value in run.params.items()]
+        tags = [RunTag(key, value) for key, value in run.tags.items()]
+        metrics = run.metrics
+        while params or tags or metrics:
+            self.client.log_batch(run_id, metrics=metrics[:MAX_BATCH_METRICS],
+                                  params=params[:MAX_BATCH_PARAMS], tags=tags[:MAX_BATCH_TAGS])
+            metrics = metrics[MAX_BATCH_METRICS:]
+            params = params[MAX_BATCH_PARAMS:]
+            tags = tags[MAX_BATCH_TAGS:]
+        if run.artifacts:
+            with tempfile.TemporaryDirectory() as tmp:
+                for name, data in run.artifacts.items():
+                    path = os.path.join(tmp, name)
+                    with open(path, "wb") as f:
+                        f.write(data)
+                    self.client.log_artifact(run_id, path)
+        self.client.set_terminated(run_id, run.status, end_time=run.end_time)
+
+    def start(self, interval=TRACKING_FLUSH_SECONDS):
+        """Writes the queue from a daemon thread every `interval` seconds (no-op if not background)."""
+        if not self.background:
+            return self
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.flush()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name="mlflow-batch-logger", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the thread and writes whatever is still queued."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
@@ -1,51 +1,130 @@
-import pandas as pd
 import numpy as np
 import xgboost as xgb
 import mlflow
 import mlflow.xgboost
-import optuna
 import sys
 import os
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import roc_auc_score, accuracy_score, classification_report
+import tempfile
 
 # Add project root to system path so we can import src modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.features import CreditRiskFeatures
+from src.features import CreditRiskFeatures, WOE_ARTIFACT
+from src import cv, streaming, tracking
+from src.compact import CompactMatrix
+from src.datastore import load_dataset
 
 # Config
-DATA_PATH = "data/raw/german_credit_data.csv"
+DATA_PATH = os.getenv("SENTINEL_DATA_PATH")  # default: Parquet from ingest, else the raw CSV
 MLFLOW_EXPERIMENT_NAME = "Sentinel_Credit_Risk_Engine"
 
-def load_and_process_data():
-    """Loads raw data and applies WoE transformation."""
+# AutoML config
+OPTUNA_N_TRIALS = int(os.getenv("OPTUNA_N_TRIALS", "10"))
+OPTUNA_N_JOBS = int(os.getenv("OPTUNA_N_JOBS", str(os.cpu_count() or 1)))  # trials in parallel
+# e.g. sqlite:///optuna.db lets several `train.py auto` processes share one study
+OPTUNA_STORAGE = os.getenv("OPTUNA_STORAGE")
+OPTUNA_STUDY_NAME = "sentinel_xgb_tuning"
+TUNING_BOOST_ROUNDS = 100
+
+# K-fold CV for model selection (src/cv.py): 0 keeps the single holdout split. With k folds
+# the manual run also logs the k-fold AUC and each Optuna trial is scored by its k-fold AUC.
+TRAIN_CV_FOLDS = int(os.getenv("TRAIN_CV_FOLDS", "0"))
+
+# Keep the encoded features as a CompactMatrix (src/compact.py): uint8/uint16 codes plus
+# per-column WoE tables instead of a float64 DataFrame, decoded batch by batch for XGBoost
+TRAIN_COMPACT = os.getenv("TRAIN_COMPACT", "0") == "1"
+
+# Streaming mode: set STREAM_EXTERNAL_MEMORY=1 to page the training matrix through disk
+STREAM_CACHE_DIR = os.getenv("STREAM_CACHE_DIR")  # default: a temporary directory
+STREAM_EXTERNAL_MEMORY = os.getenv("STREAM_EXTERNAL_MEMORY", "0") == "1"
+
+# Hardcoded params (The "Old Way"), shared by the manual and streaming modes
+MANUAL_PARAMS = {
+    "max_depth": 4,
+    "eta": 0.1,
+    "objective": "binary:logistic",
+    "eval_metric": "auc"
+}
+
+def load_and_process_data(df=None, compact=TRAIN_COMPACT):
+    """
+    Loads raw data and applies WoE transformation. Also returns the fitted engineer.
+    With compact=True, X_train / X_test are CompactMatrix objects (same rows as the DataFrame split).
+    """
     print("⏳ Loading and processing data...")
-    df = pd.read_csv(DATA_PATH)
-    
+    if df is None:
+        df = load_dataset(DATA_PATH)
+    from sklearn.model_selection import train_test_split
+
     # Initialize your Feature Engine from Phase 1
     engineer = CreditRiskFeatures()
+    if compact:
+        # Codes straight from the raw data: the float64 WoE frame is never built
+        engineer.fit(df, target_col='target')
+        X, y = CompactMatrix.from_frame(df, engineer), df['target'].to_numpy()
+        train_index, test_index = train_test_split(np.arange(len(y)), test_size=0.2, random_state=42)
+        print(f"   🗜️  Compact features: {X.nbytes / 1e6:.1f} MB")
+        return X.take(train_index), X.take(test_index), y[train_index], y[test_index], engineer
+
     df_processed = engineer.fit_transform(df, target_col='target')
     
     # Split
+
     X = df_processed.drop(columns=['target'])
     y = df_processed['target']
     
-    return train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    return X_train, X_test, y_train, y_test, engineer
+
+def log_feature_engine(engineer, artifact_path="model"):
+    """Logs the fitted WoE tables next to the model so inference can reuse them."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        local_path = engineer.save(os.path.join(tmp_dir, WOE_ARTIFACT))
+        mlflow.log_artifact(local_path, artifact_path=artifact_path)
+
+def train_streaming(data_path, cache_dir, params=MANUAL_PARAMS, num_boost_round=100,
+                    external_memory=STREAM_EXTERNAL_MEMORY, chunksize=streaming.STREAM_CHUNK_ROWS):
+    """
+    Out-of-core counterpart of load_and_process_data + xgb.train: two chunked passes over
+    the CSV (WoE counts, then encoded chunks on disk) and training from a chunk iterator.
+    Returns (model, engineer, auc, acc).
+    """
+    engineer = streaming.fit_woe_streaming(data_path, chunksize=chunksize)
+    feature_names, train_files, test_files = streaming.write_encoded_chunks(
+        data_path, engineer, cache_dir, chunksize=chunksize
+    )
+    dtrain = streaming.build_train_matrix(train_files, feature_names, cache_dir, external_memory)
+    model = xgb.train(params, dtrain, num_boost_round=num_boost_round)
+    auc, acc = streaming.evaluate_chunks(model, test_files)
+    return model, engineer, auc, acc
 
 def eval_metrics(actual, pred_prob, pred_label):
     """Computes standard Credit Risk metrics."""
+    from sklearn.metrics import roc_auc_score, accuracy_score
+
     auc = roc_auc_score(actual, pred_prob)
     acc = accuracy_score(actual, pred_label)
     return auc, acc
 
-def objective(trial, X_train, y_train, X_test, y_test):
-    """
-    Optuna Objective Function:
-    The AI suggests parameters, we train, and return the score.
-    """
-    # 1. Suggest Hyperparameters
-    param = {
+class OptunaPruningCallback(xgb.callback.TrainingCallback):
+    """Reports the per-iteration validation AUC to Optuna and stops unpromising trials early."""
+
+    def __init__(self, trial, data_name="test", metric="auc"):
+        self.trial = trial
+        self.data_name = data_name
+        self.metric = metric
+        self.pruned_at = None
+
+    def after_iteration(self, model, epoch, evals_log):
+        self.trial.report(evals_log[self.data_name][self.metric][-1], epoch)
+        if self.trial.should_prune():
+            self.pruned_at = epoch
+            return True  # stop training
+        return False
+
+def suggest_params(trial):
+    """The XGBoost search space of the Optuna study."""
+    return {
         'objective': 'binary:logistic',
         'eval_metric': 'auc',
         'booster': 'gbtree',
@@ -57,30 +136,125 @@ def objective(trial, X_train, y_train, X_test, y_test):
         'grow_policy': trial.suggest_categorical('grow_policy', ['depthwise', 'lossguide'])
     }
 
-    # 2. Train Model
-    dtrain = xgb.DMatrix(X_train, label=y_train)
+def objective(trial, dtrain, dtest, parent_run_id=None, nthread=None, tracker=None):
+    """
+    Optuna Objective Function:
+    The AI suggests parameters, we train, and return the score.
+    dtrain/dtest are built once and shared by every trial (and thread).
+    The trial's run is buffered and written by `tracker` (src/tracking.py).
+    """
+    # 1. Suggest Hyperparameters
+    param = suggest_params(trial)
+    if nthread:
+        param['nthread'] = nthread
+
+    # We use a nested MLflow run for each trial to keep things organized.
+    # The parent is passed explicitly because trials may run in worker threads.
+    tracker = tracker or tracking.BatchLogger(background=False)
+    with tracker.run(parent_run_id) as run:
+        # 2. Train Model (the callback prunes on the per-iteration test AUC)
+        pruning = OptunaPruningCallback(trial)
+        model = xgb.train(
+            param, dtrain, num_boost_round=TUNING_BOOST_ROUNDS,
+            evals=[(dtest, "test")], callbacks=[pruning], verbose_eval=False
+        )
+        run.log_params(param)
+
+        if pruning.pruned_at is not None:
+            run.set_tag("optuna.pruned_at", pruning.pruned_at)
+        else:
+            # 3. Evaluate
+            y_test = dtest.get_label()
+            preds_prob = model.predict(dtest)
+            preds_label = (preds_prob > 0.5).astype(int)
+            auc, acc = eval_metrics(y_test, preds_prob, preds_label)
+
+            # 4. Log to MLflow
+            run.log_metric("auc", auc)
+            run.log_metric("accuracy", acc)
+            run.log_artifact("model.json", bytes(model.save_raw("json")))
+
+    if pruning.pruned_at is not None:
+        import optuna
+        raise optuna.TrialPruned(f"Pruned at iteration {pruning.pruned_at}")
+
+    # Tell Optuna how good this model was
+    return auc
+
+def cv_objective(trial, folds, parent_run_id=None, nthread=None, n_jobs=cv.CV_JOBS, tracker=None):
+    """
+    Optuna objective scored by the k-fold AUC: the cached fold matrices (src/cv.py) are
+    shared by every trial, each trial trains its folds in parallel.
+    """
+    param = suggest_params(trial)
+    tracker = tracker or tracking.BatchLogger(background=False)
+    with tracker.run(parent_run_id) as run:
+        result = cv.cross_validate(folds, param, num_boost_round=TUNING_BOOST_ROUNDS,
+                                   n_jobs=n_jobs, nthread=nthread)
+        run.log_params(param)
+        run.log_metric("auc", result["auc_mean"])
+        run.log_metric("auc_std", result["auc_std"])
+    return result["auc_mean"]
+
+def build_tuning_matrices(X_train, y_train, X_test, y_test):
+    """
+    Builds the matrices once for all trials. The training data is quantized up front
+    (QuantileDMatrix), so concurrent trials never race to build the histogram index.
+    The test set stays a plain DMatrix: evaluating on it every iteration is cheaper.
+    CompactMatrix inputs are decoded batch by batch into the QuantileDMatrix.
+    """
+    if isinstance(X_train, CompactMatrix):
+        return X_train.quantile_dmatrix(label=y_train), X_test.dmatrix(label=y_test)
+    dtrain = xgb.QuantileDMatrix(X_train, label=y_train)
     dtest = xgb.DMatrix(X_test, label=y_test)
-    
-    # We use a nested MLflow run for each trial to keep things organized
-    with mlflow.start_run(nested=True):
-        model = xgb.train(param, dtrain)
-        
-        # 3. Evaluate
-        preds_prob = model.predict(dtest)
-        preds_label = [1 if x > 0.5 else 0 for x in preds_prob]
-        auc, acc = eval_metrics(y_test, preds_prob, preds_label)
-        
-        # 4. Log to MLflow
-        mlflow.log_params(param)
-        mlflow.log_metric("auc", auc)
-        mlflow.log_metric("accuracy", acc)
-        
-        # Tell Optuna how good this model was
-        return auc
+    return dtrain, dtest
+
+def run_study(dtrain, dtest, n_trials=OPTUNA_N_TRIALS, n_jobs=OPTUNA_N_JOBS,
+              storage=OPTUNA_STORAGE, parent_run_id=None, callbacks=None, sampler=None, folds=None,
+              tracker=None):
+    """
+    Runs the Optuna search with parallel trials and median pruning.
+    With `folds` (src/cv.py) trials are scored by k-fold AUC instead of dtrain/dtest.
+    Trial runs are written in batches by a background BatchLogger (src/tracking.py).
+    """
+    # Only the auto mode tunes: the manual and streaming runs never import optuna
+    import optuna
+
+    study = optuna.create_study(
+        direction="maximize",
+        sampler=sampler,
+        pruner=optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=10),
+        storage=storage,
+        study_name=OPTUNA_STUDY_NAME if storage else None,
+        load_if_exists=bool(storage),
+    )
+    tracker = tracker or tracking.BatchLogger()
+    # Split the cores between concurrent trials (and their folds) so they don't oversubscribe the CPU
+    if folds is not None:
+        fold_jobs = max(1, min(cv.CV_JOBS, len(folds)))
+        nthread = max(1, (os.cpu_count() or 1) // (n_jobs * fold_jobs))
+        run_trial = lambda trial: cv_objective(trial, folds, parent_run_id=parent_run_id,
+                                               nthread=nthread, n_jobs=fold_jobs, tracker=tracker)
+    else:
+        nthread = max(1, (os.cpu_count() or 1) // n_jobs)
+        run_trial = lambda trial: objective(trial, dtrain, dtest, parent_run_id=parent_run_id,
+                                            nthread=nthread, tracker=tracker)
+    tracker.start()
+    try:
+        study.optimize(run_trial, n_trials=n_trials, n_jobs=n_jobs, callbacks=callbacks)
+    finally:
+        tracker.stop()  # every trial run is written before the study returns
+    return study
 
 def main(mode="manual"):
-    # 1. Setup Data & Experiment
-    X_train, X_test, y_train, y_test = load_and_process_data()
+    # 1. Setup Data & Experiment (streaming mode never loads the full dataset)
+    folds = None
+    if mode != "stream":
+        df = load_dataset(DATA_PATH)
+        if TRAIN_CV_FOLDS > 1:
+            # Folds come from the raw rows: each fits its own WoE tables, out of fold
+            folds = cv.prepare_folds(df, n_folds=TRAIN_CV_FOLDS)
+        X_train, X_test, y_train, y_test, engineer = load_and_process_data(df)
     mlflow.set_experiment(MLFLOW_EXPERIMENT_NAME)
     
     print(f"🚀 Starting Training in [{mode.upper()}] mode...")
@@ -88,16 +262,13 @@ def main(mode="manual"):
     if mode == "manual":
         # --- MANUAL TRAINING ---
         with mlflow.start_run(run_name="Manual_XGBoost"):
-            # Hardcoded params (The "Old Way")
-            params = {
-                "max_depth": 4,
-                "eta": 0.1,
-                "objective": "binary:logistic",
-                "eval_metric": "auc"
-            }
+            params = MANUAL_PARAMS
             
-            dtrain = xgb.DMatrix(X_train, label=y_train)
-            dtest = xgb.DMatrix(X_test, label=y_test)
+            if TRAIN_COMPACT:
+                dtrain, dtest = build_tuning_matrices(X_train, y_train, X_test, y_test)
+            else:
+                dtrain = xgb.DMatrix(X_train, label=y_train)
+                dtest = xgb.DMatrix(X_test, label=y_test)
             
             model = xgb.train(params, dtrain, num_boost_round=100)
             
@@ -112,17 +283,23 @@ def main(mode="manual"):
             mlflow.log_params(params)
             mlflow.log_metric("auc", auc)
             mlflow.log_metric("accuracy", acc)
+            if folds is not None:
+                result = cv.cross_validate(folds, params)
+                print(f"   📊 {len(folds)}-fold AUC={result['auc_mean']:.4f} ± {result['auc_std']:.4f} "
+                      f"({result['seconds']:.1f}s)")
+                mlflow.log_metric("cv_auc_mean", result["auc_mean"])
+                mlflow.log_metric("cv_auc_std", result["auc_std"])
             mlflow.xgboost.log_model(model, "model")
-            print("   💾 Model saved to MLflow.")
+            log_feature_engine(engineer)
+            print("   💾 Model and WoE tables saved to MLflow.")
 
     elif mode == "auto":
         # --- AUTO ML (OPTUNA) ---
         with mlflow.start_run(run_name="Optuna_Optimization_Parent"):
             print("   🤖 Tuning Hyperparameters... (This runs multiple trials)")
-            study = optuna.create_study(direction="maximize")
-            
-            # Lambda creates a function that only needs 'trial'
-            study.optimize(lambda trial: objective(trial, X_train, y_train, X_test, y_test), n_trials=10)
+            dtrain, dtest = build_tuning_matrices(X_train, y_train, X_test, y_test)
+            parent_run_id = mlflow.active_run().info.run_id
+            study = run_study(dtrain, dtest, parent_run_id=parent_run_id, folds=folds)
             
             print("   🏆 Best Params:", study.best_params)
             print("   ⭐️ Best AUC:", study.best_value)
@@ -131,6 +308,23 @@ def main(mode="manual"):
             mlflow.log_params(study.best_params)
             mlflow.log_metric("best_auc", study.best_value)
 
+    elif mode == "stream":
+        # --- OUT-OF-CORE TRAINING (datasets larger than RAM) ---
+        with mlflow.start_run(run_name="Streaming_XGBoost"):
+            with tempfile.TemporaryDirectory(dir=STREAM_CACHE_DIR) as cache_dir:
+                model, engineer, auc, acc = train_streaming(DATA_PATH, cache_dir)
+
+            print(f"   ✅ Streaming Run Results: AUC={auc:.4f}, Accuracy={acc:.4f}")
+
+            mlflow.log_params(MANUAL_PARAMS)
+            mlflow.log_params({"stream_chunk_rows": streaming.STREAM_CHUNK_ROWS,
+                               "stream_external_memory": STREAM_EXTERNAL_MEMORY})
+            mlflow.log_metric("auc", auc)
+            mlflow.log_metric("accuracy", acc)
+            mlflow.xgboost.log_model(model, "model")
+            log_feature_engine(engineer)
+            print("   💾 Model and WoE tables saved to MLflow.")
+
 if __name__ == "__main__":
     # Default to manual, but you can change this
     import sys
@@ -1,7 +1,7 @@
 import mlflow
 import optuna
 import xgboost as xgb
-from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold, cross_val_score
 
 def objective(trial, X, y):
     """Optuna Objective for AutoML"""
@@ -13,9 +13,9 @@ def objective(trial, X, y):
     }
     
     model = xgb.XGBClassifier(**param)
-    # Use cross-validation here in real code
-    model.fit(X, y)
-    return roc_auc_score(y, model.predict_proba(X)[:, 1])
+    # Out-of-fold AUC: scoring the rows the model was fitted on rewards overfitting
+    folds = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    return cross_val_score(model, X, y, cv=folds, scoring='roc_auc', n_jobs=-1).mean()
 
 def train_model(mode="manual"):
     mlflow.set_experiment("Credit_Risk_Sentinel")
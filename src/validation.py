@@ -0,0 +1,245 @@
+"""
+Data-quality gate: a schema compiled from the training data.
+
+A Schema holds, as NumPy arrays, the numeric ranges (low / high per column), the
+allowed category codes and which columns may be missing. Checking a batch builds
+one float matrix of its numerics and one code matrix of its categoricals, then
+evaluates every rule in a single vectorized pass into a boolean violation matrix
+(rows x rules). The same rules run on DataFrames (ingestion, offline checks) and on
+the API's request dicts, where a whole request costs a few microseconds per row. A
+single application skips the arrays (a dozen NumPy calls cost more than the checks):
+check_record runs the same rules on plain floats and dicts.
+
+Rules, per column: `<col>:missing` (null in a column that had none in training),
+`<col>:type` (numeric column value that is not a number), `<col>:range` (outside
+the training range, widened by SCHEMA_RANGE_MARGIN) and `<col>:category` (code
+never seen in training).
+
+    python src/validation.py schema [data_path]   # build the schema from the training data
+    python src/validation.py check [data_path]    # failing rows per rule
+"""
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Config
+BASE_DIR = Path(__file__).parent.parent
+SCHEMA_PATH = os.getenv("SENTINEL_SCHEMA_PATH", str(BASE_DIR / "models" / "schema.npz"))
+# Numeric ranges are the training min / max widened by this fraction of the span on each
+# side (columns that were never negative stay non-negative)
+SCHEMA_RANGE_MARGIN = float(os.getenv("SCHEMA_RANGE_MARGIN", "0.1"))
+# Row numbers listed per failing rule in a report
+REPORT_MAX_ROWS = 10
+
+# Codes of a categorical value in the record path
+_KNOWN, _UNKNOWN, _MISSING = 0, 1, 2
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+class Schema:
+    def __init__(self, ranges, categories, nullable=()):
+        """
+        ranges: {numeric col: (low, high)}, categories: {categorical col: allowed codes},
+        nullable: columns that may be missing.
+        """
+        self.numeric = list(ranges)
+        self.categorical = list(categories)
+        self.lows = np.array([ranges[col][0] for col in self.numeric], dtype=float)
+        self.highs = np.array([ranges[col][1] for col in self.numeric], dtype=float)
+        self.categories = {col: np.asarray(levels, dtype=str) for col, levels in categories.items()}
+        self.nullable = np.array([col in set(nullable) for col in self.numeric + self.categorical], dtype=bool)
+        self._required = ~self.nullable
+        # One rule per column of the violation matrix, in the order _violations stacks them
+        self.rules = (
+            [f"{col}:missing" for col in self.numeric + self.categorical]
+            + [f"{col}:type" for col in self.numeric]
+            + [f"{col}:range" for col in self.numeric]
+            + [f"{col}:category" for col in self.categorical]
+        )
+
+        # Request path: one dict lookup per categorical value; frames use a hash index
+        self._codes = [
+            (col, {**dict.fromkeys(levels.tolist(), _KNOWN), None: _MISSING})
+            for col, levels in self.categories.items()
+        ]
+        required = dict(zip(self.numeric + self.categorical, self._required.tolist()))
+        self._numeric_slots = [
+            (col, low, high, required[col], f"{col}:missing", f"{col}:type", f"{col}:range")
+            for col, low, high in zip(self.numeric, self.lows.tolist(), self.highs.tolist())
+        ]
+        self._categorical_slots = [
+            (col, codes, required[col], f"{col}:missing", f"{col}:category") for col, codes in self._codes
+        ]
+        # Frames: one hash lookup per value against the codes plus the null markers, then a
+        # gather maps the position to its code (the last entry catches -1, not found)
+        nulls = [np.nan, None, pd.NA]
+        self._indexes = {
+            col: pd.Index([*levels.tolist(), *nulls], dtype=object) for col, levels in self.categories.items()
+        }
+        self._index_codes = {
+            col: np.array([_KNOWN] * len(levels) + [_MISSING] * len(nulls) + [_UNKNOWN], dtype=np.int8)
+            for col, levels in self.categories.items()
+        }
+
+    @classmethod
+    def from_reference(cls, df, features=None, margin=SCHEMA_RANGE_MARGIN):
+        """Builds the schema from reference data (e.g. the training set)."""
+        features = features or [c for c in df.columns if c != 'target']
+        ranges, categories, nullable = {}, {}, []
+        for col in features:
+            values = df[col]
+            if values.isna().any():
+                nullable.append(col)
+            if pd.api.types.is_numeric_dtype(values) and not isinstance(values.dtype, pd.CategoricalDtype):
+                low, high = float(values.min()), float(values.max())
+                pad = (high - low) * margin
+                ranges[col] = (max(low - pad, 0.0) if low >= 0 else low - pad, high + pad)
+            else:
+                categories[col] = sorted(values.dropna().astype(str).unique().tolist())
+        return cls(ranges, categories, nullable)
+
+    def _violations(self, X, numeric_null, codes):
+        """
+        X: numerics (rows x numeric cols, NaN where missing or not a number),
+        numeric_null: where the raw numeric value was missing, codes: _KNOWN / _UNKNOWN /
+        _MISSING per categorical value. Returns the rows x rules violation matrix.
+        """
+        k, m = len(self.numeric), len(self.categorical)
+        out = np.empty((len(X), len(self.rules)), dtype=bool)
+        out[:, :k] = numeric_null
+        out[:, k:k + m] = codes == _MISSING
+        out[:, :k + m] &= self._required
+        out[:, k + m:2 * k + m] = np.isnan(X) > numeric_null  # NaN that was not a null: not a number
+        # NaN compares False, so missing values never count as out of range
+        out[:, 2 * k + m:3 * k + m] = (X < self.lows) | (X > self.highs)
+        out[:, 3 * k + m:] = codes == _UNKNOWN
+        return out
+
+    def check_records(self, records):
+        """Violation matrix of a list of application dicts (the API path)."""
+        n = len(records)
+        raw = [[record.get(col) for col in self.numeric] for record in records]
+        try:
+            X = np.array(raw, dtype=float).reshape(n, len(self.numeric))
+            numeric_null = np.isnan(X)
+        except (TypeError, ValueError):  # a non-numeric value: coerce value by value
+            X = np.array([[_to_float(v) for v in row] for row in raw], dtype=float).reshape(n, len(self.numeric))
+            numeric_null = np.array([[v is None or v != v for v in row] for row in raw], dtype=bool)
+            numeric_null = numeric_null.reshape(n, len(self.numeric))
+        codes = np.array(
+            [[codes.get(record.get(col), _UNKNOWN) for col, codes in self._codes] for record in records],
+            dtype=np.int8,
+        ).reshape(n, len(self._codes))
+        return self._violations(X, numeric_null, codes)
+
+    def check_record(self, record):
+        """Failing rules of one application dict (the single-request path, no arrays)."""
+        failed = []
+        for col, low, high, required, missing, wrong_type, out_of_range in self._numeric_slots:
+            value = record.get(col)
+            if value is None or value != value:
+                if required:
+                    failed.append(missing)
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                failed.append(wrong_type)
+                continue
+            if value < low or value > high:
+                failed.append(out_of_range)
+        for col, codes, required, missing, unknown in self._categorical_slots:
+            code = codes.get(record.get(col), _UNKNOWN)
+            if code == _UNKNOWN:
+                failed.append(unknown)
+            elif code == _MISSING and required:
+                failed.append(missing)
+        return failed
+
+    def check_frame(self, df):
+        """Violation matrix of a DataFrame (ingestion, offline batches). Absent columns count as missing."""
+        n = len(df)
+        X = np.full((n, len(self.numeric)), np.nan)
+        numeric_null = np.ones((n, len(self.numeric)), dtype=bool)
+        for j, col in enumerate(self.numeric):
+            if col in df.columns:
+                numeric_null[:, j] = df[col].isna().to_numpy()
+                X[:, j] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+        codes = np.full((n, len(self.categorical)), _MISSING, dtype=np.int8)
+        for j, col in enumerate(self.categorical):
+            if col in df.columns:
+                codes[:, j] = self._index_codes[col][self._indexes[col].get_indexer(df[col])]
+        return self._violations(X, numeric_null, codes)
+
+    def failures(self, violations):
+        """{row: [failing rules]} for the rows that fail any rule."""
+        failed = {}
+        for row, rule in zip(*np.nonzero(violations)):
+            failed.setdefault(int(row), []).append(self.rules[rule])
+        return failed
+
+    def report(self, violations, max_rows=REPORT_MAX_ROWS):
+        """Failing row count overall and per rule, with the first failing row numbers."""
+        counts = violations.sum(axis=0)
+        return {
+            "n_rows": len(violations),
+            "n_failed": int(violations.any(axis=1).sum()),
+            "rules": {
+                rule: {"failed": int(counts[j]), "rows": np.flatnonzero(violations[:, j])[:max_rows].tolist()}
+                for j, rule in enumerate(self.rules) if counts[j]
+            },
+        }
+
+    def save(self, path=SCHEMA_PATH):
+        """Writes the schema to a compressed .npz file (no pickled objects)."""
+        arrays = {
+            "__numeric__": np.array(self.numeric, dtype=str),
+            "__categorical__": np.array(self.categorical, dtype=str),
+            "__nullable__": np.array(self.numeric + self.categorical, dtype=str)[self.nullable],
+        }
+        for j, col in enumerate(self.numeric):
+            arrays[f"{col}/range"] = np.array([self.lows[j], self.highs[j]])
+        for col, levels in self.categories.items():
+            arrays[f"{col}/categories"] = levels
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(path, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path=SCHEMA_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            ranges = {col: tuple(data[f"{col}/range"].tolist()) for col in data["__numeric__"].tolist()}
+            categories = {col: data[f"{col}/categories"].tolist() for col in data["__categorical__"].tolist()}
+            nullable = data["__nullable__"].tolist()
+        return cls(ranges, categories, nullable)
+
+def print_report(report):
+    print(f"   {report['n_failed']} of {report['n_rows']} rows fail validation")
+    for rule, result in report["rules"].items():
+        print(f"   ❌ {rule}: {result['failed']} rows (e.g. {result['rows']})")
+
+if __name__ == "__main__":
+    from src.datastore import load_dataset
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "schema"
+    df = load_dataset(sys.argv[2] if len(sys.argv) > 2 else None)
+    if command == "schema":
+        schema = Schema.from_reference(df)
+        path = schema.save()
+        print(f"✅ Schema ({len(schema.numeric)} numeric, {len(schema.categorical)} categorical) "
+              f"saved to: {path}")
+    elif command == "check":
+        schema = Schema.load()
+        print_report(schema.report(schema.check_frame(df)))
+    else:
+        print("Usage: python src/validation.py [schema|check] [data_path]")
@@ -1,8 +1,8 @@
-import pandas as pd
+from src.datastore import load_dataset
 from src.features import CreditRiskFeatures
 
-# Load the raw data we ingested
-df = pd.read_csv("data/raw/german_credit_data.csv")
+# Load the data we ingested (Parquet if present, else the raw CSV)
+df = load_dataset()
 
 # Initialize the Feature Engineer
 engineer = CreditRiskFeatures()
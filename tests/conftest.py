@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.synthetic import make_credit_frame
+
+
+@pytest.fixture(scope="session")
+def credit_df():
+    """A small German-Credit-shaped dataset (the real CSV is tracked by DVC)."""
+    return make_credit_frame(2_000, seed=7)
+
+
+@pytest.fixture(scope="session")
+def fitted_model(credit_df):
+    """A small booster trained on WoE features, plus the engineer that produced them."""
+    import xgboost as xgb
+    from src.features import CreditRiskFeatures
+
+    engineer = CreditRiskFeatures()
+    df_processed = engineer.fit_transform(credit_df, target_col="target")
+    X = df_processed.drop(columns=["target"])
+    dtrain = xgb.DMatrix(X, label=df_processed["target"])
+    params = {"max_depth": 3, "eta": 0.3, "objective": "binary:logistic"}
+    booster = xgb.train(params, dtrain, num_boost_round=20)
+    return booster, engineer
@@ -0,0 +1,209 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as api
+
+
+@pytest.fixture
+def client(fitted_model, monkeypatch):
+    booster, engineer = fitted_model
+    monkeypatch.setattr(api, "bundle", None)
+    api.install_model(booster, engineer, version="test-model", warm_up=False)
+    # No context manager: skip the model lookup in the startup event
+    return TestClient(api.app)
+
+
+def test_health(client):
+    body = client.get("/health").json()
+    assert body["status"] == "healthy" and body["model_loaded"] is True
+
+
+def test_score_applies_woe(client):
+    default = client.post("/score", json={}).json()
+    assert 0 <= default["probability_of_default"] <= 1
+    assert default["risk_label"] in {"High Risk", "Low Risk"}
+
+    # Categoricals are no longer zeroed out, so they move the score
+    other = client.post("/score", json={"checkin_acc": "A14", "credit_history": "A30"}).json()
+    assert other["probability_of_default"] != default["probability_of_default"]
+    assert default["model_version"] == "test-model"
+
+
+def test_score_batch_matches_single(client):
+    apps = [{}, {"checkin_acc": "A14"}, {"amount": 9000, "duration": 48}]
+    batch = client.post("/score/batch", json={"applications": apps}).json()["results"]
+    singles = [client.post("/score", json=a).json() for a in apps]
+    assert batch == singles
+
+
+def test_concurrent_scores_are_coalesced(client, monkeypatch):
+    import asyncio
+    import httpx
+
+    batch_sizes = []
+    def recording_score(records):
+        batch_sizes.append(len(records))
+        return api.score_with_current(records)
+    monkeypatch.setattr(api, "batcher", api.MicroBatcher(recording_score, max_wait_ms=50))
+
+    async def fire():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            payloads = [{"amount": 1000 + i} for i in range(16)]
+            return await asyncio.gather(*(ac.post("/score", json=p) for p in payloads))
+
+    responses = asyncio.run(fire())
+    assert all(r.status_code == 200 for r in responses)
+    assert sum(batch_sizes) == 16 and len(batch_sizes) < 16
+
+
+def test_reload_swaps_to_promoted_model(client, fitted_model, tmp_path, monkeypatch):
+    from src.model_store import load_promoted, promote_model, read_manifest
+
+    booster, engineer = fitted_model
+    promote_model(booster, engineer, "run-new", store_dir=tmp_path)
+    monkeypatch.setattr(api, "read_manifest", lambda: read_manifest(tmp_path))
+    monkeypatch.setattr(api, "load_promoted", lambda manifest: load_promoted(tmp_path, manifest))
+
+    before = client.post("/score", json={}).json()
+    reload = client.post("/admin/reload").json()
+    after = client.post("/score", json={}).json()
+
+    assert reload["reloaded"] is True
+    assert reload["previous_version"] == "test-model" and reload["model_version"] == "run-new"
+    assert after["model_version"] == "run-new"
+    assert after["probability_of_default"] == before["probability_of_default"]
+    # Same manifest version again: nothing to do
+    assert client.post("/admin/reload").json()["reloaded"] is False
+
+
+def test_scored_traffic_feeds_drift_monitor(client, credit_df, monkeypatch):
+    from src.drift import DriftMonitor
+
+    monkeypatch.setattr(api, "drift_monitor", None)
+    assert client.get("/drift").status_code == 404
+    monkeypatch.setattr(api, "drift_monitor", DriftMonitor.from_reference(credit_df))
+
+    client.post("/score", json={})
+    client.post("/score/batch", json={"applications": [{}, {"amount": 15000}]})
+    report = client.get("/drift").json()
+    assert report["n_current"] == 3 and report["n_reference"] == len(credit_df)
+
+    assert client.post("/admin/drift/reset").json() == {"reset": True}
+    assert client.get("/drift").json()["n_current"] == 0
+
+
+def test_resent_applications_hit_the_score_cache(client, fitted_model):
+    # Counters are cumulative over the process, so compare against a starting point
+    start = client.get("/admin/cache").json()
+    first = client.post("/score", json={"amount": 4321, "checkin_acc": "A12"}).json()
+    # Same application, fields in another order and the amount as a float
+    again = client.post("/score", json={"checkin_acc": "A12", "amount": 4321.0}).json()
+    assert again == first
+    stats = client.get("/admin/cache").json()
+    assert stats["hits"] - start["hits"] == 1 and stats["misses"] - start["misses"] == 1
+
+    batch = client.post("/score/batch", json={"applications": [{"amount": 4321, "checkin_acc": "A12"}, {}]})
+    assert batch.json()["results"][0] == first
+    assert client.get("/admin/cache").json()["hits"] - start["hits"] == 2
+
+    # A model swap empties the cache
+    booster, engineer = fitted_model
+    api.install_model(booster, engineer, version="test-model-2", warm_up=False)
+    assert client.get("/admin/cache").json()["size"] == 0
+
+
+def test_metrics_endpoint_reports_stages(client):
+    client.post("/score", json={"amount": 777})
+    client.post("/score/batch", json={"applications": [{"amount": 778}, {"amount": 779}]})
+    response = client.get("/metrics")
+    assert response.status_code == 200 and response.headers["content-type"].startswith("text/plain")
+
+    text = response.text
+    for stage in ("validation", "cache", "features", "woe_transform", "predict", "serialization"):
+        assert f'sentinel_stage_duration_seconds_count{{stage="{stage}"}}' in text
+    assert 'sentinel_request_duration_seconds_count{path="/score"}' in text
+    assert 'sentinel_batch_size_bucket{source="batch",le="2.0"}' in text
+    assert 'sentinel_predictions_total{risk_band="' in text
+
+
+def test_explain_returns_reason_codes(client):
+    body = client.post("/explain?top_k=3", json={"checkin_acc": "A11", "amount": 15000}).json()
+    score = client.post("/score", json={"checkin_acc": "A11", "amount": 15000}).json()
+    assert abs(body["probability_of_default"] - score["probability_of_default"]) < 1e-4
+    assert body["model_version"] == "test-model" and len(body["reasons"]) <= 3
+    assert {"field", "description", "value", "contribution"} <= set(body["reasons"][0])
+
+    batch = client.post("/explain/batch", json={"applications": [{}, {"amount": 15000}]}).json()
+    assert len(batch["results"]) == 2
+    for top_k in (0, -1):
+        assert client.post(f"/explain?top_k={top_k}", json={"amount": 15000}).status_code == 422
+        assert client.post(f"/explain/batch?top_k={top_k}", json={"applications": [{}]}).status_code == 422
+
+
+@pytest.mark.parametrize("module, heavy", [
+    ("app.main", ["mlflow", "optuna"]),
+    ("src.predict", ["mlflow", "optuna"]),
+    ("src.train", ["optuna"]),
+])
+def test_serving_imports_stay_slim(module, heavy):
+    import os
+    import subprocess
+    import sys
+
+    # A fresh interpreter: this one already has everything loaded by other tests
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    code = f"import sys, {module}; print(sorted(m for m in {heavy!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_train_imports_without_sklearn():
+    import os
+    import subprocess
+    import sys
+
+    # None in sys.modules makes any `import sklearn...` raise ImportError
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    code = "import sys; sys.modules['sklearn'] = None; import src.train"
+    subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+
+
+def test_routing_serves_split_and_shadow_models(client, fitted_model, tmp_path, monkeypatch):
+    from src.model_store import load_run, stage_model
+
+    booster, engineer = fitted_model
+    stage_model(booster, engineer, "run-challenger", store_dir=tmp_path)
+    monkeypatch.setattr(api, "load_run", lambda run_id: load_run(run_id, tmp_path))
+    monkeypatch.setattr(api, "registry", api.ModelRegistry())
+
+    routing = {"models": {"b": "run-challenger"}, "split": {"b": 1.0}}
+    stats = client.post("/admin/routing", json=routing).json()
+    assert [(m["name"], m["role"]) for m in stats["models"]] == [("champion", "champion"), ("b", "split")]
+    assert client.post("/score", json={}).json()["model_version"] == "run-challenger"
+    batch = client.post("/score/batch", json={"applications": [{}, {"amount": 5000}]}).json()
+    assert {r["model_version"] for r in batch["results"]} == {"run-challenger"}
+
+    client.post("/admin/routing", json={**routing, "split": {}, "shadow": ["b"]})
+    assert client.post("/score", json={"amount": 4444}).json()["model_version"] == "test-model"
+    api.registry.flush()
+    shadow = client.get("/admin/models").json()["models"][1]
+    assert shadow["role"] == "shadow" and shadow["vs_champion"]["compared"] == 1
+
+    assert client.post("/admin/routing", json={"split": {"missing": 0.5}}).status_code == 422
+    assert client.post("/admin/routing", json={"models": {"c": "run-unknown"}}).status_code == 404
+
+
+def test_schema_rejects_invalid_applications(client, credit_df, monkeypatch):
+    from src.validation import Schema
+
+    monkeypatch.setattr(api, "schema", Schema.from_reference(credit_df))
+
+    assert client.post("/score", json={}).status_code == 200
+    response = client.post("/score", json={"purpose": "A99", "amount": -1})
+    assert response.status_code == 422
+    assert response.json()["detail"]["errors"] == [{"index": 0, "failed_rules": ["amount:range", "purpose:category"]}]
+
+    batch = client.post("/score/batch", json={"applications": [{}, {"age": 500}]})
+    assert batch.status_code == 422
+    assert batch.json()["detail"]["errors"] == [{"index": 1, "failed_rules": ["age:range"]}]
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+from src.batch_scoring import score_file
+from src.model_store import promote_model
+from src.serving import prepare_features
+
+
+@pytest.mark.parametrize("workers, suffix", [(1, "csv"), (2, "parquet")])
+def test_score_file_matches_booster_in_order(tmp_path, credit_df, fitted_model, workers, suffix):
+    booster, engineer = fitted_model
+    store_dir = tmp_path / "models"
+    promote_model(booster, engineer, run_id="run-1", store_dir=str(store_dir))
+
+    df = credit_df.assign(account_id=np.arange(len(credit_df)) * 10)
+    input_path = tmp_path / "accounts.csv"
+    df.to_csv(input_path, index=False)
+    output_path = tmp_path / f"scores.{suffix}"
+
+    rows, _ = score_file(input_path, output_path, chunk_rows=300, workers=workers,
+                         id_cols=["account_id"], store_dir=str(store_dir))
+
+    scores = pd.read_csv(output_path) if suffix == "csv" else pd.read_parquet(output_path)
+    expected = booster.predict(xgb.DMatrix(prepare_features(df, engineer, booster.feature_names)))
+    assert rows == len(df)
+    assert scores["account_id"].tolist() == df["account_id"].tolist()
+    np.testing.assert_allclose(scores["probability"], expected, rtol=1e-6)
@@ -0,0 +1,30 @@
+import copy
+import json
+
+from benchmarks import suite
+
+
+def test_suite_writes_comparable_json(tmp_path, monkeypatch):
+    import app.main as api
+
+    # The serving cases install their own model and switch the cache off; restore afterwards
+    for name in ("bundle", "score_cache", "drift_monitor"):
+        monkeypatch.setattr(api, name, getattr(api, name))
+    output = tmp_path / "results.json"
+    report = suite.run(rows=[1_000, 20_000], cases=["woe_transform", "score_batch"], repeat=1, output=str(output))
+
+    saved = json.loads(output.read_text())
+    assert saved["environment"]["commit"] == report["environment"]["commit"]
+    results = {(r["case"], r["rows"]): r for r in saved["results"]}
+    assert results[("woe_transform", 1_000)]["status"] == "ok"
+    assert results[("woe_transform", 1_000)]["ops_per_second"] > 0
+    assert results[("score_batch", 20_000)]["status"] == "skipped"  # above its max_rows
+
+    slower = copy.deepcopy(saved)
+    for r in slower["results"]:
+        if r["status"] == "ok":
+            r["median"] *= 2
+    regressions = suite.compare(saved, slower)
+    assert {(r["case"], r["rows"]) for r in regressions} == {("woe_transform", 1_000), ("woe_transform", 20_000),
+                                                              ("score_batch", 1_000)}
+    assert suite.compare(saved, saved) == []
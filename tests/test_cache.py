@@ -0,0 +1,45 @@
+import time
+
+from app.cache import ScoreCache, SQLiteCacheBackend
+
+
+def test_lru_eviction_and_counters():
+    cache = ScoreCache(max_entries=2, ttl_seconds=60)
+    keys = [ScoreCache.make_key("v1", bytes([i])) for i in range(3)]
+    assert cache.get(keys[0]) is None
+    cache.put(keys[0], 0.1)
+    cache.put(keys[1], 0.2)
+    assert cache.get(keys[0]) == 0.1  # keys[0] is now the most recently used
+    cache.put(keys[2], 0.3)
+
+    assert cache.get(keys[1]) is None and cache.get(keys[2]) == 0.3
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (2, 2, 1, 2)
+
+
+def test_ttl_expiry_and_version_in_key():
+    cache = ScoreCache(max_entries=10, ttl_seconds=0.05)
+    key = ScoreCache.make_key("v1", b"row")
+    assert key != ScoreCache.make_key("v2", b"row")
+    cache.put(key, 0.5)
+    assert cache.get(key) == 0.5
+    time.sleep(0.06)
+    assert cache.get(key) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_shared_backend_serves_other_workers(tmp_path):
+    path = tmp_path / "score_cache.sqlite"
+    worker_a = ScoreCache(shared=SQLiteCacheBackend(path))
+    worker_b = ScoreCache(shared=SQLiteCacheBackend(path))
+    key = ScoreCache.make_key("v1", b"row")
+    worker_a.put(key, 0.25)
+
+    assert worker_b.get(key) == 0.25
+    assert worker_b.stats()["shared_hits"] == 1
+
+    backend = SQLiteCacheBackend(tmp_path / "trimmed.sqlite", max_entries=1)
+    for i in range(3):
+        backend.put(bytes([i]), 0.5, time.time() + 60)
+    backend.trim()
+    assert backend.get(bytes([2]), time.time()) == 0.5 and backend.get(bytes([0]), time.time()) is None
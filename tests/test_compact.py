@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from src import train
+from src.compact import CompactMatrix
+from src.features import CreditRiskFeatures
+
+PARAMS = {"max_depth": 3, "eta": 0.3, "objective": "binary:logistic"}
+
+
+def test_codes_decode_to_the_woe_frame(credit_df, fitted_model):
+    _, engineer = fitted_model
+    raw = credit_df.head(50).copy()
+    raw.loc[0, "purpose"] = "A99"  # unseen: WoE 0
+    raw["age"] = raw["age"].astype(float)
+    raw.loc[1, "age"] = np.nan  # raw numeric: stays missing
+
+    compact = CompactMatrix.from_frame(raw, engineer)
+    expected = engineer.transform(raw).drop(columns=["target"]).to_numpy(np.float32)
+
+    np.testing.assert_array_equal(compact.decode(), expected)
+    assert compact.columns["purpose"][0].dtype == np.uint8
+    assert compact.decode()[0, compact.feature_names.index("purpose")] == 0.0
+
+
+def test_binned_numerics_are_coded(credit_df):
+    engineer = CreditRiskFeatures(bin_numeric=True).fit(credit_df)
+    full = CompactMatrix.from_frame(credit_df, engineer)
+
+    np.testing.assert_array_equal(
+        full.decode(), engineer.transform(credit_df).drop(columns=["target"]).to_numpy(np.float32)
+    )
+    assert all(codes.dtype == np.uint8 for codes, _ in full.columns.values())
+    assert full.nbytes < credit_df.drop(columns=["target"]).shape[1] * len(credit_df) * 2
+
+
+def test_training_from_codes_matches_dense(credit_df, fitted_model):
+    _, engineer = fitted_model
+    X = engineer.transform(credit_df).drop(columns=["target"])
+    y = credit_df["target"]
+    compact = CompactMatrix.from_frame(credit_df, engineer)
+
+    dense_model = xgb.train(PARAMS, xgb.QuantileDMatrix(X, label=y), 20)
+    compact_model = xgb.train(PARAMS, compact.quantile_dmatrix(label=y, batch_rows=300), 20)
+    predictions = compact.predict(compact_model, batch_rows=700)
+
+    np.testing.assert_array_equal(predictions, dense_model.inplace_predict(X))
+    # Manual training builds a DMatrix from the float64 DataFrame
+    frame_model = xgb.train(PARAMS, xgb.DMatrix(X, label=y), 20)
+    np.testing.assert_array_equal(predictions, frame_model.predict(xgb.DMatrix(X)))
+
+
+def test_wide_int32_columns_do_not_overflow(fitted_model):
+    _, engineer = fitted_model
+    df = pd.DataFrame({
+        "wide": np.array([-2**31 + 1, 2**31 - 1, 0], dtype=np.int32),  # span overflows int32
+        "narrow": np.array([-2**31, -2**31 + 5, -2**31 + 2], dtype=np.int32),
+    })
+    compact = CompactMatrix.from_frame(df, engineer)
+
+    np.testing.assert_array_equal(compact.decode(), df.to_numpy(np.float32))
+    assert len(compact.columns["wide"][1]) == 3  # distinct values, not a 4e9-entry range
+    np.testing.assert_array_equal(compact.columns["narrow"][0], [0, 5, 2])
+
+
+def test_compact_split_matches_dataframe_split(credit_df):
+    X_train, X_test, y_train, y_test, _ = train.load_and_process_data(credit_df, compact=False)
+    c_train, c_test, cy_train, cy_test, _ = train.load_and_process_data(credit_df, compact=True)
+
+    np.testing.assert_array_equal(c_test.decode(), X_test.to_numpy(np.float32))
+    np.testing.assert_array_equal(cy_train, y_train.to_numpy())
+    dtrain, dtest = train.build_tuning_matrices(c_train, cy_train, c_test, cy_test)
+    assert dtrain.num_row() == len(X_train) and dtest.num_col() == X_test.shape[1]
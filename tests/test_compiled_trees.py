@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+import xgboost as xgb
+
+from src.compiled_trees import CompiledEnsemble, compile_booster, woe_levels
+from src.features import CreditRiskFeatures
+from src.serving import FastScorer
+
+
+def encoded(credit_df):
+    engineer = CreditRiskFeatures()
+    df_processed = engineer.fit_transform(credit_df, target_col="target")
+    return engineer, df_processed.drop(columns=["target"]), df_processed["target"]
+
+
+@pytest.mark.parametrize("max_depth", [3, 8])
+def test_compiled_matches_booster_predict(credit_df, max_depth):
+    _, X, y = encoded(credit_df)
+    booster = xgb.train({"max_depth": max_depth, "objective": "binary:logistic"},
+                        xgb.DMatrix(X, label=y), num_boost_round=30)
+    compiled = compile_booster(booster)
+
+    A = X.to_numpy(dtype=np.float32)
+    A[::7, 0] = np.nan  # missing values follow each split's default direction
+    A[::5, 4] = np.nan
+    expected = booster.predict(xgb.DMatrix(A, feature_names=booster.feature_names))
+    np.testing.assert_allclose(compiled.predict(A), expected, atol=1e-6)
+    # Small blocks give the same result as one block
+    np.testing.assert_allclose(compiled.predict(A, block_rows=17), expected, atol=1e-6)
+
+
+def test_leaf_tables_match_walk(credit_df):
+    engineer, X, y = encoded(credit_df)
+    # Only the WoE columns, so every tree is discrete-only and can be tabulated
+    X = X[list(engineer.woe_tables)]
+    booster = xgb.train({"max_depth": 2, "objective": "binary:logistic"},
+                        xgb.DMatrix(X, label=y), num_boost_round=20)
+    compiled = compile_booster(booster)
+    A = X.to_numpy(dtype=np.float32)
+    walked = compiled.predict(A)
+
+    assert compiled.build_leaf_tables(woe_levels(engineer, booster.feature_names)) > 0
+    np.testing.assert_allclose(compiled.predict(A), walked, atol=1e-6)
+    # A value outside the fitted levels falls back to walking the trees
+    A[0, 0] = 123.0
+    np.testing.assert_allclose(compiled.predict(A[:1]), booster.inplace_predict(A[:1]), atol=1e-6)
+
+
+def test_save_load_roundtrip(tmp_path, credit_df, fitted_model):
+    booster, engineer = fitted_model
+    compiled = compile_booster(booster)
+    loaded = CompiledEnsemble.load(compiled.save(tmp_path / "compiled_trees.npz"))
+
+    _, X, _ = encoded(credit_df)
+    A = X[booster.feature_names].to_numpy(dtype=np.float32)
+    np.testing.assert_array_equal(loaded.predict(A), compiled.predict(A))
+    assert loaded.feature_names == booster.feature_names
+
+
+def test_unsupported_objective_is_rejected(credit_df):
+    _, X, y = encoded(credit_df)
+    booster = xgb.train({"objective": "count:poisson"}, xgb.DMatrix(X, label=y), num_boost_round=2)
+    with pytest.raises(ValueError, match="objective"):
+        compile_booster(booster)
+
+
+def test_fast_scorer_compiled_engine(credit_df, fitted_model):
+    booster, engineer = fitted_model
+    records = credit_df.drop(columns=["target"]).head(150).to_dict("records")
+
+    default = FastScorer(booster, engineer, max_batch_size=64, engine="xgboost")
+    compiled = FastScorer(booster, engineer, max_batch_size=64, engine="compiled")
+    assert compiled.compiled is not None
+    np.testing.assert_allclose(compiled.score_many(records), default.score_many(records), atol=1e-6)
+    assert abs(compiled.score_one(records[0]) - default.score_one(records[0])) < 1e-6
@@ -0,0 +1,53 @@
+import mlflow
+import numpy as np
+import pytest
+
+from src import cv, train
+from src.features import CreditRiskFeatures
+
+PARAMS = {"max_depth": 3, "eta": 0.3, "objective": "binary:logistic"}
+
+
+@pytest.fixture(scope="module")
+def folds(credit_df):
+    return cv.prepare_folds(credit_df, n_folds=3, n_jobs=2)
+
+
+def test_fold_woe_is_fitted_out_of_fold(credit_df, folds):
+    assert len(folds) == 3
+    covered = np.sort(np.concatenate([fold.valid_index for fold in folds]))
+    np.testing.assert_array_equal(covered, np.arange(len(credit_df)))
+
+    for fold in folds:
+        assert not set(fold.train_index) & set(fold.valid_index)
+        expected = CreditRiskFeatures()
+        expected.fit_transform(credit_df.iloc[fold.train_index], target_col="target")
+        assert fold.engineer.iv_values == pytest.approx(expected.iv_values)
+        assert fold.dvalid.num_row() == len(fold.valid_index)
+
+
+def test_parallel_folds_match_sequential(folds):
+    sequential = cv.cross_validate(folds, PARAMS, num_boost_round=20, n_jobs=1, nthread=1)
+    parallel = cv.cross_validate(folds, PARAMS, num_boost_round=20, n_jobs=3, nthread=1)
+
+    assert parallel["fold_aucs"] == pytest.approx(sequential["fold_aucs"])
+    assert 0.5 < sequential["auc_mean"] <= 1.0
+    assert sequential["auc_std"] == pytest.approx(np.std(sequential["fold_aucs"]))
+
+
+def test_study_scores_trials_by_cv_auc(tmp_path, folds):
+    mlflow.set_tracking_uri(f"file://{tmp_path}")
+    mlflow.set_experiment("test_cv_tuning")
+    try:
+        with mlflow.start_run() as parent:
+            study = train.run_study(None, None, n_trials=3, n_jobs=1, storage=None,
+                                    parent_run_id=parent.info.run_id, folds=folds)
+        children = mlflow.search_runs(filter_string=f"tags.mlflow.parentRunId = '{parent.info.run_id}'")
+    finally:
+        mlflow.set_tracking_uri(None)
+
+    assert len(study.trials) == 3
+    assert 0.5 < study.best_value <= 1.0
+    assert len(children) == 3
+    assert set(children["metrics.auc"]) == {t.value for t in study.trials}
+    assert (children["metrics.auc_std"] >= 0).all()
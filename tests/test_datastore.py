@@ -0,0 +1,66 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src import datastore
+from src.features import CreditRiskFeatures
+
+
+def as_plain(df):
+    """Category/narrow int columns back to the object/int64 dtypes of the CSV path."""
+    return df.astype({
+        c: object if isinstance(t, pd.CategoricalDtype) else "int64"
+        for c, t in df.dtypes.items() if not pd.api.types.is_float_dtype(t)
+    })
+
+
+def test_parquet_roundtrip_is_partitioned_and_dictionary_encoded(credit_df, tmp_path):
+    chunks = [credit_df.iloc[i:i + 500] for i in range(0, len(credit_df), 500)]
+    path = datastore.write_parquet(chunks, tmp_path / "credit", rows_per_file=800, rows_per_group=400)
+
+    assert len(list(path.glob("part-*.parquet"))) == 3
+    schema = datastore.read_table(path).schema
+    assert pa.types.is_dictionary(schema.field("purpose").type)
+    assert schema.field("amount").type == pa.int32()
+
+    loaded = datastore.load_dataset(path)
+    assert isinstance(loaded["purpose"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(as_plain(loaded), credit_df)
+
+
+def test_loaders_read_only_requested_columns(credit_df, tmp_path):
+    parquet = datastore.write_parquet(credit_df, tmp_path / "credit")
+    arrow = datastore.write_arrow(credit_df, tmp_path / "credit.arrow")
+    csv = tmp_path / "credit.csv"
+    credit_df.to_csv(csv, index=False)
+
+    for path in (parquet, arrow, csv):
+        loaded = datastore.load_dataset(path, columns=["purpose", "target"])
+        assert list(loaded.columns) == ["purpose", "target"]
+        assert loaded["purpose"].astype(object).equals(credit_df["purpose"])
+
+
+def test_arrow_file_is_memory_mapped_and_chunks_stream(credit_df, tmp_path):
+    chunks = [credit_df.iloc[i:i + 700] for i in range(0, len(credit_df), 700)]
+    parquet = datastore.write_parquet(chunks, tmp_path / "credit", rows_per_file=700, rows_per_group=700)
+    path = datastore.parquet_to_arrow(parquet, tmp_path / "credit.arrow")
+
+    table = datastore.read_table(path)
+    assert table.schema.field("purpose").type == pa.dictionary(pa.int8(), pa.string())
+    # One dictionary per column in the file, shared by every record batch
+    assert len({tuple(chunk.dictionary.to_pylist()) for chunk in table.column("purpose").chunks}) == 1
+    pd.testing.assert_frame_equal(as_plain(table.to_pandas()), credit_df)
+
+    sizes = [len(chunk) for chunk in datastore.iter_chunks(path, chunksize=600)]
+    assert sum(sizes) == len(credit_df) and max(sizes) <= 600
+
+
+def test_woe_from_parquet_matches_csv_path(credit_df, tmp_path):
+    loaded = datastore.load_dataset(datastore.write_parquet(credit_df, tmp_path / "credit"))
+
+    from_csv, from_parquet = CreditRiskFeatures(), CreditRiskFeatures()
+    expected = from_csv.fit_transform(credit_df, target_col="target")
+    out = from_parquet.fit_transform(loaded, target_col="target")
+
+    assert from_parquet.iv_values == pytest.approx(from_csv.iv_values, abs=1e-12)
+    pd.testing.assert_frame_equal(as_plain(out), expected)
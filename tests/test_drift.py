@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.drift import DriftMonitor
+
+
+def test_record_updates_match_frame_counts(credit_df):
+    reference, current = credit_df.iloc[:1000], credit_df.iloc[1000:1200].copy()
+    current.loc[current.index[0], "purpose"] = "A999"  # unseen -> other bin
+    current.loc[current.index[1], "amount"] = np.nan   # missing -> other bin
+
+    by_record = DriftMonitor.from_reference(reference)
+    by_record.update_many(current.to_dict("records"))
+    by_frame = DriftMonitor.from_reference(reference)
+    by_frame.update_frame(current)
+
+    assert by_record.current_counts == by_frame.current_counts
+    assert by_record.n_current == by_frame.n_current == 200
+    assert by_record.current_counts["purpose"][-1] == 1 and by_record.current_counts["amount"][-1] == 1
+
+
+def test_report_flags_shifted_features(credit_df):
+    monitor = DriftMonitor.from_reference(credit_df.iloc[:1000])
+    current = credit_df.iloc[1000:].copy()
+    current["amount"] = current["amount"] * 3
+    current["housing"] = "A153"
+    monitor.update_frame(current)
+
+    report = monitor.report()
+    assert set(report["drifted"]) == {"amount", "housing"}
+    assert report["features"]["age"]["psi"] < 0.1
+    assert report["features"]["amount"]["ks"] > 0.5 and report["features"]["housing"]["ks"] is None
+    assert 0 < report["features"]["housing"]["js"] <= 1
+
+    # PSI against the textbook formula on the same bins
+    p = monitor.reference_counts["housing"] / monitor.reference_counts["housing"].sum()
+    q = np.array(monitor.current_counts["housing"]) / report["n_current"]
+    expected = np.sum((q - p) * np.log((q + 1e-6) / (p + 1e-6)))
+    assert report["features"]["housing"]["psi"] == pytest.approx(expected, abs=1e-6)
+
+    monitor.reset()
+    assert monitor.report()["n_current"] == 0 and monitor.report()["drifted"] == []
+
+
+def test_save_and_load_roundtrip(credit_df, tmp_path):
+    monitor = DriftMonitor.from_reference(credit_df)
+    restored = DriftMonitor.load(monitor.save(tmp_path / "drift_reference.npz"))
+
+    assert restored.columns == monitor.columns
+    for col in monitor.columns:
+        np.testing.assert_array_equal(restored.reference_counts[col], monitor.reference_counts[col])
+    record = credit_df.iloc[0].to_dict()
+    restored.update(record)
+    monitor.update(record)
+    assert restored.current_counts == monitor.current_counts
+
+
+def test_queued_records_are_binned_by_flush(credit_df):
+    records = credit_df.iloc[1000:1100].to_dict("records")
+    direct = DriftMonitor.from_reference(credit_df.iloc[:1000])
+    direct.update_many(records)
+
+    queued = DriftMonitor.from_reference(credit_df.iloc[:1000]).start(interval=0.01)
+    queued.enqueue(records)
+    queued.stop()
+    assert queued.current_counts == direct.current_counts
+
+    queued.enqueue(records)
+    assert queued.report()["n_current"] == 200  # report flushes first
+    queued.enqueue(records)
+    queued.reset()
+    assert queued.report()["n_current"] == 0
+
+
+def test_values_that_cannot_be_binned_go_to_the_missing_bin(credit_df):
+    records = credit_df.iloc[1000:1100].to_dict("records")
+    records[0] = dict(records[0], age="unknown", housing=["own"])  # not a number, unhashable
+    records[1] = dict(records[1], amount="1200")  # numeric text is binned, as in frames
+    monitor = DriftMonitor.from_reference(credit_df.iloc[:1000])
+    monitor.update_many(records)  # the rest of the batch is still counted
+    assert monitor.n_current == 100
+
+    frame = pd.DataFrame(records)
+    frame.loc[0, "housing"] = None
+    expected = DriftMonitor.from_reference(credit_df.iloc[:1000])
+    expected.update_frame(frame)
+    assert monitor.current_counts == expected.current_counts
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from src.explain import Explainer, explain_file
+from src.model_store import promote_model
+from src.serving import prepare_features
+
+
+def test_contributions_add_up_to_the_margin(credit_df, fitted_model):
+    booster, engineer = fitted_model
+    explainer = Explainer(booster, engineer)
+    records = credit_df.drop(columns=["target"]).head(50).to_dict("records")
+
+    X = prepare_features(pd.DataFrame(records), engineer, booster.feature_names)
+    margins = booster.predict(xgb.DMatrix(X), output_margin=True)
+    contribs = explainer.contributions(explainer.encode_records(records))
+    np.testing.assert_allclose(contribs.sum(axis=1), margins, atol=1e-4)
+    np.testing.assert_allclose(contribs[:, -1], explainer.expected_value)
+    # Served from the cache the second time, same values
+    np.testing.assert_array_equal(explainer.contributions(explainer.encode_records(records)), contribs)
+
+
+def test_reasons_are_sorted_positive_and_mapped_to_raw_fields(credit_df, fitted_model):
+    booster, engineer = fitted_model
+    explainer = Explainer(booster, engineer)
+    records = credit_df.drop(columns=["target"]).head(20).to_dict("records")
+
+    for record, result in zip(records, explainer.explain_records(records, top_k=3)):
+        contributions = [r["contribution"] for r in result["reasons"]]
+        assert len(contributions) <= 3 and all(c > 0 for c in contributions)
+        assert contributions == sorted(contributions, reverse=True)
+        for reason in result["reasons"]:
+            assert reason["value"] == record[reason["field"]]
+            if reason["field"] in engineer.woe_tables:
+                assert reason["woe"] == round(engineer.woe_mappings[reason["field"]][reason["value"]], 6)
+
+
+def test_explain_file_writes_reason_columns(tmp_path, credit_df, fitted_model):
+    booster, engineer = fitted_model
+    promote_model(booster, engineer, run_id="run-1", store_dir=str(tmp_path / "models"))
+    credit_df.head(300).to_csv(tmp_path / "accounts.csv", index=False)
+
+    rows, _ = explain_file(tmp_path / "accounts.csv", tmp_path / "reasons.parquet", top_k=2,
+                           chunk_rows=128, store_dir=str(tmp_path / "models"))
+    out = pd.read_parquet(tmp_path / "reasons.parquet")
+    assert rows == 300 and list(out.columns) == [
+        "probability", "reason_1", "value_1", "contribution_1", "reason_2", "value_2", "contribution_2"
+    ]
+    expected = booster.predict(xgb.DMatrix(prepare_features(credit_df.head(300), engineer, booster.feature_names)))
+    np.testing.assert_allclose(out["probability"], expected, rtol=1e-4)
+    # Each reason carries the applicant's original category or number
+    for i, row in out.head(50).iterrows():
+        for k in (1, 2):
+            if row[f"reason_{k}"] is not None:
+                assert row[f"value_{k}"] == str(credit_df.iloc[i][row[f"reason_{k}"]])
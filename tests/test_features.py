@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features import CreditRiskFeatures
+
+
+def reference_woe_iv(df, feature, target):
+    """Per-value loop, written the slow and obvious way."""
+    epsilon = 1e-6
+    values = df[feature].dropna().unique()
+    good = np.array([((df[feature] == v) & (df[target] == 0)).sum() for v in values])
+    bad = np.array([((df[feature] == v) & (df[target] == 1)).sum() for v in values])
+    dg, db = good / good.sum(), bad / bad.sum()
+    woe = np.log((dg + epsilon) / (db + epsilon))
+    return dict(zip(values, woe)), ((dg - db) * woe).sum()
+
+
+def test_woe_matches_reference(credit_df):
+    engineer = CreditRiskFeatures()
+    for col in ["checkin_acc", "purpose", "foreign_worker"]:
+        mapping, iv = engineer.calculate_woe_iv(credit_df, col, "target")
+        ref_mapping, ref_iv = reference_woe_iv(credit_df, col, "target")
+
+        assert iv == pytest.approx(ref_iv, abs=1e-12)
+        assert mapping.keys() == ref_mapping.keys()
+        for key, value in ref_mapping.items():
+            assert mapping[key] == pytest.approx(value, abs=1e-12)
+
+
+def test_woe_missing_values_get_zero_weight():
+    df = pd.DataFrame({
+        "cat": ["A", "A", "B", None, "B", "A"],
+        "target": [0, 1, 1, 1, 0, 0],
+    })
+    mapping, iv = CreditRiskFeatures().calculate_woe_iv(df, "cat", "target")
+
+    nan_keys = [k for k in mapping if isinstance(k, float) and np.isnan(k)]
+    assert len(nan_keys) == 1 and mapping[nan_keys[0]] == 0.0
+    ref_mapping, ref_iv = reference_woe_iv(df, "cat", "target")
+    assert iv == pytest.approx(ref_iv)
+    assert mapping["A"] == pytest.approx(ref_mapping["A"])
+
+
+def test_fit_transform_encodes_all_categoricals(credit_df):
+    engineer = CreditRiskFeatures()
+    out = engineer.fit_transform(credit_df, target_col="target")
+
+    categorical = credit_df.select_dtypes(include=["object"]).columns
+    assert set(engineer.woe_mappings) == set(categorical)
+    assert all(np.issubdtype(out[c].dtype, np.floating) for c in categorical)
+    assert out["target"].equals(credit_df["target"])
+
+
+def test_transform_reuses_fitted_tables(credit_df):
+    engineer = CreditRiskFeatures()
+    fitted = engineer.fit_transform(credit_df, target_col="target")
+
+    new_batch = credit_df.head(50).copy()
+    new_batch.loc[0, "purpose"] = "A999"  # unseen category
+    new_batch.loc[1, "purpose"] = None    # missing value
+    out = engineer.transform(new_batch)
+
+    assert out.loc[0, "purpose"] == 0.0 and out.loc[1, "purpose"] == 0.0
+    pd.testing.assert_frame_equal(out.iloc[2:], fitted.head(50).iloc[2:])
+
+    # Dictionary-encoded input goes through the category-code path
+    as_category = new_batch.astype({"purpose": "category"})
+    pd.testing.assert_frame_equal(engineer.transform(as_category), out)
+
+
+def test_save_and_load_roundtrip(credit_df, tmp_path):
+    engineer = CreditRiskFeatures()
+    engineer.fit_transform(credit_df, target_col="target")
+
+    path = engineer.save(tmp_path / "woe_tables.npz")
+    restored = CreditRiskFeatures.load(path)
+
+    assert restored.woe_mappings == engineer.woe_mappings
+    assert restored.iv_values == pytest.approx(engineer.iv_values)
+    pd.testing.assert_frame_equal(restored.transform(credit_df), engineer.transform(credit_df))
+
+
+def test_partial_fit_matches_fit_transform(credit_df):
+    full = CreditRiskFeatures()
+    full.fit_transform(credit_df, target_col="target")
+
+    chunked = CreditRiskFeatures()
+    for start in range(0, len(credit_df), 300):
+        chunked.partial_fit(credit_df.iloc[start:start + 300], target_col="target")
+    chunked.finalize_fit()
+
+    assert chunked.iv_values == pytest.approx(full.iv_values, abs=1e-12)
+    pd.testing.assert_frame_equal(chunked.transform(credit_df), full.transform(credit_df))
+
+
+def brute_force_monotone_iv(good, bad):
+    """Best IV over every partition of the pre-bins with monotone WoE (2^(m-1) of them)."""
+    import itertools
+
+    best = -np.inf
+    m = len(good)
+    for mask in itertools.product([False, True], repeat=m - 1):
+        starts = [0] + [i + 1 for i, cut in enumerate(mask) if cut]
+        woe, iv = CreditRiskFeatures._woe_from_counts(np.add.reduceat(good, starts), np.add.reduceat(bad, starts))
+        steps = np.diff(woe)
+        if (steps >= 0).all() or (steps <= 0).all():
+            best = max(best, iv)
+    return best
+
+
+def test_numeric_binning_finds_best_monotone_partition():
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        good = rng.integers(20, 200, size=8).astype(float)
+        bad = rng.integers(5, 100, size=8).astype(float)
+        starts = CreditRiskFeatures._monotone_merge(good, bad)
+        woe, iv = CreditRiskFeatures._woe_from_counts(np.add.reduceat(good, starts), np.add.reduceat(bad, starts))
+        assert iv == pytest.approx(brute_force_monotone_iv(good, bad), abs=1e-12)
+        assert (np.diff(woe) >= 0).all() or (np.diff(woe) <= 0).all()
+
+
+def test_numeric_bins_fit_transform_and_roundtrip(credit_df, tmp_path):
+    engineer = CreditRiskFeatures(bin_numeric=True, n_prebins=8)
+    out = engineer.fit_transform(credit_df, target_col="target")
+
+    numeric = [c for c in credit_df.select_dtypes(include="number").columns if c != "target"]
+    assert set(engineer.numeric_bins) == set(numeric)
+    for col in numeric:
+        edges, lookup = engineer.numeric_bins[col]
+        assert len(lookup) == len(edges) + 2 and lookup[-1] == 0.0
+        bins = np.searchsorted(edges, credit_df[col].to_numpy(dtype=float), side="right")
+        np.testing.assert_array_equal(out[col].to_numpy(), lookup[bins])
+        woe = lookup[:-1]
+        assert (np.diff(woe) >= 0).all() or (np.diff(woe) <= 0).all()
+        assert engineer.iv_values[col] >= 0
+    assert out["target"].equals(credit_df["target"])
+
+    batch = credit_df.head(3).astype({"amount": float})
+    batch.loc[0, "amount"] = np.nan
+    assert engineer.transform(batch).loc[0, "amount"] == 0.0
+
+    restored = CreditRiskFeatures.load(engineer.save(tmp_path / "woe_tables.npz"))
+    assert restored.iv_values == pytest.approx(engineer.iv_values)
+    pd.testing.assert_frame_equal(restored.transform(credit_df), out)
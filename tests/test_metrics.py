@@ -0,0 +1,35 @@
+import threading
+
+from app.metrics import Counter, Histogram, render
+
+
+def test_histogram_buckets_are_cumulative_across_threads():
+    registry = []
+    latency = Histogram("demo_seconds", "Demo latency.", (0.1, 1.0), label="stage", registry=registry)
+
+    def work():
+        for value in (0.05, 0.5, 5.0):
+            latency.observe(value, "predict")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    text = render(registry)
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{stage="predict",le="0.1"} 4' in text
+    assert 'demo_seconds_bucket{stage="predict",le="1.0"} 8' in text
+    assert 'demo_seconds_bucket{stage="predict",le="+Inf"} 12' in text
+    assert 'demo_seconds_count{stage="predict"} 12' in text
+    assert latency.count("predict") == 12
+
+
+def test_counter_with_labels():
+    registry = []
+    predictions = Counter("demo_predictions", "Demo counter.", label="band", registry=registry)
+    predictions.inc(label_value="High Risk")
+    predictions.inc(2, label_value="Low Risk")
+    assert predictions.value("Low Risk") == 2
+    assert 'demo_predictions_total{band="High Risk"} 1' in render(registry)
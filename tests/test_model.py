@@ -1,5 +1,25 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.features import CreditRiskFeatures
+
+
 def test_model_output_shape():
     # Ensure model returns a probability between 0 and 1
-    model = load_model()
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'age': rng.integers(19, 75, 200),
+        'housing': rng.choice(['own', 'rent', 'free'], 200),
+        'target': rng.integers(0, 2, 200),
+    })
+    dummy_data = CreditRiskFeatures().fit_transform(df).drop(columns=['target'])
+    model = xgb.XGBClassifier(n_estimators=10, max_depth=2)
+    model.fit(dummy_data, df['target'])
     pred = model.predict_proba(dummy_data)[0][1]
-    assert 0 <= pred <= 1
\ No newline at end of file
+    assert 0 <= pred <= 1
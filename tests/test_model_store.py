@@ -0,0 +1,48 @@
+import numpy as np
+import xgboost as xgb
+
+from src.model_store import MLFLOW_EXPERIMENT_NAME, ManifestWatcher, best_run_id, load_promoted, promote_model, read_manifest
+
+
+def test_promote_and_load_roundtrip(credit_df, fitted_model, tmp_path):
+    booster, engineer = fitted_model
+    assert read_manifest(tmp_path) is None
+
+    manifest = promote_model(booster, engineer, "run-a", metrics={"auc": 0.8}, store_dir=tmp_path)
+    assert manifest["version"] == 1
+    assert manifest["feature_names"] == booster.feature_names
+
+    loaded, loaded_engineer, loaded_manifest = load_promoted(tmp_path)
+    assert loaded_manifest == manifest
+    X = xgb.DMatrix(loaded_engineer.transform(credit_df).drop(columns=["target"]))
+    np.testing.assert_array_equal(loaded.predict(X), booster.predict(X))
+
+
+def test_watcher_picks_up_new_promotion(fitted_model, tmp_path):
+    booster, engineer = fitted_model
+    promote_model(booster, engineer, "run-a", store_dir=tmp_path)
+
+    seen = []
+    watcher = ManifestWatcher(lambda b, e, m: seen.append(m["run_id"]), store_dir=tmp_path,
+                              current_version=1)
+    assert watcher.check() is False
+
+    promote_model(booster, engineer, "run-b", store_dir=tmp_path)
+    assert watcher.check() is True
+    assert seen == ["run-b"] and watcher.current_version == 2
+
+
+def test_best_run_skips_runs_without_a_model(tmp_path):
+    import mlflow
+
+    mlflow.set_tracking_uri(f"file://{tmp_path}")
+    try:
+        mlflow.set_experiment(MLFLOW_EXPERIMENT_NAME)
+        with mlflow.start_run() as with_model:
+            mlflow.log_metric("auc", 0.8)
+            mlflow.log_text("stub", "model/MLmodel")
+        with mlflow.start_run():  # an Optuna trial: better AUC, no model
+            mlflow.log_metric("auc", 0.9)
+        assert best_run_id() == with_model.info.run_id
+    finally:
+        mlflow.set_tracking_uri(None)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import xgboost as xgb
+
+from app.registry import CHAMPION, ModelRegistry
+from src.serving import ModelBundle
+
+
+@pytest.fixture
+def bundles(fitted_model, credit_df):
+    """The champion and a challenger trained with other parameters on the same features."""
+    booster, engineer = fitted_model
+    X = engineer.transform(credit_df).drop(columns=["target"])
+    other = xgb.train({"max_depth": 2, "eta": 0.1, "objective": "binary:logistic"},
+                      xgb.DMatrix(X, label=credit_df["target"]), num_boost_round=10)
+    return ModelBundle(booster, engineer, version="champ"), ModelBundle(other, engineer, version="chall")
+
+
+@pytest.fixture
+def records(credit_df):
+    return credit_df.drop(columns=["target"]).head(400).to_dict("records")
+
+
+def test_routing_is_validated(bundles):
+    _, challenger = bundles
+    registry = ModelRegistry()
+    with pytest.raises(ValueError):
+        registry.configure({}, split={"missing": 0.1})
+    with pytest.raises(ValueError):
+        registry.configure({"a": challenger, "b": challenger}, split={"a": 0.6, "b": 0.6})
+    with pytest.raises(ValueError):
+        registry.configure({"a": challenger}, split={"a": 0.1}, shadow=["a"])
+
+
+def test_split_is_sticky_and_proportional(bundles, records):
+    champion, challenger = bundles
+    registry = ModelRegistry()
+    registry.configure({"challenger": challenger}, split={"challenger": 0.25})
+
+    probs, versions = registry.score_many(champion, records)
+    served = np.array(versions) == "chall"
+    assert 0.15 < served.mean() < 0.35
+    np.testing.assert_allclose(probs[served], challenger.score_many([r for r, s in zip(records, served) if s]))
+    np.testing.assert_allclose(probs[~served], champion.score_many([r for r, s in zip(records, served) if not s]))
+    # The same application always lands on the same model
+    assert registry.score_many(champion, records)[1] == versions
+
+
+def test_shadow_scores_off_the_request_path(bundles, records):
+    champion, challenger = bundles
+    registry = ModelRegistry(batch_size=64)
+    registry.configure({"same": champion, "challenger": challenger}, shadow=["same", "challenger"])
+
+    probs, versions = registry.score_many(champion, records)
+    assert set(versions) == {"champ"}
+    np.testing.assert_allclose(probs, champion.score_many(records))
+    assert registry.stats(champion)["shadow_queue"]["pending"] == len(records)
+
+    registry.flush()
+    stats = {m["name"]: m for m in registry.stats(champion)["models"]}
+    assert stats["same"]["vs_champion"]["compared"] == len(records)
+    assert stats["same"]["vs_champion"]["mean_abs_diff"] == pytest.approx(0, abs=1e-6)
+    assert stats["same"]["vs_champion"]["risk_band_agreement"] == 1.0
+    assert stats["challenger"]["vs_champion"]["mean_abs_diff"] > 0
+    assert stats[CHAMPION]["role"] == "champion" and stats["challenger"]["role"] == "shadow"
+    assert stats["challenger"]["scored"] >= len(records) and stats["challenger"]["calls"] > 0
+
+
+def test_full_shadow_queue_drops_oldest(bundles, records):
+    champion, challenger = bundles
+    registry = ModelRegistry(queue_size=100)
+    registry.configure({"challenger": challenger}, shadow=["challenger"])
+    dropped = registry.stats()["shadow_queue"]["dropped"]
+
+    registry.score_many(champion, records)
+    queue = registry.stats()["shadow_queue"]
+    assert queue["pending"] == 100 and queue["dropped"] - dropped == len(records) - 100
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from src.serving import prepare_features
+from src.serving import FastScorer
+
+
+def test_fast_scorer_matches_dataframe_path(credit_df, fitted_model):
+    booster, engineer = fitted_model
+    records = credit_df.drop(columns=["target"]).head(150).to_dict("records")
+    records[0]["purpose"] = "A999"  # unseen category
+
+    def reference(batch):
+        X = prepare_features(pd.DataFrame(batch), engineer, booster.feature_names)
+        return booster.predict(xgb.DMatrix(X))
+
+    scorer = FastScorer(booster, engineer, max_batch_size=64)
+    expected = reference(records)
+    np.testing.assert_allclose(scorer.score_many(records), expected, rtol=1e-6)
+    assert scorer.score_one(records[0]) == float(expected[0])
+
+    # A missing field is zero-filled, like a column absent from a one-row frame
+    partial = {k: v for k, v in records[1].items() if k != "amount"}
+    assert scorer.score_one(partial) == float(reference([partial])[0])
+
+
+def test_fast_scorer_matches_dataframe_path_on_missing_numerics(credit_df, fitted_model):
+    booster, engineer = fitted_model
+    records = credit_df.drop(columns=["target"]).head(5).to_dict("records")
+    records[0]["age"] = None
+    records[1]["age"] = float("nan")
+    records[2]["amount"] = "unknown"
+
+    def reference(batch):
+        X = prepare_features(pd.DataFrame(batch), engineer, booster.feature_names)
+        return booster.predict(xgb.DMatrix(X))
+
+    scorer = FastScorer(booster, engineer)
+    np.testing.assert_allclose(scorer.score_many(records), reference(records), rtol=1e-6)
+    # A one-row frame holds None in an object column, a batch NaN in a float column;
+    # compare the rows too, as NaN and 0 may land on the same side of every split
+    X = prepare_features(pd.DataFrame(records), engineer, booster.feature_names).to_numpy(dtype=np.float32)
+    row = np.empty(scorer.layout.n_features, dtype=np.float32)
+    for j, record in enumerate(records[:3]):
+        scorer.layout.write_row(row, record)
+        np.testing.assert_array_equal(row, X[j])
+        assert scorer.score_one(record) == float(reference([record])[0])
+
+
+def test_fast_scorer_bins_numeric_fields_like_transform(credit_df):
+    from src.features import CreditRiskFeatures
+
+    engineer = CreditRiskFeatures(bin_numeric=True)
+    processed = engineer.fit_transform(credit_df, target_col="target")
+    booster = xgb.train({"max_depth": 3, "objective": "binary:logistic"},
+                        xgb.DMatrix(processed.drop(columns=["target"]), label=processed["target"]), 10)
+    records = credit_df.drop(columns=["target"]).head(100).to_dict("records")
+    records[0]["age"] = float("nan")
+    records[1]["amount"] = 10 ** 9  # beyond the last edge
+
+    X = prepare_features(pd.DataFrame(records), engineer, booster.feature_names)
+    expected = booster.predict(xgb.DMatrix(X))
+    np.testing.assert_allclose(FastScorer(booster, engineer).score_many(records), expected, rtol=1e-6)
@@ -0,0 +1,49 @@
+import mlflow
+import pytest
+
+from src import tracking
+
+
+@pytest.fixture
+def experiment_id(tmp_path):
+    mlflow.set_tracking_uri(f"file://{tmp_path}")
+    yield mlflow.set_experiment("test_tracking").experiment_id
+    mlflow.set_tracking_uri(None)
+
+
+def test_background_logger_writes_nested_runs_in_batches(experiment_id):
+    with mlflow.start_run() as parent:
+        logger = tracking.BatchLogger(background=True).start(interval=60)
+        for i in range(3):
+            with logger.run(parent.info.run_id) as run:
+                run.log_params({"max_depth": i, **{f"p{j}": j for j in range(150)}})
+                run.log_metric("auc", 0.5 + i / 10)
+                run.set_tag("optuna.trial", i)
+        assert logger.written == 0  # nothing is written on the trial's thread
+        logger.stop()
+
+    assert logger.written == 3
+    children = mlflow.search_runs([experiment_id],
+                                  filter_string=f"tags.mlflow.parentRunId = '{parent.info.run_id}'")
+    assert len(children) == 3
+    assert sorted(children["metrics.auc"]) == pytest.approx([0.5, 0.6, 0.7])
+    assert set(children["params.max_depth"]) == {"0", "1", "2"}
+    assert children["params.p149"].eq("149").all()  # more params than one log_batch call takes
+    assert children["status"].eq("FINISHED").all()
+
+
+def test_failed_trial_and_artifacts(experiment_id):
+    logger = tracking.BatchLogger(background=False)
+    with pytest.raises(RuntimeError):
+        with logger.run(run_name="crashed") as run:
+            run.log_artifact("model.json", b"{}")
+            raise RuntimeError("trial crashed")
+    with tracking.BatchLogger(background=False, artifacts=True).run(run_name="kept") as run:
+        run.log_artifact("model.json", b"{}")
+
+    runs = mlflow.search_runs([experiment_id]).set_index("tags.mlflow.runName")
+    assert runs.loc["crashed", "status"] == "FAILED"
+    assert runs.loc["kept", "status"] == "FINISHED"
+    client = mlflow.tracking.MlflowClient()
+    assert client.list_artifacts(runs.loc["crashed", "run_id"]) == []  # skipped unless enabled
+    assert [a.path for a in client.list_artifacts(runs.loc["kept", "run_id"])] == ["model.json"]
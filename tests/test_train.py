@@ -0,0 +1,63 @@
+import mlflow
+import pytest
+
+from src import train
+
+
+@pytest.fixture
+def tracking(tmp_path):
+    mlflow.set_tracking_uri(f"file://{tmp_path}")
+    mlflow.set_experiment("test_tuning")
+    yield
+    mlflow.set_tracking_uri(None)
+
+
+@pytest.fixture
+def splits(credit_df, fitted_model):
+    _, engineer = fitted_model
+    df = engineer.transform(credit_df)
+    X, y = df.drop(columns=["target"]), df["target"]
+    return X.iloc[:1500], X.iloc[1500:], y.iloc[:1500], y.iloc[1500:]
+
+
+def test_parallel_study_shares_matrices_and_nests_runs(tracking, splits):
+    X_train, X_test, y_train, y_test = splits
+    dtrain, dtest = train.build_tuning_matrices(X_train, y_train, X_test, y_test)
+
+    with mlflow.start_run() as parent:
+        study = train.run_study(dtrain, dtest, n_trials=8, n_jobs=2, storage=None,
+                                parent_run_id=parent.info.run_id)
+
+    finished = [t for t in study.trials if t.state.is_finished()]
+    assert len(finished) == 8
+    assert 0.5 < study.best_value <= 1.0
+
+    children = mlflow.search_runs(filter_string=f"tags.mlflow.parentRunId = '{parent.info.run_id}'")
+    assert len(children) == 8
+
+
+def test_pruning_callback_stops_training():
+    class AlwaysPrune:
+        def report(self, value, step):
+            self.last = (value, step)
+
+        def should_prune(self):
+            return True
+
+    callback = train.OptunaPruningCallback(AlwaysPrune())
+    assert callback.after_iteration(None, 3, {"test": {"auc": [0.6, 0.7]}}) is True
+    assert callback.pruned_at == 3 and callback.trial.last == (0.7, 3)
+
+
+@pytest.mark.parametrize("external_memory", [False, True])
+def test_train_streaming_from_chunks(credit_df, tmp_path, external_memory):
+    path = tmp_path / "credit.csv"
+    credit_df.to_csv(path, index=False)
+
+    model, engineer, auc, acc = train.train_streaming(
+        path, tmp_path / "cache", num_boost_round=20, external_memory=external_memory, chunksize=300
+    )
+
+    assert set(engineer.woe_mappings) == set(credit_df.select_dtypes(include=["object"]).columns)
+    assert model.num_features() == credit_df.shape[1] - 1
+    assert 0.5 < auc <= 1.0 and 0.0 < acc <= 1.0
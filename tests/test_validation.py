@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.validation import Schema
+
+
+@pytest.fixture(scope="module")
+def schema(credit_df):
+    return Schema.from_reference(credit_df)
+
+
+@pytest.fixture
+def dirty(credit_df):
+    df = credit_df.head(6).astype(object).reset_index(drop=True)
+    df.loc[0, "amount"] = -5
+    df.loc[1, "purpose"] = "A99"
+    df.loc[2, "age"] = None
+    df.loc[3, "duration"] = "six"
+    df.loc[4, "telephone"] = None
+    return df
+
+
+EXPECTED = {0: ["amount:range"], 1: ["purpose:category"], 2: ["age:missing"],
+            3: ["duration:type"], 4: ["telephone:missing"]}
+
+
+def test_schema_is_compiled_from_training_data(credit_df, schema):
+    assert set(schema.numeric) == set(credit_df.select_dtypes("number").columns) - {"target"}
+    assert set(schema.categories["purpose"]) == set(credit_df["purpose"])
+    age = schema.numeric.index("age")
+    assert schema.lows[age] <= credit_df["age"].min() and schema.highs[age] >= credit_df["age"].max()
+    assert not schema.check_frame(credit_df).any()
+
+
+def test_frame_batch_and_single_record_paths_agree(schema, dirty):
+    records = dirty.drop(columns=["target"]).to_dict("records")
+
+    assert schema.failures(schema.check_frame(dirty)) == EXPECTED
+    assert schema.failures(schema.check_records(records)) == EXPECTED
+    assert {i: schema.check_record(r) for i, r in enumerate(records) if schema.check_record(r)} == EXPECTED
+
+    report = schema.report(schema.check_frame(dirty))
+    assert report["n_rows"] == 6 and report["n_failed"] == 5
+    assert report["rules"]["purpose:category"] == {"failed": 1, "rows": [1]}
+
+
+def test_schema_roundtrip(schema, dirty, tmp_path):
+    loaded = Schema.load(schema.save(tmp_path / "schema.npz"))
+
+    assert loaded.rules == schema.rules
+    np.testing.assert_array_equal(loaded.lows, schema.lows)
+    np.testing.assert_array_equal(loaded.check_frame(dirty), schema.check_frame(dirty))
+
+
+def test_ingest_reports_and_drops_invalid_rows(schema, dirty, tmp_path):
+    from src.ingest import validate_data
+
+    path = schema.save(tmp_path / "schema.npz")
+    assert len(validate_data(dirty, path, drop_invalid=False)) == 6
+    assert validate_data(dirty, path, drop_invalid=True)["purpose"].tolist() == [dirty["purpose"][5]]